@@ -0,0 +1,35 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import timeit
+
+def measure(fun, *, repeat = 3, number = None):
+	"""Return the best time per call of fun in nanoseconds."""
+
+	timer = timeit.Timer(fun)
+	if number is None:
+		number, _ = timer.autorange()
+	return min(timer.repeat(repeat = repeat, number = number)) / number * 1e9
+
+def report(title, header, rows):
+	"""Print a table of benchmark results."""
+
+	print(title)
+	widths = [max(len(str(r[i])) for r in (header, *rows)) for i in range(len(header))]
+	for row in (header, *rows):
+		print('  '.join(str(c).rjust(w) for c, w in zip(row, widths)))
+	print()
@@ -0,0 +1,92 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import sys, random, operator
+from hdlpy import logic, logic_array, logvec, logvec_array
+from . import measure, report
+from .logvec import _sizeof
+
+COUNT = 10000
+
+def batch():
+	"""Compare a list of vectors against a logvec_array."""
+
+	rows = []
+	for width in (32, 64, 128):
+		ty = logvec[width - 1:0].unsigned
+		left = [ty(random.getrandbits(width)) for _ in range(COUNT)]
+		right = [ty(random.getrandbits(width)) for _ in range(COUNT)]
+		larray, rarray = logvec_array(ty, left), logvec_array(ty, right)
+
+		def elementwise(oper):
+			return lambda: [oper(l, r) for l, r in zip(left, right)]
+
+		def arraywise(oper):
+			return lambda: oper(larray, rarray)
+
+		planes = sum(getattr(larray, p).nbytes for p in ('_value', '_unknown', '_hi_z'))
+		if width > 64:
+			planes += sum(sys.getsizeof(int(v)) for v in larray._value)
+		rows.append((
+			width,
+			f"{sum(map(_sizeof, left)) / COUNT:.0f}",
+			f"{planes / COUNT:.0f}",
+			*(f"{measure(fun(oper), number = 1) / COUNT:.1f}"
+			  for oper in (operator.and_, operator.add, operator.lt)
+			  for fun in (elementwise, arraywise)),
+		))
+
+	report(
+		f"logvec list vs logvec_array of {COUNT} elements (bytes or ns per element)",
+		('width', 'list B', 'array B', '& list', '& array', '+ list', '+ array', '< list', '< array'),
+		rows)
+
+def logic_ops():
+	"""Compare logic operators on a list against a logic_array."""
+
+	values = logic.zero, logic.one, logic.unknown, logic.hi_z
+	count = 100000
+	left = [random.choice(values) for _ in range(count)]
+	right = [random.choice(values) for _ in range(count)]
+	larray, rarray = logic_array(left), logic_array(right)
+
+	rows = []
+	for name, oper in (('&', operator.and_), ('|', operator.or_), ('^', operator.xor)):
+		rows.append((
+			name,
+			f"{measure(lambda: [oper(l, r) for l, r in zip(left, right)], number = 1) / count:.1f}",
+			f"{measure(lambda: oper(larray, rarray), number = 10) / count:.2f}",
+		))
+
+	report(
+		f"logic list vs logic_array of {count} samples (ns per sample)",
+		('operator', 'list', 'array'),
+		rows)
+
+def main():
+	try:
+		import numpy
+	except ImportError:
+		print('logvec_array: skipped, NumPy is not installed')
+		return
+
+	random.seed(0)
+	batch()
+	logic_ops()
+
+if __name__ == '__main__':
+	main()
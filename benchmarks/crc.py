@@ -0,0 +1,98 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import random
+from hdlpy import logvec, crc, lfsr, internet_checksum
+from . import measure, report
+
+def _bitwise(engine, data):
+	"""CRC the way it would be written without the engine: one
+	shift_left and conditional xor of vectors per bit.
+	"""
+
+	reg = engine.reset()
+	top = engine.width - 1
+	poly = engine.type(engine.poly)
+	for byte in data:
+		for bit in range(7, -1, -1):
+			feedback = reg[top] ^ (byte >> bit & 1)
+			reg = reg.shift_left(1)
+			if feedback:
+				reg ^= poly
+	return reg
+
+def crcs():
+	"""Time CRCs of an Ethernet-sized frame."""
+
+	data = random.randbytes(1500)
+	frame = logvec.from_bytes(data)
+	xmodem, crc32 = crc.crc16_xmodem, crc.crc32
+	crc12 = crc(12, 0x80f)
+
+	report(
+		'crc of a 1500-byte frame (us per frame)',
+		('engine', 'bitwise', 'table', 'fast path', 'logvec frame'),
+		[(name, *(f"{measure(fun, number = number) / 1000:.1f}" if fun else '-' for fun in funs))
+		for name, number, funs in (
+			('crc16_xmodem', 3, (
+				lambda: _bitwise(xmodem, data),
+				lambda: xmodem._update_normal(0, data),
+				lambda: xmodem(data),
+				lambda: xmodem(frame))),
+			('crc12', 3, (
+				lambda: _bitwise(crc12, data),
+				lambda: crc12(data),
+				None,
+				lambda: crc12(frame))),
+			('crc32', None, (
+				None,
+				lambda: crc32._update_reflected(0, data),
+				lambda: crc32(data),
+				lambda: crc32(frame))))])
+
+def prbs():
+	"""Time generating PRBS bits against stepping the register, and
+	the internet checksum over as many bits of data.
+	"""
+
+	engine = lfsr.prbs31
+	start = engine.type(1)
+	data = random.randbytes(1500)
+
+	def stepped(count):
+		bits, reg = [], start
+		for _ in range(count):
+			bits.append(reg[-1])
+			reg = engine.step(reg)
+		return bits, reg
+
+	report(
+		'prbs31 (us per call)',
+		('bits', 'step', 'generate', 'checksum'),
+		[(count,
+			f"{measure(lambda: stepped(count), number = 3) / 1000:.1f}",
+			f"{measure(lambda: engine.generate(start, count)) / 1000:.1f}",
+			f"{measure(lambda: internet_checksum(data[:count // 8])) / 1000:.1f}")
+		for count in (64, 1024, 12000)])
+
+def main():
+	random.seed(0)
+	crcs()
+	prbs()
+
+if __name__ == '__main__':
+	main()
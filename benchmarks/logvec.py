@@ -0,0 +1,453 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import gc, sys, random, operator, tracemalloc
+from hdlpy import logic, logvec, pattern, cat
+from . import measure, report
+
+WIDTHS = (8, 64, 512, 4096)
+
+def _random(width, *, unknown = False):
+	chars = '01XZ' if unknown else '01'
+	return logvec(''.join(random.choice(chars) for _ in range(width)))
+
+def _sizeof(vec):
+	return sys.getsizeof(vec) + sum(
+		sys.getsizeof(getattr(vec, plane))
+		for plane in ('_value', '_unknown', '_hi_z'))
+
+def storage():
+	"""Compare packed storage against a tuple of logic values, which is
+	how logvec used to store its bits.
+	"""
+
+	rows = []
+	for width in WIDTHS:
+		a, b = _random(width, unknown = True), _random(width, unknown = True)
+		ta, tb = tuple(a), tuple(b)
+		rows.append((
+			width,
+			sys.getsizeof(ta), _sizeof(a),
+			f"{measure(lambda: tuple(l & r for l, r in zip(ta, tb))):.0f}",
+			f"{measure(lambda: a & b):.0f}",
+			f"{measure(lambda: tuple(~v for v in ta)):.0f}",
+			f"{measure(lambda: ~a):.0f}",
+			f"{measure(lambda: ta == tb):.0f}",
+			f"{measure(lambda: a == b):.0f}",
+		))
+
+	report(
+		'logvec storage (bytes, ns per operation)',
+		('width', 'tuple B', 'packed B', 'tuple &', 'packed &', 'tuple ~', 'packed ~', 'tuple ==', 'packed =='),
+		rows)
+
+def arithmetic():
+	"""Time arithmetic on fully known unsigned vectors."""
+
+	rows = []
+	for width in WIDTHS:
+		a, b = _random(width).unsigned, _random(width).unsigned
+		b |= 1
+		rows.append((
+			width,
+			*(f"{measure(lambda: oper(a, b)):.0f}" for oper in (
+				operator.add, operator.sub, operator.mul,
+				operator.floordiv, operator.mod)),
+		))
+
+	report(
+		'unsigned logvec arithmetic (ns per operation)',
+		('width', '+', '-', '*', '//', '%'),
+		rows)
+
+def compare():
+	"""Time equality and ordering against vectors and ints."""
+
+	rows = []
+	for width in WIDTHS:
+		a, b = _random(width).unsigned, _random(width).unsigned
+		n = int(b)
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: a == b, lambda: a != b, lambda: a < b,
+				lambda: a == n, lambda: a < n, lambda: hash(a))),
+		))
+
+	report(
+		'unsigned logvec comparison (ns per operation)',
+		('width', '==', '!=', '<', '== int', '< int', 'hash'),
+		rows)
+
+def _int_to_bits(value):
+	# the per-bit loop logvec used to convert ints with
+	result = []
+	while True:
+		result.append(logic.one if value % 2 == 1 else logic.zero)
+		value >>= 1
+		if value == 0:
+			break
+	result.reverse()
+	return tuple(result)
+
+def conversion():
+	"""Time conversion between ints, strings and vectors."""
+
+	rows = []
+	for width in WIDTHS:
+		ty = logvec[width - 1:0].unsigned
+		a = _random(width).unsigned
+		n, text = int(a), str(a)
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: _int_to_bits(n), lambda: ty(n), lambda: int(a),
+				lambda: ty(text), lambda: str(a))),
+		))
+
+	report(
+		'logvec conversion (ns per operation)',
+		('width', 'bit loop', 'from int', 'int()', 'from str', 'str()'),
+		rows)
+
+def formatting():
+	"""Time formatting, as done by monitors logging a bus every cycle."""
+
+	rows = []
+	for width in (*WIDTHS[:2], 128, *WIDTHS[2:]):
+		a = _random(width)
+		x = logvec('X' * (width // 8) + str(a)[width // 8:])
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: str(a), lambda: repr(a), lambda: f"{a:x}",
+				lambda: f"{a:o}", lambda: f"{x:x}", lambda: f"{a.unsigned:d}")),
+		))
+
+	report(
+		'logvec formatting (ns per operation)',
+		('width', 'str', 'repr', 'hex', 'octal', 'hex with X', 'decimal'),
+		rows)
+
+def shifts():
+	"""Time shifts and rotates, as used by barrel shifters and LFSRs."""
+
+	rows = []
+	for width in WIDTHS:
+		a = _random(width)
+		amount = logvec(3).unsigned
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: a << 1, lambda: a >> 1, lambda: a.signed >> 1,
+				lambda: a.rotate_left(1), lambda: a << amount)),
+		))
+
+	report(
+		'logvec shifts (ns per operation)',
+		('width', '<< 1', '>> 1', 'signed >> 1', 'rotate 1', '<< unsigned'),
+		rows)
+
+def interning():
+	"""Time a counter with and without interned instances."""
+
+	rows = []
+	for width in (4, 8, 12):
+		ty = logvec[width - 1:0].unsigned
+		def count():
+			a = ty(0)
+			for _ in range(1 << width):
+				a = a + 1
+				a == ty(0)
+
+		plain = measure(count, number = 10)
+		logvec.intern(width, size = 4096)
+		try:
+			interned = measure(count, number = 10)
+			info = logvec.intern_info()
+		finally:
+			logvec.intern(None)
+
+		rows.append((
+			width,
+			f"{plain / (1 << width):.0f}",
+			f"{interned / (1 << width):.0f}",
+			f"{info.hits / (info.hits + info.misses):.1%}",
+		))
+
+	report(
+		'logvec interning (ns per counter step)',
+		('width', 'plain', 'interned', 'hit rate'),
+		rows)
+
+def types():
+	"""Time type lookups and count live types after random slicing."""
+
+	a = _random(4096)
+	offsets = [random.randrange(4096 - 8) for _ in range(20000)]
+	def slices():
+		for i in offsets:
+			a[i + 7:i]
+
+	hit = measure(lambda: logvec[15:8])
+	sliced = measure(slices, number = 1) / len(offsets)
+	gc.collect()
+	info = logvec.type_cache_info()
+
+	report(
+		'logvec types',
+		('lookup ns', 'slice ns', 'hit rate', 'cached', 'live'),
+		[(
+			f"{hit:.0f}",
+			f"{sliced:.0f}",
+			f"{info.hits / (info.hits + info.misses):.1%}",
+			info.currsize,
+			info.live,
+		)])
+
+def indexing():
+	"""Time decoder style bit and field extracts."""
+
+	rows = []
+	for width in WIDTHS:
+		a = logvec[width - 1:0](_random(width))
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: a[width - 1], lambda: a[-1], lambda: a[6:0],
+				lambda: a[width - 1:width - 7])),
+		))
+
+	report(
+		'logvec indexing (ns per operation)',
+		('width', 'msb', '[-1]', '[6:0]', 'top field'),
+		rows)
+
+def patterns():
+	"""Time wildcard comparisons as used by instruction decoders."""
+
+	word = logvec[31:0](0x00a50513)
+	text = '-------_-----_-----_000_-----_0010011'
+	compiled = pattern(text)
+	report(
+		'logvec wildcard compare (ns per compare)',
+		('string', 'pattern'),
+		[(f"{measure(lambda: word == text):.0f}", f"{measure(lambda: word == compiled):.0f}")])
+
+def dispatch():
+	"""Time operand coercion for binary operations on narrow vectors."""
+
+	a = logvec[7:0](0x5a).unsigned
+	b = logvec[7:0](0x3c).unsigned
+	c = logvec[3:0](0x3)
+	report(
+		'logvec operand coercion, 8 bits (ns per operation)',
+		('a & b', 'a + b', 'a + 4-bit logvec', 'a + 1', 'a < 7'),
+		[tuple(f"{measure(fun):.0f}" for fun in (
+			lambda: a & b, lambda: a + b, lambda: a + c, lambda: a + 1, lambda: a < 7))])
+
+def literals():
+	"""Time converting string literals, as in signal assignments."""
+
+	ty = logvec[31:0]
+	report(
+		'logvec literals (ns per conversion)',
+		('binary', 'hex', 'hex with X', 'from_hex'),
+		[tuple(f"{measure(fun):.0f}" for fun in (
+			lambda: ty('1010_0000_1111_0000_XXXX_0000_1111_ZZZZ'),
+			lambda: ty('0xdead_beef'),
+			lambda: ty('0xdeXX_beeZ'),
+			lambda: ty.from_hex('deadbeef')))])
+
+def concatenation():
+	"""Time building a 16-field header with + and with cat."""
+
+	fields = [logvec[w - 1:0](random.getrandbits(w)) for w in (4, 4, 8, 16, 16, 3, 13, 8, 8, 16, 32, 32, 4, 4, 8, 16)]
+
+	def chained():
+		result = fields[0]
+		for field in fields[1:]:
+			result = result + field
+		return result
+
+	report(
+		'logvec concatenation of 16 fields (ns per header)',
+		('+ chain', 'cat', 'x * 16'),
+		[(
+			f"{measure(chained):.0f}",
+			f"{measure(lambda: cat(*fields)):.0f}",
+			f"{measure(lambda: fields[0] * 16):.0f}",
+		)])
+
+def _allocated(fun):
+	tracemalloc.start()
+	try:
+		result = fun()
+		return tracemalloc.get_traced_memory()[0], result
+	finally:
+		tracemalloc.stop()
+
+def lanes():
+	"""Time and size lane extraction from wide buses with slices and
+	with views.
+	"""
+
+	rows = []
+	for width, lane, unknown in ((512, 32, False), (512, 128, False), (4096, 32, False), (4096, 128, False), (4096, 128, True)):
+		bus = _random(width, unknown = unknown).unsigned
+		bounds = [(lo + lane - 1, lo) for lo in range(0, width, lane)]
+
+		def sliced_int():
+			for hi, lo in bounds:
+				try:
+					int(bus[hi:lo])
+				except ValueError:
+					pass
+
+		def viewed_int():
+			view = bus.view
+			for hi, lo in bounds:
+				try:
+					int(view[hi:lo])
+				except ValueError:
+					pass
+
+		def sliced_eq():
+			for hi, lo in bounds:
+				bus[hi:lo] == 5
+
+		def viewed_eq():
+			view = bus.view
+			for hi, lo in bounds:
+				view[hi:lo] == 5
+
+		sliced_int()
+		view = bus.view
+		slices, _ = _allocated(lambda: [bus[hi:lo] for hi, lo in bounds])
+		views, _ = _allocated(lambda: [view[hi:lo] for hi, lo in bounds])
+		rows.append((
+			width, lane, 'X' if unknown else '',
+			*(f"{measure(fun) / len(bounds):.0f}" for fun in (sliced_int, viewed_int, sliced_eq, viewed_eq)),
+			slices // len(bounds), views // len(bounds),
+		))
+
+	report(
+		'lane extraction (ns and bytes per lane)',
+		('width', 'lane', 'bus', 'slice int', 'view int', 'slice ==', 'view ==', 'slice B', 'view B'),
+		rows)
+
+def buffers():
+	"""Time converting Ethernet frames between bytes and vectors,
+	against the per-byte loops testbenches used to write.
+	"""
+
+	rows = []
+	for size in (64, 1500, 9000):
+		data = bytes(random.getrandbits(8) for _ in range(size))
+		ty = logvec[size * 8 - 1:0]
+		vec = ty.from_bytes(data)
+		byte = logvec[7:0]
+
+		def from_loop():
+			value = 0
+			for b in data:
+				value = value << 8 | b
+			return ty(value)
+
+		def to_loop():
+			return bytes(int(vec[i + 7:i].unsigned) for i in range(size * 8 - 8, -1, -8))
+
+		times = [measure(fun) for fun in (
+			lambda: cat(*map(byte, data)), from_loop, lambda: ty.from_bytes(data),
+			to_loop, lambda: vec.to_bytes())]
+		rows.append((
+			size,
+			*(f"{t:.0f}" for t in times),
+			f"{size * 8 / times[2]:.1f}",
+			f"{size * 8 / times[4]:.1f}",
+		))
+
+	report(
+		'logvec bytes conversion (ns per frame, Gbit/s)',
+		('bytes', 'cat bytes', 'int loop', 'from_bytes', 'slice loop', 'to_bytes', 'from Gb/s', 'to Gb/s'),
+		rows)
+
+def bits():
+	"""Time reductions and bit counts against loops over the bits, as
+	used by parity checkers and priority encoders.
+	"""
+
+	def parity(vec):
+		result = logic.zero
+		for b in vec:
+			result ^= b
+		return result
+
+	def popcount(vec):
+		return sum(1 for b in vec if b is logic.one)
+
+	def leading_zeros(vec):
+		count = 0
+		for b in vec:
+			if b is not logic.zero:
+				break
+			count += 1
+		return count
+
+	def reverse(vec):
+		return type(vec)(tuple(reversed(vec)))
+
+	rows = []
+	for width in (32, 512, 4096):
+		a = _random(width)
+		# a priority encoder input with its highest request a third in
+		request = logvec[width - 1:0](1 << (width - width // 3))
+		rows.append((
+			width,
+			*(f"{measure(fun):.0f}" for fun in (
+				lambda: parity(a), lambda: a.xor_reduce(),
+				lambda: popcount(a), lambda: a.popcount(),
+				lambda: leading_zeros(request), lambda: request.count_leading_zeros(),
+				lambda: reverse(a), lambda: a.reverse_bits())),
+		))
+
+	report(
+		'logvec bit operations (ns per operation)',
+		('width', 'parity loop', 'xor_reduce', 'popcount loop', 'popcount', 'clz loop', 'clz', 'reverse loop', 'reverse_bits'),
+		rows)
+
+def main():
+	random.seed(0)
+	storage()
+	arithmetic()
+	compare()
+	conversion()
+	formatting()
+	shifts()
+	interning()
+	types()
+	indexing()
+	patterns()
+	dispatch()
+	literals()
+	concatenation()
+	lanes()
+	buffers()
+	bits()
+
+if __name__ == '__main__':
+	main()
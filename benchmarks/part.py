@@ -0,0 +1,90 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from hdlpy import logic, logvec, part, resolved
+from . import measure, report
+
+def setattr_():
+	"""Time signal writes, which compare the old and new value."""
+
+	@part
+	class Signals:
+		bit: logic
+		bus: logvec[1023:0]
+
+	obj = Signals()
+	bits = logic.zero, logic.one
+	buses = logvec[1023:0](0), logvec[1023:0](2 ** 1024 - 1)
+
+	def write(name, values):
+		def fun():
+			setattr(obj, name, values[0])
+			setattr(obj, name, values[1])
+		return fun
+
+	report(
+		'signal write with change check (ns per write)',
+		('signal', 'changed', 'unchanged'),
+		(
+			('logic', f"{measure(write('bit', bits)) / 2:.0f}", f"{measure(write('bit', bits[:1] * 2)) / 2:.0f}"),
+			('logvec[1023:0]', f"{measure(write('bus', buses)) / 2:.0f}", f"{measure(write('bus', buses[:1] * 2)) / 2:.0f}"),
+		))
+
+def resolved_():
+	"""Time a change of one driver of a resolved signal, against
+	rescanning all drivers with the resolution table.
+	"""
+
+	def rescan(values):
+		result = logic.hi_z
+		for value in values:
+			result = resolved.table[result._logic_order][value._logic_order]
+		return result
+
+	def change(ty, count):
+		drivers = ty.drivers()
+		zero, one = ty.type(0), ty.type(1)
+		for i in range(count):
+			drivers.drive(i, zero)
+		def fun():
+			drivers.drive(0, one)
+			drivers.drive(0, zero)
+		return measure(fun) / 2
+
+	def scan(count):
+		values = [logic.zero] * count
+		def fun():
+			values[0] = logic.one
+			rescan(values)
+			values[0] = logic.zero
+			rescan(values)
+		return measure(fun) / 2
+
+	report(
+		'resolved driver change (ns per change)',
+		('drivers', 'rescan logic', 'logic', 'logvec[31:0]'),
+		tuple(
+			(count, f"{scan(count):.0f}", f"{change(resolved[logic], count):.0f}", f"{change(resolved[logvec[31:0]], count):.0f}")
+			for count in (2, 8, 64, 512)
+		))
+
+def main():
+	setattr_()
+	resolved_()
+
+if __name__ == '__main__':
+	main()
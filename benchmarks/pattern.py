@@ -0,0 +1,91 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import random
+from hdlpy import logvec, decoder
+from . import measure, report
+
+def _rv32i():
+	"""Return (name, pattern) of the RV32I base instructions."""
+
+	def r(funct7, funct3, opcode):
+		return f"{funct7}_-----_-----_{funct3}_-----_{opcode}"
+
+	def i(funct3, opcode):
+		return r('-------', funct3, opcode)
+
+	return (
+		('lui', i('---', '0110111')),
+		('auipc', i('---', '0010111')),
+		('jal', i('---', '1101111')),
+		('jalr', i('000', '1100111')),
+		*((name, i(f3, '1100011')) for name, f3 in (
+			('beq', '000'), ('bne', '001'), ('blt', '100'),
+			('bge', '101'), ('bltu', '110'), ('bgeu', '111'))),
+		*((name, i(f3, '0000011')) for name, f3 in (
+			('lb', '000'), ('lh', '001'), ('lw', '010'),
+			('lbu', '100'), ('lhu', '101'))),
+		*((name, i(f3, '0100011')) for name, f3 in (
+			('sb', '000'), ('sh', '001'), ('sw', '010'))),
+		*((name, i(f3, '0010011')) for name, f3 in (
+			('addi', '000'), ('slti', '010'), ('sltiu', '011'),
+			('xori', '100'), ('ori', '110'), ('andi', '111'))),
+		('slli', r('0000000', '001', '0010011')),
+		('srli', r('0000000', '101', '0010011')),
+		('srai', r('0100000', '101', '0010011')),
+		*((name, r(f7, f3, '0110011')) for name, f7, f3 in (
+			('add', '0000000', '000'), ('sub', '0100000', '000'),
+			('sll', '0000000', '001'), ('slt', '0000000', '010'),
+			('sltu', '0000000', '011'), ('xor', '0000000', '100'),
+			('srl', '0000000', '101'), ('sra', '0100000', '101'),
+			('or', '0000000', '110'), ('and', '0000000', '111'))),
+		('fence', i('000', '0001111')),
+		('ecall', '0000000_00000_00000_000_00000_1110011'),
+		('ebreak', '0000000_00001_00000_000_00000_1110011'),
+	)
+
+def decoding():
+	"""Compare a decoder against a chain of wildcard compares."""
+
+	texts = [p for _, p in _rv32i()]
+	words = [
+		logvec[31:0](''.join(random.choice('01') if b == '-' else b for b in t if b != '_'))
+		for t in texts for _ in range(10)
+	]
+	dec = decoder(texts)
+
+	def chain():
+		for word in words:
+			for i, text in enumerate(texts):
+				if word == text:
+					break
+
+	def table():
+		for word in words:
+			dec.decode(word)
+
+	report(
+		f"RV32I decode, {len(texts)} patterns (ns per instruction)",
+		('== chain', 'decoder'),
+		[(f"{measure(chain, number = 1) / len(words):.0f}", f"{measure(table) / len(words):.0f}")])
+
+def main():
+	random.seed(0)
+	decoding()
+
+if __name__ == '__main__':
+	main()
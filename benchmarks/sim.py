@@ -0,0 +1,117 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from hdlpy import logic, logvec, bit, bitvec, part, once, when, always
+from hdlpy.sim import Sim, Wait
+from . import measure, report
+
+CYCLES = 200
+
+def make_flipflop(ty, counter):
+	"""The flip-flop design of tests/sim/sim.py on signals of type ty,
+	with an added counter register of type counter.
+	"""
+
+	@part
+	class Flipflop:
+		clk: ty
+		rst: ty
+		en: ty
+		d: ty
+		o: ty
+		no: ty
+		count: counter
+
+		@when(rising = ('rst', 'clk'))
+		def process(self):
+			if self.rst:
+				self.o = 0
+				self.count = 0
+			elif self.clk and self.en:
+				self.o = self.d
+				self.count = self.count + 1
+
+		@always
+		def neg(self):
+			self.no = ~self.o
+
+	@part
+	class Testbench:
+		_flipflop = Flipflop()
+
+		@once
+		async def test(self):
+			flipflop = self._flipflop
+			flipflop.en = 0
+			flipflop.rst = 1
+			flipflop.clk = 0
+			await Wait.delay('10ns')
+			flipflop.rst = 0
+			flipflop.en = 1
+			for i in range(CYCLES):
+				flipflop.d = i & 1
+				flipflop.clk = ~flipflop.clk
+				await Wait.delay('10ns')
+
+	return Testbench
+
+def flipflop():
+	"""Time the flip-flop testbench with four-valued and two-state
+	signals, and with four-valued signals in a two-state simulation.
+	"""
+
+	designs = (
+		('logic, logvec[31:0]', logic, logvec[31:0].unsigned, False),
+		('bit, bitvec[31:0]', bit, bitvec[31:0].unsigned, False),
+		('logic, logvec[31:0], two_state', logic, logvec[31:0].unsigned, True),
+	)
+
+	def run(testbench, two_state):
+		return lambda: Sim(testbench(), two_state = two_state).run()
+
+	def bit_ops(ty):
+		one = ty(1)
+		def fun():
+			for _ in range(100):
+				~one & one | one
+		return fun
+
+	def counter_ops(counter):
+		value = counter(12345)
+		def fun():
+			for _ in range(100):
+				value + 1 == value
+		return fun
+
+	report(
+		f"flip-flop testbench of {CYCLES} clock edges (us per edge, ns per operation)",
+		('signals', 'simulation', 'bit ops', 'counter ops'),
+		tuple(
+			(
+				name,
+				f"{measure(run(make_flipflop(ty, counter), two_state), repeat = 5, number = 3) / 1000 / CYCLES:.1f}",
+				f"{measure(bit_ops(ty)) / 100 / 3:.0f}" if not two_state else '-',
+				f"{measure(counter_ops(counter)) / 100 / 2:.0f}" if not two_state else '-',
+			)
+			for name, ty, counter, two_state in designs
+		))
+
+def main():
+	flipflop()
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,64 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import random
+from hdlpy import logic, logvec, packed, cat
+from . import measure, report
+
+@packed
+class ipv4_header:
+	version: logvec[3:0]
+	ihl: logvec[3:0]
+	tos: logvec[7:0]
+	length: logvec[15:0].unsigned
+	ident: logvec[15:0]
+	reserved: logic
+	dont_fragment: logic
+	more_fragments: logic
+	fragment: logvec[12:0].unsigned
+	ttl: logvec[7:0].unsigned
+	protocol: logvec[7:0]
+	checksum: logvec[15:0]
+	source: logvec[31:0]
+	destination: logvec[31:0]
+
+def fields():
+	"""Time reading and updating header fields against slicing the
+	same bits out of a plain vector.
+	"""
+
+	word = logvec[159:0](random.getrandbits(160))
+	header = ipv4_header(word)
+
+	def sliced_update():
+		return cat(word[159:72], word[71:64].unsigned - 1, word[63:0])
+
+	report(
+		'packed struct, 160-bit IPv4 header (ns per operation)',
+		('slice ttl', 'field ttl', 'slice flag', 'field flag', 'slice update', 'replace', 'from fields'),
+		[tuple(f"{measure(fun):.0f}" for fun in (
+			lambda: word[71:64].unsigned, lambda: header.ttl,
+			lambda: word[78], lambda: header.dont_fragment,
+			sliced_update, lambda: header.replace(ttl = header.ttl - 1),
+			lambda: ipv4_header(version = 4, ihl = 5, ttl = 64, protocol = 6)))])
+
+def main():
+	random.seed(0)
+	fields()
+
+if __name__ == '__main__':
+	main()
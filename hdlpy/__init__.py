@@ -19,6 +19,12 @@ from sys import modules
 
 from ._logic import *
 from ._logvec import *
+from ._bitvec import *
+from ._pattern import *
+from ._resolved import *
+from ._struct import *
+from ._array import *
+from ._crc import *
 from ._part import *
 
 __all__ = sum((
@@ -0,0 +1,540 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import operator
+from functools import cache
+
+from ._lib import export
+from ._logic import logic
+from ._logvec import logvec, unsigned_logvec, signed_logvec
+
+_numpy = None
+
+def numpy():
+	"""Import NumPy on first use."""
+
+	global _numpy
+	if _numpy is None:
+		try:
+			import numpy as _numpy
+		except ImportError as e:
+			raise ImportError("hdlpy arrays need NumPy") from e
+	return _numpy
+
+# logic values by code, codes follow the logic ordering
+_logic_values = tuple(sorted(
+	(logic.zero, logic.one, logic.unknown, logic.hi_z),
+	key = lambda v: v._logic_order))
+
+@cache
+def _logic_tables():
+	"""Build operator tables from the logic classes.
+
+	Binary tables are flat and indexed by left << 2 | right, which
+	NumPy looks up much faster than a pair of index arrays.
+	"""
+
+	np = numpy()
+	tables = {}
+	for name, oper in (('and', operator.and_), ('or', operator.or_), ('xor', operator.xor)):
+		table = np.array([
+			oper(l, r)._logic_order
+			for l in _logic_values
+			for r in _logic_values
+		], np.uint8)
+		table.setflags(write = False)
+		tables[name] = table
+
+	table = np.array([(~v)._logic_order for v in _logic_values], np.uint8)
+	table.setflags(write = False)
+	tables['invert'] = table
+
+	chars = np.full(256, 255, np.uint8)
+	for v in _logic_values:
+		chars[ord(str(v))] = v._logic_order
+	chars.setflags(write = False)
+	tables['chars'] = chars
+	return tables
+
+
+@export
+class logic_array:
+	"""Array of logic values, stored as NumPy uint8 codes.
+
+	The code of a value is its place in the logic ordering: 0 for
+	'0', 1 for '1', 2 for 'X' and 3 for 'Z'. The operators look up
+	their results in 4x4 tables built from logic itself, so they
+	behave exactly like the scalar operators.
+	"""
+
+	__slots__ = 'codes'
+
+	def __init__(self, values = ()):
+		np = numpy()
+		if isinstance(values, logic_array):
+			codes = values.codes
+		elif type(values) is str:
+			codes = _logic_tables()['chars'][np.frombuffer(values.encode('latin-1'), np.uint8)]
+			if (codes == 255).any():
+				raise ValueError(f"{values!r}: not a valid logic string")
+		else:
+			codes = np.fromiter((logic(v)._logic_order for v in values), np.uint8)
+		self.codes = codes
+
+	@staticmethod
+	def from_codes(codes):
+		"""Create array from an array of logic codes."""
+
+		np = numpy()
+		codes = np.asarray(codes, np.uint8)
+		if codes.size and codes.max() > 3:
+			raise ValueError(f"{codes!r}: not valid logic codes")
+		return logic_array._wrap(codes)
+
+	@staticmethod
+	def _wrap(codes):
+		obj = object.__new__(logic_array)
+		obj.codes = codes
+		return obj
+
+	@staticmethod
+	def tables():
+		"""Return the read-only operator tables, indexed by codes.
+
+		The 'and', 'or' and 'xor' tables are 4x4, 'invert' has four
+		entries.
+		"""
+
+		tables = _logic_tables()
+		return {
+			'and': tables['and'].reshape(4, 4),
+			'or': tables['or'].reshape(4, 4),
+			'xor': tables['xor'].reshape(4, 4),
+			'invert': tables['invert'],
+		}
+
+	def __repr__(self):
+		text = str(self) if len(self) <= 64 else str(self[:64]) + '...'
+		return f"<logic_array '{text}'>"
+
+	def __str__(self):
+		return numpy().frombuffer(b'01XZ', numpy().uint8)[self.codes].tobytes().decode()
+
+	def __len__(self):
+		return len(self.codes)
+
+	def __iter__(self):
+		return map(_logic_values.__getitem__, self.codes.tolist())
+
+	def __getitem__(self, index):
+		if type(index) is int:
+			return _logic_values[self.codes[index]]
+		return logic_array._wrap(self.codes[index])
+
+	def tolist(self):
+		"""Return elements as a list of logic values."""
+
+		return list(self)
+
+	@staticmethod
+	def _codes(value):
+		if isinstance(value, logic_array):
+			return value.codes
+		return logic(value)._logic_order
+
+	def _apply(self, name, other):
+		try:
+			other = logic_array._codes(other)
+		except ValueError:
+			return NotImplemented
+		return logic_array._wrap(_logic_tables()[name].take(self.codes << 2 | other))
+
+	def __invert__(self):
+		"""~self"""
+
+		return logic_array._wrap(_logic_tables()['invert'].take(self.codes))
+
+	def __and__(self, other):
+		"""self & other"""
+
+		return self._apply('and', other)
+
+	__rand__ = __and__
+
+	def __or__(self, other):
+		"""self | other"""
+
+		return self._apply('or', other)
+
+	__ror__ = __or__
+
+	def __xor__(self, other):
+		"""self ^ other"""
+
+		return self._apply('xor', other)
+
+	__rxor__ = __xor__
+
+	def __eq__(self, other):
+		if type(other) is str and other == '-':
+			return numpy().ones(len(self), bool)
+		try:
+			return self.codes == logic_array._codes(other)
+		except ValueError:
+			return NotImplemented
+
+	def __ne__(self, other):
+		eq = self.__eq__(other)
+		return NotImplemented if eq is NotImplemented else ~eq
+
+	__hash__ = None
+
+
+@export
+class logvec_array:
+	"""Array of vectors of a single logvec type.
+
+	The bit planes of all elements are stored in NumPy arrays: as
+	uint64 for vectors of up to 64 bits and as Python integers
+	otherwise. Indexing with an int returns an element, indexing
+	with anything else NumPy understands returns a new array, and
+	array[rows, hi:lo] extracts a bit field from every element.
+	"""
+
+	__slots__ = 'type', '_value', '_unknown', '_hi_z'
+
+	def __init__(self, type, values = ()):
+		if not isinstance(values, logvec_array):
+			elems = [type(v) for v in values]
+			values = logvec_array._packed(
+				type,
+				[e._value for e in elems],
+				[e._unknown for e in elems],
+				[e._hi_z for e in elems])
+		elif values.type._width != type._width:
+			raise ValueError(f"{values!r}: not {type.__name__}")
+
+		self.type = type
+		self._value = values._value
+		self._unknown = values._unknown
+		self._hi_z = values._hi_z
+
+	@staticmethod
+	def _dtype(ty):
+		return numpy().uint64 if ty._width <= 64 else object
+
+	@staticmethod
+	def _packed(ty, value, unknown, hi_z, size = None):
+		"""Create array from planes, broadcasting plain ints."""
+
+		np = numpy()
+		dtype = logvec_array._dtype(ty)
+		def plane(p):
+			if isinstance(p, np.ndarray):
+				return p.astype(dtype, copy = False)
+			elif type(p) is int:
+				return np.full(size, p, dtype)
+			return np.array(p, dtype)
+
+		obj = object.__new__(logvec_array)
+		obj.type = ty
+		obj._value, obj._unknown, obj._hi_z = plane(value), plane(unknown), plane(hi_z)
+		return obj
+
+	def __repr__(self):
+		return f"<logvec_array {self.type.__name__} x {len(self)}>"
+
+	def __len__(self):
+		return len(self._value)
+
+	def _elem(self, index):
+		return self.type._packed(
+			int(self._value[index]),
+			int(self._unknown[index]),
+			int(self._hi_z[index]))
+
+	def __iter__(self):
+		return map(self._elem, range(len(self)))
+
+	def tolist(self):
+		"""Return elements as a list of vectors."""
+
+		return list(self)
+
+	def __getitem__(self, index):
+		if type(index) is int:
+			return self._elem(index)
+
+		bits = None
+		if type(index) is tuple:
+			index, bits = index
+
+		if bits is None:
+			ty, end, mask = self.type, 0, None
+		else:
+			if type(bits) is not slice:
+				bits = slice(bits, bits)
+			end, mask, ty = self.type._slice(bits)
+
+		planes = []
+		for plane in (self._value, self._unknown, self._hi_z):
+			plane = plane[index]
+			if mask is not None:
+				plane = plane >> end & mask
+			planes.append(plane)
+		return logvec_array._packed(ty, *planes, size = len(planes[0]))
+
+	def ints(self):
+		"""Return the integer values of all elements.
+
+		Signed vectors give signed values, others unsigned ones.
+		Raises ValueError if any element has unknown bits.
+		"""
+
+		if self._unknown.any():
+			raise ValueError(f"{self!r}: unknown bits")
+		return self._numbers()
+
+	def _numbers(self):
+		"""Return the integer values of all elements, reading unknown
+		bits as 0.
+		"""
+
+		np = numpy()
+		if not issubclass(self.type, signed_logvec):
+			return self._value.copy()
+
+		width = self.type._width
+		if width == 64:
+			return self._value.view(np.int64).copy()
+		sign = 1 << (width - 1)
+		if width < 64:
+			return (self._value ^ sign).astype(np.int64) - sign
+		return (self._value ^ sign) - sign
+
+	def to_bytes(self):
+		"""Return the bytes of all elements, each like
+		logvec.to_bytes(). Raises ValueError if any element has
+		unknown bits.
+		"""
+
+		np = numpy()
+		if self._unknown.any():
+			raise ValueError(f"{self!r}: unknown bits")
+		size = (self.type._width + 7) // 8
+		if self._value.dtype == object:
+			return b''.join(int(v).to_bytes(size, 'big') for v in self._value)
+		return self._value.astype('>u8').view(np.uint8).reshape(-1, 8)[:, 8 - size:].tobytes()
+
+	def _operand(self, other):
+		"""Convert other to an array or vector of the same width, or
+		return None.
+		"""
+
+		try:
+			if isinstance(other, logvec_array):
+				left, right = logvec._same_types(self.type(0), other.type(0))
+				if len(left) != len(right):
+					return None
+				return type(left), other
+			left, right = logvec._same_length(self.type(0), other)
+			if len(left) != self.type._width:
+				return None
+			return type(left), right
+		except (TypeError, ValueError):
+			return None
+
+	def _apply(self, oper, other, swap = False):
+		operand = self._operand(other)
+		if operand is None:
+			return NotImplemented
+		ty, other = operand
+		planes = oper(other, self) if swap else oper(self, other)
+		return logvec_array._packed(ty, *planes, size = len(self))
+
+	def __invert__(self):
+		"""~self"""
+
+		return logvec_array._packed(
+			self.type,
+			self.type._mask ^ (self._value | self._unknown),
+			self._unknown,
+			0,
+			size = len(self))
+
+	def __and__(self, other):
+		"""self & other"""
+
+		return self._apply(logvec._and, other)
+
+	def __rand__(self, other):
+		"""other & self"""
+
+		return self._apply(logvec._and, other, True)
+
+	def __or__(self, other):
+		"""self | other"""
+
+		return self._apply(logvec._or, other)
+
+	def __ror__(self, other):
+		"""other | self"""
+
+		return self._apply(logvec._or, other, True)
+
+	def __xor__(self, other):
+		"""self ^ other"""
+
+		return self._apply(logvec._xor, other)
+
+	def __rxor__(self, other):
+		"""other ^ self"""
+
+		return self._apply(logvec._xor, other, True)
+
+	@staticmethod
+	def _add(left, right, carry = 0, invert = False):
+		mask = left.type._mask if isinstance(left, logvec_array) else right.type._mask
+		rvalue, runknown = right._value, right._unknown
+		if invert:
+			rvalue = mask ^ (rvalue | runknown)
+
+		# see logvec._add
+		low = left._value + rvalue + carry
+		high = (left._value | left._unknown) + (rvalue | runknown) + carry
+		unknown = (left._unknown | runknown | low ^ high) & mask
+		return low & mask & ~unknown, unknown, 0
+
+	def _arith(self, other, swap, invert):
+		if not issubclass(self.type, (unsigned_logvec, signed_logvec)):
+			return NotImplemented
+		operand = self._operand(other)
+		if operand is None:
+			return NotImplemented
+		ty, other = operand
+		left, right = (other, self) if swap else (self, other)
+		planes = logvec_array._add(left, right, int(invert), invert)
+		return logvec_array._packed(ty, *planes, size = len(self))
+
+	def __add__(self, other):
+		"""self + other"""
+
+		return self._arith(other, False, False)
+
+	def __radd__(self, other):
+		"""other + self"""
+
+		return self._arith(other, True, False)
+
+	def __sub__(self, other):
+		"""self - other"""
+
+		return self._arith(other, False, True)
+
+	def __rsub__(self, other):
+		"""other - self"""
+
+		return self._arith(other, True, True)
+
+	def __eq__(self, other):
+		if type(other) is int and issubclass(self.type, (unsigned_logvec, signed_logvec)):
+			# like the vectors, compare as numbers
+			return (self._numbers() == other) & (self._unknown == 0)
+		operand = self._operand(other)
+		if operand is None:
+			return NotImplemented
+		other = operand[1]
+		return (self._value == other._value) \
+		     & (self._unknown == other._unknown) \
+		     & (self._hi_z == other._hi_z)
+
+	def __ne__(self, other):
+		eq = self.__eq__(other)
+		return NotImplemented if eq is NotImplemented else ~eq
+
+	__hash__ = None
+
+	def _cmp(self, other):
+		"""Compare all elements like their vector type does."""
+
+		np = numpy()
+		if issubclass(self.type, signed_logvec):
+			elem_cmp = signed_logvec._cmp
+		elif issubclass(self.type, unsigned_logvec):
+			elem_cmp = logvec._cmp
+		else:
+			elem_cmp = logvec._lexcmp
+
+		if type(other) is int and elem_cmp is not logvec._lexcmp:
+			unknown = self._unknown != 0
+			left = self._numbers()
+			cmp = (left > other).astype(np.int8) - (left < other)
+		else:
+			operand = self._operand(other)
+			if operand is None:
+				if isinstance(other, logvec_array):
+					return NotImplemented
+				unknown = np.ones(len(self), bool)
+				cmp = np.zeros(len(self), np.int8)
+			else:
+				right = operand[1]
+				unknown = (self._unknown | right._unknown) != 0
+				left, right = self._value, right._value
+				if elem_cmp is signed_logvec._cmp:
+					sign = 1 << (self.type._width - 1)
+					left = (left ^ sign).astype(object) - sign
+					right = (right ^ sign) - sign if type(right) is int \
+					        else (right ^ sign).astype(object) - sign
+				cmp = (left > right).astype(np.int8) - (left < right)
+
+		# vectors with unknown bits have subtle ordering rules, so
+		# leave them to the vector type
+		for i in np.flatnonzero(unknown):
+			r = other[int(i)] if isinstance(other, logvec_array) else other
+			c = elem_cmp(self._elem(int(i)), r)
+			if c is NotImplemented:
+				return NotImplemented
+			cmp[i] = c
+		return cmp
+
+	def __lt__(self, other):
+		cmp = self._cmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp < 0
+
+	def __le__(self, other):
+		cmp = self._cmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp <= 0
+
+	def __gt__(self, other):
+		cmp = self._cmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp > 0
+
+	def __ge__(self, other):
+		cmp = self._cmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp >= 0
+
+	@property
+	def logvec(self):
+		return logvec_array(logvec[self.type.__args__[0]], self)
+
+	@property
+	def unsigned(self):
+		return logvec_array(unsigned_logvec[self.type.__args__[0]], self)
+
+	@property
+	def signed(self):
+		return logvec_array(signed_logvec[self.type.__args__[0]], self)
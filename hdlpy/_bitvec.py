@@ -0,0 +1,917 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from ._lib import export, type_property
+from ._logic import logic
+from ._logvec import logvec, unsigned_logvec, signed_logvec, logvec_view, \
+	_GenericLogvecType, _types, _literal, _parse, _radixes, _signed, \
+	_format_digits
+from ._pattern import pattern
+from ._span import rspan
+
+@export
+class bit:
+	"""Represents a two-state signal: 0 or 1.
+
+	Value can be any of '0', '1', 0, 1, False, True or the logic values
+	0 and 1. Unlike logic there is no X or Z, which makes bit cheaper
+	to use for signals that never need them. Convert explicitly between
+	the two with bit(value) and value.logic.
+	"""
+
+	# results of the operators, indexed by the other operand
+	__slots__ = '_int', '_not', '_and', '_or', '_xor'
+
+	def __new__(cls, value = 0):
+		if type(value) is bit:
+			return value
+		elif type(value) is int or type(value) is bool:
+			if value == 0:
+				return cls.zero
+			elif value == 1:
+				return cls.one
+		elif type(value) is str:
+			if value == '0':
+				return cls.zero
+			elif value == '1':
+				return cls.one
+		else:
+			try:
+				if value._logic_value is logic.zero:
+					return cls.zero
+				elif value._logic_value is logic.one:
+					return cls.one
+			except AttributeError:
+				pass
+
+		raise ValueError(f"{value!r}: not a valid bit value")
+
+	def __repr__(self):
+		return f"<bit '{self!s}'>"
+
+	def __str__(self):
+		return '1' if self._int else '0'
+
+	def __format__(self, fmt):
+		if fmt != '':
+			raise ValueError(fmt)
+		return str(self)
+
+	def __int__(self):
+		return self._int
+
+	def __index__(self):
+		return self._int
+
+	def __bool__(self):
+		return self is bit.one
+
+	def __hash__(self):
+		return self._int
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	@property
+	def logic(self):
+		return logic.one if self._int else logic.zero
+
+	def __eq__(self, other):
+		if type(other) is bit:
+			return self is other
+		try:
+			return (type(other) is str and other == '-') or self is bit(other)
+		except ValueError:
+			return NotImplemented
+
+	def __ne__(self, other):
+		eq = self.__eq__(other)
+		return NotImplemented if eq is NotImplemented else not eq
+
+	def _order(self, other):
+		try:
+			return self._int - bit(other)._int
+		except ValueError:
+			return None
+
+	def __lt__(self, other):
+		cmp = self._order(other)
+		return NotImplemented if cmp is None else cmp < 0
+
+	def __le__(self, other):
+		cmp = self._order(other)
+		return NotImplemented if cmp is None else cmp <= 0
+
+	def __gt__(self, other):
+		cmp = self._order(other)
+		return NotImplemented if cmp is None else cmp > 0
+
+	def __ge__(self, other):
+		cmp = self._order(other)
+		return NotImplemented if cmp is None else cmp >= 0
+
+	def __invert__(self):
+		return self._not
+
+	def __and__(self, other):
+		try:
+			return self._and[other._int]
+		except AttributeError:
+			try:
+				return self._and[bit(other)._int]
+			except ValueError:
+				return NotImplemented
+
+	def __or__(self, other):
+		try:
+			return self._or[other._int]
+		except AttributeError:
+			try:
+				return self._or[bit(other)._int]
+			except ValueError:
+				return NotImplemented
+
+	def __xor__(self, other):
+		try:
+			return self._xor[other._int]
+		except AttributeError:
+			try:
+				return self._xor[bit(other)._int]
+			except ValueError:
+				return NotImplemented
+
+	__rand__ = __and__
+	__ror__ = __or__
+	__rxor__ = __xor__
+
+	def __add__(self, other):
+		"""self + other -> concatenation"""
+
+		try:
+			return bitvec[1:0]._packed(self._int << 1 | bit(other)._int)
+		except ValueError:
+			return NotImplemented
+
+	def __radd__(self, other):
+		"""other + self -> concatenation"""
+
+		try:
+			return bitvec[1:0]._packed(bit(other)._int << 1 | self._int)
+		except ValueError:
+			return NotImplemented
+
+	def __mul__(self, other):
+		"""self * other -> repetition"""
+
+		try:
+			if other < 0:
+				return NotImplemented
+			elif other == 0:
+				return bitvec.empty
+			ty = bitvec[other - 1:0]
+			return ty._packed(ty._mask if self._int else 0)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	__rmul__ = __mul__
+
+
+bit.zero = object.__new__(bit)
+bit.one = object.__new__(bit)
+_bits = bit.zero, bit.one
+for _int, _bit in enumerate(_bits):
+	_bit._int = _int
+	_bit._not = _bits[_int ^ 1]
+	_bit._and = tuple(_bits[_int & i] for i in range(2))
+	_bit._or = tuple(_bits[_int | i] for i in range(2))
+	_bit._xor = tuple(_bits[_int ^ i] for i in range(2))
+del _int, _bit
+_bit_chars = {'0': bit.zero, '1': bit.one}
+
+
+class _GenericBitvecType(_GenericLogvecType):
+	def _convert(cls, value):
+		"""Convert value to its width and value."""
+
+		try:
+			if isinstance(value, bitvec):
+				return len(value), value._value
+
+			if type(value) is logvec_view:
+				value = value.copy()
+
+			if type(value) is int:
+				if value < 0:
+					value += 1 << (value.bit_length() + 1)
+				elif cls._sign_extend:
+					# keep a positive int positive
+					return value.bit_length() + 1, value
+				return value.bit_length() or 1, value
+
+			if type(value) is str:
+				width, result, unknown, _ = _parse(value)
+			elif isinstance(value, logvec):
+				width, result, unknown = len(value), value._value, value._unknown
+			else:
+				try:
+					bits = (bit(value),)
+				except ValueError:
+					bits = tuple(bit(b) for b in value if b != '_')
+				result = 0
+				for b in bits:
+					result = result << 1 | b._int
+				return len(bits), result
+
+			if unknown:
+				raise ValueError(f"{value!r}: not a two-state value")
+			return width, result
+		except TypeError:
+			raise ValueError(value)
+
+	def __call__(cls, value):
+		if isinstance(value, cls):
+			return value
+		elif type(value) is str:
+			return _literal(cls, value)
+		return cls._make(value)
+
+	def _make(cls, value):
+		width, result = cls._convert(value)
+		if width == 0:
+			return cls.empty
+
+		return _types.get(cls, width - 1, 0)._packed(result)
+
+
+class _BitvecType(_GenericBitvecType):
+	def _convert(cls, value):
+		if type(value) is int:
+			return cls._width, cls._convert_int(value)
+
+		width, result = super()._convert(value)
+
+		if width > cls._width:
+			# hex and octal literals may have leading zero bits
+			# beyond the type
+			if type(value) is not str \
+			or result >> cls._width \
+			or value.replace('_', '')[:2] not in _radixes:
+				raise ValueError(f"{value!r}: too long for {cls.__name__}")
+			width = cls._width
+		elif 0 < width < cls._width and cls._sign_extend and result >> (width - 1):
+			result |= cls._mask ^ ((1 << width) - 1)
+
+		return cls._width, result
+
+	def _convert_int(cls, value):
+		"""Convert int to the value of this type, which takes
+		unsigned and two's complement numbers that fit.
+		"""
+
+		# signed types only take negative numbers down to their
+		# sign bit
+		high = value >> cls._width
+		if high and high != -1 \
+		or cls._sign_extend and value < -(1 << cls._width >> 1):
+			raise ValueError(f"{value!r}: too long for {cls.__name__}")
+		return value & cls._mask
+
+	def __getitem__(cls, index):
+		raise RuntimeError("not a generic type")
+
+	def _new(cls, value):
+		return cls._packed(value._value)
+
+	def _packed(cls, value):
+		obj = object.__new__(cls)
+		obj._value = value
+		return obj
+
+	def __call__(cls, value = None):
+		if type(value) is cls:
+			return value
+		elif value is None:
+			return cls._packed(0)
+		elif type(value) is int:
+			return cls._packed(cls._convert_int(value))
+		elif type(value) is str:
+			return _literal(cls, value)
+		elif isinstance(value, bitvec) and value._width == cls._width:
+			return cls._packed(value._value)
+
+		return cls._make(value)
+
+	def _make(cls, value):
+		return cls._packed(cls._convert(value)[1])
+
+
+_GenericBitvecType._concrete_type = _BitvecType
+
+@export
+class bitvec(metaclass = _GenericBitvecType):
+	"""Vector of two-state bits, stored as a single masked int.
+
+	Types, indexing and the unsigned and signed views work like those
+	of logvec, but there is no X or Z, so operations are plain integer
+	arithmetic. Convert explicitly between both with logvec[...](vec),
+	or vec.logvec, and bitvec[...](vec), which fails on X or Z.
+	"""
+
+	__slots__ = '_value',
+	_name_fmt = 'bitvec[{0}]'
+	_literals = {}
+	_sign_extend = False
+
+	# planes as seen by logvec and patterns
+	_two_state = True
+	_unknown = _hi_z = 0
+
+	@classmethod
+	def from_bytes(cls, data, byteorder = 'big'):
+		"""Create vector from the bytes of data, like logvec.from_bytes."""
+
+		width = memoryview(data).nbytes * 8
+		value = int.from_bytes(data, byteorder)
+		if not hasattr(cls, '_width'):
+			if width == 0:
+				return cls.empty
+			cls = _types.get(cls, width - 1, 0)
+		elif width != (cls._width + 7) // 8 * 8 or value >> cls._width:
+			raise ValueError(f"{data!r}: does not fit {cls.__name__}")
+		return cls._packed(value)
+
+	def to_bytes(self, byteorder = 'big'):
+		"""Return the bits of self as bytes, padded with zeroes to whole
+		bytes.
+		"""
+
+		return self._value.to_bytes((self._width + 7) // 8, byteorder)
+
+	def __bytes__(self):
+		return self.to_bytes()
+
+	def __buffer__(self, flags):
+		return memoryview(self.to_bytes())
+
+	_coercion = classmethod(logvec._coercion.__func__)
+
+	@staticmethod
+	def _coerce(obj, ty, ext):
+		if type(obj) is ty:
+			return obj
+		value = obj._value
+		if ext and ty._sign_extend and obj._width and value >> (obj._width - 1):
+			value |= ext
+		return ty._packed(value)
+
+	_same_pair = classmethod(logvec._same_pair.__func__)
+	_same_types = classmethod(logvec._same_types.__func__)
+	_same_length = classmethod(logvec._same_length.__func__)
+
+	@staticmethod
+	def _concat(left, right):
+		try:
+			left, right = bitvec._same_types(left, right)
+			ty = left.__origin__[rspan(
+				start = left._width + right._width - 1,
+				end = 0)]
+			return ty._packed(left._value << right._width | right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	@staticmethod
+	def _add(left, right, carry = 0):
+		try:
+			left, right = bitvec._same_length(left, right)
+			return type(left)._packed((left._value + right._value + carry) & left._mask)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	@staticmethod
+	def _sub(left, right):
+		try:
+			left, right = bitvec._same_length(left, right)
+			return type(left)._packed((left._value - right._value) & left._mask)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __repr__(self):
+		return f"<{type(self).__name__} '{self!s}'>"
+
+	def __str__(self):
+		return format(self._value, f"0{self._width}b") if self._width else ''
+
+	def __len__(self):
+		return self._width
+
+	def __iter__(self):
+		return map(_bit_chars.__getitem__, str(self))
+
+	def __reversed__(self):
+		"""reversed(self)"""
+
+		return map(_bit_chars.__getitem__, reversed(str(self)))
+
+	def __hash__(self):
+		return hash(self._value)
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def _bit(self, bit):
+		"""Get bit (counting from the least significant bit)."""
+
+		return _bits[self._value >> bit & 1]
+
+	def __format__(self, fmt):
+		if fmt == 'b' or fmt == '':
+			return str(self)
+		elif fmt == 'd' or fmt == 'n':
+			return str(self._value)
+		elif fmt == 'o' or fmt == 'x' or fmt == 'X':
+			return _format_digits(self._width, self._value, 0, fmt)
+		else:
+			raise ValueError(fmt)
+
+	# indices go from high to low and slices are inclusive, just
+	# like logvec
+	__getitem__ = logvec.__getitem__
+
+	def _extract(self, end, mask, ty):
+		return ty._packed(self._value >> end & mask)
+
+	_slice = classmethod(logvec._slice.__func__)
+
+	bitvec = type_property()
+	unsigned = type_property()
+	signed = type_property()
+	logvec = type_property()
+
+	@bitvec.type
+	def bitvec(cls):
+		return bitvec[cls.__args__[0]]
+
+	@bitvec.value
+	def bitvec(self):
+		return type(self).bitvec._packed(self._value)
+
+	@unsigned.type
+	def unsigned(cls):
+		return unsigned_bitvec[cls.__args__[0]]
+
+	@unsigned.value
+	def unsigned(self):
+		return type(self).unsigned._packed(self._value)
+
+	@signed.type
+	def signed(cls):
+		return signed_bitvec[cls.__args__[0]]
+
+	@signed.value
+	def signed(self):
+		return type(self).signed._packed(self._value)
+
+	@logvec.type
+	def logvec(cls):
+		"""The four-valued counterpart of this type."""
+
+		return _four_state[cls.__origin__][cls.__args__[0]]
+
+	@logvec.value
+	def logvec(self):
+		return type(self).logvec._packed(self._value, 0, 0)
+
+	def __eq__(self, other):
+		if type(other) is type(self):
+			return self._value == other._value
+		# see logvec.__eq__
+		if getattr(other, '_sign_extend', self._sign_extend) is not self._sign_extend:
+			return NotImplemented
+		try:
+			if type(other) is int:
+				return self._value == type(self)._convert_int(other)
+			if type(other) is str and '-' in other:
+				other = pattern(other)
+			if type(other) is pattern:
+				return len(other) == self._width and other._match(self)
+			return self._value == type(self)(other)._value
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __ne__(self, other):
+		eq = self.__eq__(other)
+		return NotImplemented if eq is NotImplemented else not eq
+
+	def _lexcmp(self, other):
+		if not isinstance(other, bitvec):
+			return NotImplemented
+		left, right = str(self), str(other)
+		return (left > right) - (left < right)
+
+	def __lt__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp < 0
+
+	def __le__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp <= 0
+
+	def __gt__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp > 0
+
+	def __ge__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp >= 0
+
+	def __invert__(self):
+		"""~self"""
+
+		return type(self)._packed(self._mask ^ self._value)
+
+	def __and__(self, other):
+		"""self & other"""
+
+		if type(other) is type(self):
+			return type(self)._packed(self._value & other._value)
+		try:
+			left, right = bitvec._same_length(self, other)
+			return type(left)._packed(left._value & right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __rand__(self, other):
+		"""other & self"""
+
+		try:
+			left, right = bitvec._same_length(other, self)
+			return type(left)._packed(left._value & right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __or__(self, other):
+		"""self | other"""
+
+		if type(other) is type(self):
+			return type(self)._packed(self._value | other._value)
+		try:
+			left, right = bitvec._same_length(self, other)
+			return type(left)._packed(left._value | right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __ror__(self, other):
+		"""other | self"""
+
+		try:
+			left, right = bitvec._same_length(other, self)
+			return type(left)._packed(left._value | right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __xor__(self, other):
+		"""self ^ other"""
+
+		if type(other) is type(self):
+			return type(self)._packed(self._value ^ other._value)
+		try:
+			left, right = bitvec._same_length(self, other)
+			return type(left)._packed(left._value ^ right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __rxor__(self, other):
+		"""other ^ self"""
+
+		try:
+			left, right = bitvec._same_length(other, self)
+			return type(left)._packed(left._value ^ right._value)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def shift_left(self, amount, fill = bit.zero):
+		"""Logically shift left by amount."""
+
+		amount = min(logvec._shift_amount(amount), self._width)
+		value = self._value << amount & self._mask
+		if bit(fill)._int:
+			value |= (1 << amount) - 1
+		return type(self)._packed(value)
+
+	def __lshift__(self, amount):
+		return self.shift_left(amount)
+
+	def rotate_left(self, amount):
+		"""Rotate left by amount."""
+
+		amount = logvec._shift_amount(amount) % self._width
+		value = self._value
+		return type(self)._packed((value << amount | value >> (self._width - amount)) & self._mask)
+
+	def shift_right(self, amount, fill = bit.zero):
+		"""Logically shift right by amount."""
+
+		amount = min(logvec._shift_amount(amount), self._width)
+		value = self._value >> amount
+		if bit(fill)._int:
+			value |= self._mask ^ self._mask >> amount
+		return type(self)._packed(value)
+
+	def __rshift__(self, amount):
+		return self.shift_right(amount)
+
+	def rotate_right(self, amount):
+		"""Rotate right by amount."""
+
+		amount = logvec._shift_amount(amount) % self._width
+		value = self._value
+		return type(self)._packed((value >> amount | value << (self._width - amount)) & self._mask)
+
+	def __add__(self, other):
+		"""Concatenate self and other."""
+
+		return bitvec._concat(self, other)
+
+	def __radd__(self, other):
+		"""Concatenate other and self."""
+
+		return bitvec._concat(other, self)
+
+	def __mul__(self, other):
+		"""Repeat self times other."""
+
+		try:
+			if other <= 0:
+				return NotImplemented if other < 0 else self.empty
+			ty = bitvec[self._width * other - 1:0]
+			# multiplying by 0b...0001_0001 puts a copy at every multiple of the width
+			return ty._packed(self._value * (ty._mask // self._mask) if self._mask else 0)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __rmul__(self, other):
+		"""Repeat self times other."""
+
+		return self.__mul__(other)
+
+
+class _number_bitvec(bitvec):
+	"""Arithmetic shared by the unsigned and signed views, on top of
+	their integer values.
+	"""
+
+	__slots__ = ()
+
+	def __eq__(self, other):
+		if type(other) is type(self):
+			return self._value == other._value
+		elif type(other) is int:
+			return int(self) == other
+		return super().__eq__(other)
+
+	def __hash__(self):
+		return hash(int(self))
+
+	@staticmethod
+	def _cmp(left, right):
+		try:
+			if type(right) is not int:
+				left, right = bitvec._same_length(left, right)
+			return (int(left) > int(right)) - (int(left) < int(right))
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __lt__(self, other):
+		cmp = self._cmp(self, other)
+		return NotImplemented if cmp is NotImplemented else cmp < 0
+
+	def __le__(self, other):
+		cmp = self._cmp(self, other)
+		return NotImplemented if cmp is NotImplemented else cmp <= 0
+
+	def __gt__(self, other):
+		cmp = self._cmp(self, other)
+		return NotImplemented if cmp is NotImplemented else cmp > 0
+
+	def __ge__(self, other):
+		cmp = self._cmp(self, other)
+		return NotImplemented if cmp is NotImplemented else cmp >= 0
+
+	def __add__(self, other):
+		"""self + other"""
+
+		if type(other) is type(self):
+			return type(self)._packed((self._value + other._value) & self._mask)
+		elif type(other) is int and 0 <= other <= self._mask >> self._sign_extend:
+			return type(self)._packed((self._value + other) & self._mask)
+		return bitvec._add(self, other)
+
+	def __radd__(self, other):
+		"""other + self"""
+
+		return bitvec._add(other, self)
+
+	def __sub__(self, other):
+		"""self - other"""
+
+		if type(other) is type(self):
+			return type(self)._packed((self._value - other._value) & self._mask)
+		elif type(other) is int and 0 <= other <= self._mask >> self._sign_extend:
+			return type(self)._packed((self._value - other) & self._mask)
+		return bitvec._sub(self, other)
+
+	def __rsub__(self, other):
+		"""other - self"""
+
+		return bitvec._sub(other, self)
+
+	@staticmethod
+	def _mul(left, right):
+		try:
+			left, right = bitvec._same_types(left, right)
+			ty = left.__origin__[rspan(start = left._width + right._width - 1, end = 0)]
+			return ty._packed(int(left) * int(right) & ty._mask)
+		except (TypeError, ValueError):
+			return NotImplemented
+
+	def __mul__(self, other):
+		"""self * other"""
+
+		return self._mul(self, other)
+
+	def __rmul__(self, other):
+		"""other * self"""
+
+		return self._mul(other, self)
+
+	def __floordiv__(self, other):
+		"""self // other"""
+
+		return self._divmod(self, other)[0]
+
+	def __rfloordiv__(self, other):
+		"""other // self"""
+
+		return self._divmod(other, self)[0]
+
+	def __mod__(self, other):
+		"""self % other"""
+
+		return self._divmod(self, other)[1]
+
+	def __rmod__(self, other):
+		"""other % self"""
+
+		return self._divmod(other, self)[1]
+
+
+class unsigned_bitvec(_number_bitvec):
+	__slots__ = ()
+	_name_fmt = 'bitvec[{0}].unsigned'
+	_literals = {}
+
+	@staticmethod
+	def _divmod(left, right):
+		if right == 0:
+			raise ValueError(right)
+		try:
+			left, right = bitvec._same_length(left, right)
+			quot, rem = divmod(left._value, right._value)
+			ty = left.__origin__[rspan(start = left._width - 1, end = 0)]
+			return type(left)._packed(quot), ty._packed(rem)
+		except (TypeError, ValueError):
+			return NotImplemented, NotImplemented
+
+	def __int__(self):
+		"""Unsigned integer value of self."""
+
+		return self._value
+
+	def __index__(self):
+		return self._value
+
+	@property
+	def unsigned(self):
+		return self
+
+
+class signed_bitvec(_number_bitvec):
+	__slots__ = ()
+	_name_fmt = 'bitvec[{0}].signed'
+	_literals = {}
+	_sign_extend = True
+
+	def __int__(self):
+		"""Signed integer value of self."""
+
+		return _signed(self._value, self._width)
+
+	def __index__(self):
+		return self.__int__()
+
+	def __format__(self, fmt):
+		if fmt == 'd' or fmt == 'n':
+			return format(int(self), fmt)
+		return super().__format__(fmt)
+
+	@property
+	def signed(self):
+		return self
+
+	def shift_right(self, amount, fill = None):
+		"""Arithmetically shift right by amount."""
+
+		return super().shift_right(amount, self._bit(self._width - 1) if fill is None else fill)
+
+	def __neg__(self):
+		"""-self"""
+
+		return type(self)._packed(-self._value & self._mask)
+
+	@staticmethod
+	def _divmod(left, right):
+		try:
+			left, right = bitvec._same_types(left, right)
+			ty = left.__origin__[rspan(start = max(left._width, right._width) - 1, end = 0)]
+			num, denom = int(left), int(right)
+			if denom == 0:
+				raise ValueError(right)
+
+			# truncate towards zero, like logvec
+			quot, rem = divmod(abs(num), abs(denom))
+			if (num < 0) != (denom < 0):
+				quot = -quot
+			if num < 0:
+				rem = -rem
+			return ty._packed(quot & ty._mask), ty._packed(rem & ty._mask)
+		except (TypeError, ValueError):
+			return NotImplemented, NotImplemented
+
+	def __abs__(self):
+		"""abs(self)"""
+
+		return -self if self._value >> (self._width - 1) else self
+
+
+_four_state = {
+	bitvec: logvec,
+	unsigned_bitvec: unsigned_logvec,
+	signed_bitvec: signed_logvec,
+}
+
+bitvec.empty = bitvec[rspan.empty]._packed(0)
+unsigned_bitvec.empty = unsigned_bitvec[rspan.empty]._packed(0)
+signed_bitvec.empty = signed_bitvec[rspan.empty]._packed(0)
+
+_two_state = {v: k for k, v in _four_state.items()}
+
+def _two_state_type(ty):
+	"""Return the two-state counterpart of a four-valued signal type,
+	or None if there is none.
+	"""
+
+	if ty is logic:
+		return bit
+	try:
+		# derived types, such as packed structs, have fields a
+		# bitvec does not
+		if ty.__origin__[ty.__args__[0]] is not ty:
+			return None
+		return _two_state[ty.__origin__][ty.__args__[0]]
+	except (AttributeError, KeyError, TypeError):
+		return None
+
+def _two_state_value(ty, value):
+	"""Convert value to two-state type ty with X and Z as 0.
+
+	Returns the converted value and whether value had any X or Z.
+	"""
+
+	if ty is bit:
+		if type(value) is bit:
+			return value, False
+		value = logic(value)
+		return _bits[value is logic.one], value is not logic.zero and value is not logic.one
+
+	value = ty.logvec(value)
+	return ty._packed(value._value), value._unknown != 0
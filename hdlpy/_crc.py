@@ -0,0 +1,342 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import zlib, binascii
+from ._lib import export
+from ._logic import logic
+from ._logvec import logvec, _types, unsigned_logvec
+from ._array import logvec_array
+
+def _reverse(value, width):
+	"""Reverse the lowest width bits of value."""
+
+	return int(format(value, f"0{width}b")[::-1], 2)
+
+def _bytes(data):
+	"""Return data as a buffer of bytes, or None if it has X or Z bits."""
+
+	if isinstance(data, logvec_array):
+		width = data.type._width
+	else:
+		width = getattr(data, '_width', None)
+		if width is None:
+			try:
+				return memoryview(data).cast('B')
+			except TypeError:
+				return bytes(data)
+
+	if width % 8:
+		raise ValueError(f"{data!r}: not a whole number of bytes")
+	try:
+		return data.to_bytes()
+	except ValueError:
+		return None
+
+@export
+class crc:
+	"""Cyclic redundancy check with the given width and polynomial.
+
+	The parameters follow the usual catalogue of CRCs: init is the
+	initial register, reflect_in feeds the bits of each byte least
+	significant first, reflect_out reverses the result and xor_out
+	is applied last. Presets such as crc.crc32 are available.
+
+	A CRC can be computed at once with crc(data), or with a register
+	kept in a signal: reset() gives its initial value, update() feeds
+	it whole bytes, step() a single bit per clock and result() turns
+	it into the CRC. Data can be bytes or any other buffer, vectors
+	of whole bytes and arrays of those, most significant byte first.
+	X or Z in data or in the register make the entire register X,
+	except that step() keeps track of X bit by bit.
+	"""
+
+	__slots__ = 'width', 'poly', 'init', 'reflect_in', 'reflect_out', 'xor_out', 'type', '_poly', '_pad', '_table', '_update'
+
+	def __init__(self, width, poly, *, init = 0, reflect_in = False, reflect_out = False, xor_out = 0):
+		if width <= 0 or poly >> width or init >> width or xor_out >> width:
+			raise ValueError(f"{width!r}, {poly!r}: bad CRC parameters")
+
+		self.width = width
+		self.poly = poly
+		self.init = init
+		self.reflect_in = reflect_in
+		self.reflect_out = reflect_out
+		self.xor_out = xor_out
+		self.type = _types.get(unsigned_logvec, width - 1, 0)
+		self._table = None
+
+		# registers of reflected CRCs are kept reversed, registers of
+		# narrow ones are padded to a whole byte
+		self._poly = _reverse(poly, width) if reflect_in else poly
+		self._pad = 0 if reflect_in else max(8 - width, 0)
+		if width == 32 and poly == 0x04c11db7 and reflect_in:
+			self._update = self._update_crc32
+		elif width == 16 and poly == 0x1021 and not reflect_in:
+			self._update = self._update_crc_hqx
+		elif reflect_in:
+			self._update = self._update_reflected
+		else:
+			self._update = self._update_normal
+
+	def __repr__(self):
+		return f"crc({self.width}, {self.poly:#x}, init = {self.init:#x}, " \
+			f"reflect_in = {self.reflect_in}, reflect_out = {self.reflect_out}, xor_out = {self.xor_out:#x})"
+
+	def table(self):
+		"""Return the table of the register change for each byte."""
+
+		if self._table is None:
+			if self.reflect_in:
+				poly, table = self._poly, []
+				for byte in range(256):
+					reg = byte
+					for _ in range(8):
+						reg = reg >> 1 ^ (poly if reg & 1 else 0)
+					table.append(reg)
+			else:
+				width = self.width + self._pad
+				poly, top, mask, table = self.poly << self._pad, 1 << (width - 1), (1 << width) - 1, []
+				for byte in range(256):
+					reg = byte << (width - 8)
+					for _ in range(8):
+						reg = (reg << 1 ^ (poly if reg & top else 0)) & mask
+					table.append(reg)
+			self._table = tuple(table)
+		return self._table
+
+	def _update_reflected(self, reg, data):
+		table = self.table()
+		for byte in data:
+			reg = reg >> 8 ^ table[(reg ^ byte) & 0xff]
+		return reg
+
+	def _update_normal(self, reg, data):
+		table, pad = self.table(), self._pad
+		width = self.width + pad
+		shift, mask = width - 8, (1 << width) - 1
+		reg <<= pad
+		for byte in data:
+			reg = (reg << 8) & mask ^ table[reg >> shift ^ byte]
+		return reg >> pad
+
+	@staticmethod
+	def _update_crc32(reg, data):
+		# zlib keeps the register inverted
+		return zlib.crc32(data, reg ^ 0xffffffff) ^ 0xffffffff
+
+	@staticmethod
+	def _update_crc_hqx(reg, data):
+		return binascii.crc_hqx(data, reg)
+
+	def reset(self):
+		"""Return the initial register."""
+
+		return self.type._packed(_reverse(self.init, self.width) if self.reflect_in else self.init, 0, 0)
+
+	def update(self, reg, data):
+		"""Return the register after feeding it data."""
+
+		reg = self.type(reg)
+		data = _bytes(data)
+		if reg._unknown or data is None:
+			return self.type()
+		return self.type._packed(self._update(reg._value, data), 0, 0)
+
+	def step(self, reg, bit):
+		"""Return the register after feeding it a single bit."""
+
+		reg, bit, poly = self.type(reg), logic(bit), self._poly
+		if not reg._unknown and (bit is logic.zero or bit is logic.one):
+			value = reg._value
+			if self.reflect_in:
+				if (value ^ (bit is logic.one)) & 1:
+					return self.type._packed(value >> 1 ^ poly, 0, 0)
+				return self.type._packed(value >> 1, 0, 0)
+			if (value >> (self.width - 1) ^ (bit is logic.one)) & 1:
+				return self.type._packed((value << 1 ^ poly) & self.type._mask, 0, 0)
+			return self.type._packed(value << 1 & self.type._mask, 0, 0)
+
+		if self.reflect_in:
+			feedback = reg[0] ^ bit
+			reg = reg >> 1
+		else:
+			feedback = reg[-1] ^ bit
+			reg = reg << 1
+
+		if feedback is logic.zero:
+			return reg
+		elif feedback is logic.one:
+			return reg ^ poly
+		# the bits the polynomial would flip become X
+		return reg ^ (self.type() & poly)
+
+	def result(self, reg):
+		"""Return the CRC of a register."""
+
+		reg = self.type(reg)
+		if reg._unknown:
+			return self.type()
+		value = reg._value
+		if self.reflect_in != self.reflect_out:
+			value = _reverse(value, self.width)
+		return self.type._packed(value ^ self.xor_out, 0, 0)
+
+	def __call__(self, data):
+		"""Return the CRC of data."""
+
+		return self.result(self.update(self.reset(), data))
+
+crc.crc8 = crc(8, 0x07)
+crc.crc16_ccitt = crc(16, 0x1021, init = 0xffff)
+crc.crc16_xmodem = crc(16, 0x1021)
+crc.crc16_arc = crc(16, 0x8005, reflect_in = True, reflect_out = True)
+crc.crc32 = crc(32, 0x04c11db7, init = 0xffffffff, reflect_in = True, reflect_out = True, xor_out = 0xffffffff)
+crc.crc32c = crc(32, 0x1edc6f41, init = 0xffffffff, reflect_in = True, reflect_out = True, xor_out = 0xffffffff)
+
+@export
+class lfsr:
+	"""Linear feedback shift register, such as a PRBS generator.
+
+	taps are the exponents of the feedback polynomial other than its
+	constant term, such as (7, 6) for x^7 + x^6 + 1. The register
+	shifts towards its most significant bit, which is the output,
+	and shifts in the XOR of the tapped bits. Presets such as
+	lfsr.prbs31 are available.
+
+	The register can be kept in a signal and advanced one bit per
+	clock with step(), or generate() produces a block of output bits
+	at once, using tables that advance the register by its whole
+	width.
+	"""
+
+	__slots__ = 'width', 'taps', 'type', '_feedback', '_tables'
+
+	def __init__(self, taps):
+		taps = tuple(sorted(set(taps), reverse = True))
+		if not taps or taps[-1] <= 0:
+			raise ValueError(f"{taps!r}: bad taps")
+
+		self.width = taps[0]
+		self.taps = taps
+		self.type = _types.get(unsigned_logvec, self.width - 1, 0)
+		self._feedback = sum(1 << (t - 1) for t in taps)
+		self._tables = None
+
+	def __repr__(self):
+		return f"lfsr({self.taps!r})"
+
+	def _step(self, value):
+		return (value << 1 | (value & self._feedback).bit_count() & 1) & self.type._mask
+
+	def tables(self):
+		"""Return a table for each byte of the register, which give
+		the register after as many steps as it is wide.
+		"""
+
+		if self._tables is None:
+			# the register is a linear function of its bits, so
+			# each table entry combines the images of its bits
+			images = []
+			for bit in range(self.width):
+				value = 1 << bit
+				for _ in range(self.width):
+					value = self._step(value)
+				images.append(value)
+
+			tables = []
+			for low in range(0, self.width, 8):
+				table = [0] * 256
+				for byte in range(1, 256):
+					bit = (byte & -byte).bit_length() - 1
+					if low + bit < self.width:
+						table[byte] = table[byte & (byte - 1)] ^ images[low + bit]
+					else:
+						table[byte] = table[byte & (byte - 1)]
+				tables.append(tuple(table))
+			self._tables = tuple(tables)
+		return self._tables
+
+	def step(self, reg):
+		"""Return the register after one step. The output is the most
+		significant bit of the register before.
+		"""
+
+		reg = self.type(reg)
+		if not reg._unknown:
+			return self.type._packed(self._step(reg._value), 0, 0)
+		return reg.shift_left(1, fill = (reg & self._feedback).xor_reduce())
+
+	def generate(self, reg, count):
+		"""Return count output bits as a vector, first bit most
+		significant, and the register after them. X or Z in the
+		register make everything X.
+		"""
+
+		reg = self.type(reg)
+		if count <= 0:
+			return logvec.empty, reg
+		ty = _types.get(logvec, count - 1, 0)
+		if reg._unknown:
+			return ty(), self.type()
+
+		# the output bits of the next width steps are the register
+		# itself
+		width, tables = self.width, self.tables()
+		chunks = []
+		value = reg._value
+		for _ in range(-(-count // width)):
+			chunks.append(value)
+			following = 0
+			shift = 0
+			for table in tables:
+				following ^= table[value >> shift & 0xff]
+				shift += 8
+			value = following
+
+		fmt = f"0{width}b"
+		bits = int(''.join([format(chunk, fmt) for chunk in chunks]), 2)
+		rest = len(chunks) * width - count
+		reg = (chunks[-1] << (width - rest) | value >> rest) & self.type._mask
+		return ty._packed(bits >> rest, 0, 0), self.type._packed(reg, 0, 0)
+
+lfsr.prbs7 = lfsr((7, 6))
+lfsr.prbs9 = lfsr((9, 5))
+lfsr.prbs11 = lfsr((11, 9))
+lfsr.prbs15 = lfsr((15, 14))
+lfsr.prbs20 = lfsr((20, 3))
+lfsr.prbs23 = lfsr((23, 18))
+lfsr.prbs31 = lfsr((31, 28))
+
+@export
+def internet_checksum(data):
+	"""Return the ones' complement checksum of RFC 1071 over data, which
+	is taken like by crc, as an unsigned 16-bit vector.
+	"""
+
+	ty = _types.get(unsigned_logvec, 15, 0)
+	data = _bytes(data)
+	if data is None:
+		return ty()
+
+	# 2**16 is 1 modulo 0xffff, so summing the 16-bit words with end
+	# around carry is taking the whole message modulo 0xffff
+	value = int.from_bytes(data, 'big')
+	if len(data) % 2:
+		value <<= 8
+	total = value % 0xffff
+	if total == 0 and value:
+		total = 0xffff
+	return ty._packed(~total & 0xffff, 0, 0)
@@ -15,19 +15,304 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 
-import operator
-from functools import cache
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from weakref import WeakSet, WeakValueDictionary
 
 from ._logic import logic
 from ._lib import export, type_property
+from ._pattern import pattern
 from ._span import rspan
 
+_logic_chars = {
+	'0': logic.zero,
+	'1': logic.one,
+	'Z': logic.hi_z,
+	'X': logic.unknown,
+}
+
+# maps hex digits 0-3 (value + 2 * unknown + hi_z) to logic characters
+_planes_chars = str.maketrans('0123', '01XZ')
+
+# map logic characters to binary digits of each plane
+_value_digits = str.maketrans('XZ', '00')
+_unknown_digits = str.maketrans('01XZ', '0011')
+_hi_z_digits = str.maketrans('01XZ', '0001')
+_logic_digits = str.maketrans('', '', '01XZ')
+
+def _spread(value):
+	"""Move bit n of value to bit 4 * n."""
+
+	return int(format(value, 'b'), 16)
+
+def _planes_str(width, value, unknown, hi_z):
+	"""Format bit planes as a string of logic characters."""
+
+	if width == 0:
+		return ''
+	elif not unknown:
+		return format(value, f"0{width}b")
+
+	digits = _spread(value) + 2 * _spread(unknown) + _spread(hi_z)
+	return format(digits, f"0{width}x").translate(_planes_chars)
+
+def _signed(value, width):
+	"""Interpret value as a two's complement number of width bits."""
+
+	return value - (value << 1 & 1 << width)
+
+# maps formatted digits of the unknown plane to a byte mask that is 0xff
+# for every digit containing an unknown bit
+_unknown_digit_mask = str.maketrans('0123456789abcdef', '\x00' + '\xff' * 15)
+
+def _format_digits(width, value, unknown, fmt):
+	"""Format bit planes as octal or hexadecimal digits, with unknown
+	digits shown as x (or X).
+	"""
+
+	bits = 3 if fmt == 'o' else 4
+	count = max(1, (width + bits - 1) // bits)
+	digits = format(value, f"0{count}{fmt}")
+	if not unknown:
+		return digits
+
+	# merge the digits of both planes as byte strings, to avoid
+	# going through them one by one
+	mask = int.from_bytes(
+		format(unknown, f"0{count}{fmt.lower()}").translate(_unknown_digit_mask).encode('latin-1'),
+		'big')
+	fill = int.from_bytes(('X' if fmt == 'X' else 'x').encode() * count, 'big')
+	merged = int.from_bytes(digits.encode(), 'big') & ~mask | fill & mask
+	return merged.to_bytes(count, 'big').decode()
+
+def _radix_tables(digits, full):
+	"""Make translate tables for digits that may also be X or Z: to
+	remove valid digits and to get the digits of each plane.
+	"""
+
+	chars = digits + 'xXzZ'
+	return (
+		str.maketrans('', '', chars),
+		str.maketrans('xXzZ', '0000'),
+		str.maketrans(chars, '0' * len(digits) + full * 4),
+		str.maketrans(chars, '0' * len(digits) + '00' + full * 2),
+	)
+
+# literal prefixes with their base, bits per digit and translate tables
+_radixes = {
+	'0x': (16, 4, _radix_tables('0123456789abcdefABCDEF', 'f')),
+	'0o': (8, 3, _radix_tables('01234567', '7')),
+}
+
+def _parse(value):
+	"""Parse a string of logic characters, or of hexadecimal or octal
+	digits after a 0x or 0o prefix, into width and bit planes.
+	"""
+
+	digits = value.replace('_', '')
+	radix = _radixes.get(digits[:2])
+	if radix is not None:
+		base, bits, (invalid, value_digits, unknown_digits, hi_z_digits) = radix
+		digits = digits[2:]
+		if not digits or digits.translate(invalid):
+			raise ValueError(f"{value!r}: not a valid literal")
+		return len(digits) * bits, \
+			int(digits.translate(value_digits), base), \
+			int(digits.translate(unknown_digits), base), \
+			int(digits.translate(hi_z_digits), base)
+
+	if digits.translate(_logic_digits):
+		raise ValueError(f"{value!r}: not a valid logic value")
+	elif not digits:
+		return 0, 0, 0, 0
+	elif 'X' not in digits and 'Z' not in digits:
+		return len(digits), int(digits, 2), 0, 0
+
+	return len(digits), \
+		int(digits.translate(_value_digits), 2), \
+		int(digits.translate(_unknown_digits), 2), \
+		int(digits.translate(_hi_z_digits), 2)
+
+def _planes_bit(value, unknown, hi_z, bit):
+	"""Get a single bit from bit planes as logic value."""
+
+	if unknown >> bit & 1:
+		return logic.hi_z if hi_z >> bit & 1 else logic.unknown
+	return logic.one if value >> bit & 1 else logic.zero
+
+def _planes_fill(value, unknown, hi_z, bit, mask):
+	"""Set the bits in mask to the logic value bit."""
+
+	if bit is logic.one:
+		value |= mask
+	elif bit is not logic.zero:
+		unknown |= mask
+		if bit is logic.hi_z:
+			hi_z |= mask
+	return value, unknown, hi_z
+
+def _pack(bits):
+	"""Pack an iterable of logic values into bit planes."""
+
+	value = unknown = hi_z = 0
+	for bit in bits:
+		value <<= 1
+		unknown <<= 1
+		hi_z <<= 1
+		if bit is logic.one:
+			value |= 1
+		elif bit is not logic.zero:
+			unknown |= 1
+			if bit is logic.hi_z:
+				hi_z |= 1
+	return value, unknown, hi_z
+
+_InternInfo = namedtuple('_InternInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+class _Interning:
+	"""Cache of shared vector instances, see logvec.intern().
+
+	Each type keeps its own LRU of instances in _interned, so the
+	cache goes away with the type instead of keeping it alive.
+	"""
+
+	__slots__ = 'width', 'size', 'types'
+
+	def __init__(self):
+		self.width = -1
+		self.size = 0
+		self.types = WeakSet()
+
+	def configure(self, width, size):
+		if width is not None and (width < 0 or size <= 0):
+			raise ValueError(f"{width!r}, {size!r}: bad interning parameters")
+		self.width = -1
+		for ty in self.types:
+			ty._interned = None
+		self.types.clear()
+		if width is not None:
+			self.size = size
+			self.width = width
+
+	def add(self, cls):
+		"""Start interning instances of cls and return its lookup."""
+
+		cls._interned = lookup = lru_cache(maxsize = self.size)(cls._alloc)
+		self.types.add(cls)
+		return lookup
+
+	def info(self):
+		if self.width < 0:
+			return None
+		hits = misses = currsize = 0
+		for ty in self.types:
+			info = ty._interned.cache_info()
+			hits += info.hits
+			misses += info.misses
+			currsize += info.currsize
+		return _InternInfo(hits, misses, self.size, currsize)
+
+_interning = _Interning()
+
+def _literal(cls, text):
+	"""Convert a string literal to a vector of type cls, cached in
+	cls._literals.
+	"""
+
+	literals = cls._literals
+	try:
+		return literals[text]
+	except KeyError:
+		pass
+	obj = cls._make(text)
+	if len(literals) >= _max_slices:
+		literals.clear()
+	literals[text] = obj
+	return obj
+
+_TypeCacheInfo = namedtuple('_TypeCacheInfo', ('hits', 'misses', 'maxsize', 'currsize', 'live'))
+
+class _TypeCache:
+	"""Registry of generated vector types.
+
+	The most recently used types are kept in a bounded LRU. Evicted
+	types remain reachable through weak references for as long as
+	anything else (an instance, an annotation) holds on to them, so
+	a given span always maps to the same type. Spans are keyed by
+	their bounds, so equal spans share a type however they were
+	spelled.
+	"""
+
+	__slots__ = 'maxsize', 'hits', 'misses', 'recent', 'live'
+
+	def __init__(self, maxsize):
+		self.maxsize = maxsize
+		self.hits = self.misses = 0
+		self.recent = OrderedDict()
+		self.live = WeakValueDictionary()
+
+	def get(self, cls, start, end, span = None):
+		key = cls, start, end
+		try:
+			ty = self.recent[key]
+			self.recent.move_to_end(key)
+			self.hits += 1
+			return ty
+		except KeyError:
+			pass
+
+		ty = self.live.get(key)
+		if ty is None:
+			self.misses += 1
+			if span is None:
+				span = rspan(start = start, end = end)
+			ty = self.live[key] = cls._define_type(span)
+		else:
+			self.hits += 1
+
+		self.recent[key] = ty
+		if len(self.recent) > self.maxsize:
+			self.recent.popitem(last = False)
+		return ty
+
+	def resize(self, maxsize):
+		if maxsize <= 0:
+			raise ValueError(f"{maxsize!r}: bad type cache size")
+		self.maxsize = maxsize
+		while len(self.recent) > maxsize:
+			self.recent.popitem(last = False)
+
+	def info(self):
+		return _TypeCacheInfo(self.hits, self.misses, self.maxsize, len(self.recent), len(self.live))
+
+_types = _TypeCache(1024)
+
+# Maximum number of cached slices, literals and operand pairs per
+# vector type
+_max_slices = 256
+
+def _count_type(width):
+	"""Unsigned type of width bits, for counts and indices."""
+
+	return _types.get(unsigned_logvec, width - 1, 0)
+
 class _GenericLogvecType(type):
-	@cache
 	def _make_type(cls, span):
-		class logvec(cls, metaclass = _LogvecType):
+		return _types.get(cls, *span, span)
+
+	def _define_type(cls, span):
+		class logvec(cls, metaclass = type(cls)._concrete_type):
+			__slots__ = ()
 			__origin__ = cls
 			__args__ = (span,)
+			_start, _end = span
+			_width = len(span)
+			_mask = (1 << len(span)) - 1
+			_slices = {}
+			_literals = {}
+			_pair_types = {}
+			_pair_lengths = {}
+			_interned = None
 
 		if '.' in cls.__qualname__:
 			prefix = cls.__qualname__.rsplit(sep = '.', maxsplit = 1)[0] + '.'
@@ -36,10 +321,9 @@ class _GenericLogvecType(type):
 
 		if len(span) > 0:
 			logvec.__name__ = cls._name_fmt.format(str(span))
-		elif '_' in cls.__name__:
-			logvec.__name__ = 'logvec.empty.' + cls.__name__.split(sep = '_', maxsplit = 1)[0]
 		else:
-			logvec.__name__ = 'logvec.empty'
+			name, _, flavour = cls.__name__.rpartition('_')
+			logvec.__name__ = f"{flavour}.empty.{name}" if name else f"{flavour}.empty"
 		logvec.__qualname__ = prefix + logvec.__name__
 		logvec.__module__ = cls.__module__
 		return logvec
@@ -62,175 +346,478 @@ class _GenericLogvecType(type):
 			or index.start < index.stop \
 			or index.step is not None:
 				raise ValueError(f"{index!r}: bad slice")
-			index = rspan(start = index.start, end = index.stop)
+			return _types.get(cls, index.start, index.stop)
 
 		return cls._make_type(index)
 
 	def _convert(cls, value):
+		"""Convert value to its width and bit planes."""
+
 		try:
+			if type(value) is logvec_view:
+				value = value.copy()
 			if isinstance(value, logvec):
-				return tuple(value)
+				return len(value), value._value, value._unknown, value._hi_z
 
 			if type(value) is int:
 				if value < 0:
-					value = 2 ** (value.bit_length() + 1) + value
-				result = []
-				while True:
-					result.append(logic.one if value % 2 == 1 else logic.zero)
-					value >>= 1
-					if value == 0:
-						break
-				result.reverse()
-				return tuple(result)
+					value += 1 << (value.bit_length() + 1)
+				elif cls._sign_extend:
+					# keep a positive int positive
+					return value.bit_length() + 1, value, 0, 0
+				return value.bit_length() or 1, value, 0, 0
+
+			if type(value) is str:
+				return _parse(value)
+
+			if getattr(value, '_two_state', False):
+				return len(value), value._value, 0, 0
 
 			try:
-				return (value._logic_value,)
+				bits = (value._logic_value,)
 			except:
 				try:
-					return tuple(v._logic_value for v in value)
+					bits = tuple(v._logic_value for v in value)
 				except:
-					return tuple(logic(b) for b in value if b != '_')
+					bits = tuple(logic(b) for b in value if b != '_')
+			return len(bits), *_pack(bits)
 		except TypeError:
 			raise ValueError(value)
 
 	def __call__(cls, value):
 		if isinstance(value, cls):
 			return value
-		elif not isinstance(value, logvec):
-			value = cls._convert(value)
-		if len(value) == 0:
+		elif type(value) is str:
+			return _literal(cls, value)
+		return cls._make(value)
+
+	def _make(cls, value):
+		width, *planes = cls._convert(value)
+		if width == 0:
 			return cls.empty
 
-		return cls._make_type(rspan(start = len(value) - 1, end = 0))._new(value)
+		return _types.get(cls, width - 1, 0)._packed(*planes)
 
 
 class _LogvecType(_GenericLogvecType):
 	def _convert(cls, value):
-		if type(value) is int and value < 0:
-			value = 2 ** len(cls.__args__[0]) + value
-
-		result = super()._convert(value)
+		if type(value) is int:
+			return cls._width, cls._convert_int(value), 0, 0
+
+		width, result, unknown, hi_z = super()._convert(value)
+
+		if width > cls._width:
+			# hex and octal literals may have leading zero bits
+			# beyond the type
+			if type(value) is not str \
+			or (result | unknown) >> cls._width \
+			or value.replace('_', '')[:2] not in _radixes:
+				raise ValueError(f"{value!r}: too long for {cls.__name__}")
+			width = cls._width
+		elif width < cls._width and width > 0:
+			result, unknown, hi_z = _planes_fill(
+				result, unknown, hi_z,
+				cls._extend_with(_planes_bit(result, unknown, hi_z, width - 1)),
+				cls._mask ^ ((1 << width) - 1))
+
+		return cls._width, result, unknown, hi_z
+
+	def _convert_int(cls, value):
+		"""Convert int to a value plane, which takes unsigned and two's
+		complement numbers that fit.
+		"""
 
-		span = cls.__args__[0]
-		if len(result) < len(span):
-			if len(result) == 0:
-				result = (logic.zero,) * len(span)
-			else:
-				result = (cls._extend_with(result[0]),) * (len(span) - len(result)) + result
-		elif len(result) > len(span):
+		# signed types only take negative numbers down to their
+		# sign bit
+		high = value >> cls._width
+		if high and high != -1 \
+		or cls._sign_extend and value < -(1 << cls._width >> 1):
 			raise ValueError(f"{value!r}: too long for {cls.__name__}")
-
-		return result
+		return value & cls._mask
 
 	def __getitem__(cls, index):
 		raise RuntimeError("not a generic type")
 
 	def _new(cls, value):
-		return tuple.__new__(cls, value)
+		try:
+			return cls._packed(value._value, value._unknown, value._hi_z)
+		except AttributeError:
+			return cls._packed(*_pack(value))
+
+	def _packed(cls, value, unknown, hi_z):
+		if cls._width <= _interning.width:
+			lookup = cls._interned or _interning.add(cls)
+			return lookup(value, unknown, hi_z)
+		return cls._alloc(value, unknown, hi_z)
+
+	def _alloc(cls, value, unknown, hi_z):
+		obj = object.__new__(cls)
+		obj._value = value
+		obj._unknown = unknown
+		obj._hi_z = hi_z
+		return obj
 
 	def __call__(cls, value = None):
 		if type(value) is cls:
 			return value
 		elif value is None:
-			value = (logic.unknown,) * len(cls.__args__[0])
-		elif not (isinstance(value, logvec) and len(value) == len(cls.__args__[0])):
-			value = cls._convert(value)
+			return cls._packed(0, cls._mask, 0)
+		elif type(value) is int:
+			return cls._packed(cls._convert_int(value), 0, 0)
+		elif type(value) is str:
+			return _literal(cls, value)
+		elif isinstance(value, logvec) and len(value) == cls._width:
+			return cls._new(value)
+
+		return cls._make(value)
 
-		return cls._new(value)
+	def _make(cls, value):
+		return cls._packed(*cls._convert(value)[1:])
 
 
+_GenericLogvecType._concrete_type = _LogvecType
+
 @export
-class logvec(tuple, metaclass = _GenericLogvecType):
+class logvec(metaclass = _GenericLogvecType):
+	"""Vector of logic values.
+
+	Bits are stored as three integer planes: _value holds the bits
+	that are 1, _unknown the bits that are either X or Z and _hi_z
+	the bits that are Z. Bits set in _unknown are never set in
+	_value.
+	"""
+
+	__slots__ = '_value', '_unknown', '_hi_z'
 	_name_fmt = 'logvec[{0}]'
+	_literals = {}
+	_sign_extend = False
 
 	@staticmethod
 	def _extend_with(val):
 		return logic.zero
 
+	@classmethod
+	def from_hex(cls, digits):
+		"""Create vector from hexadecimal digits, which may include X
+		and Z digits.
+		"""
+
+		return cls('0x' + digits)
+
+	@classmethod
+	def from_oct(cls, digits):
+		"""Create vector from octal digits, which may include X and Z
+		digits.
+		"""
+
+		return cls('0o' + digits)
+
+	@classmethod
+	def from_bytes(cls, data, byteorder = 'big', *, unknown = None):
+		"""Create vector from the bytes of data, which can be any
+		buffer. Bits set in the buffer unknown are X.
+
+		Generic vector types take all bits of data, other types need
+		exactly as many bytes as it takes to hold them.
+		"""
+
+		width = memoryview(data).nbytes * 8
+		value = int.from_bytes(data, byteorder)
+		mask = 0
+		if unknown is not None:
+			if memoryview(unknown).nbytes * 8 != width:
+				raise ValueError(f"{unknown!r}: not as long as {data!r}")
+			mask = int.from_bytes(unknown, byteorder)
+
+		if not hasattr(cls, '_width'):
+			if width == 0:
+				return cls.empty
+			cls = _types.get(cls, width - 1, 0)
+		elif width != (cls._width + 7) // 8 * 8 or (value | mask) >> cls._width:
+			raise ValueError(f"{data!r}: does not fit {cls.__name__}")
+		return cls._packed(value & ~mask, mask, 0)
+
+	def to_bytes(self, byteorder = 'big', *, fill = None):
+		"""Return the bits of self as bytes, padded with zeroes to whole
+		bytes.
+
+		X and Z bits raise ValueError, unless fill is the bit (0 or 1)
+		to give them instead. unknown_bytes() tells where they are.
+		"""
+
+		value = self._value
+		if self._unknown:
+			if fill is None:
+				raise ValueError(f"{self!r}: has X or Z bits")
+			fill = logic(fill)
+			if fill is logic.one:
+				value |= self._unknown
+			elif fill is not logic.zero:
+				raise ValueError(f"{fill!r}: not a bit")
+		return value.to_bytes((self._width + 7) // 8, byteorder)
+
+	def unknown_bytes(self, byteorder = 'big'):
+		"""Return the X and Z bits of self as bytes laid out like
+		to_bytes().
+		"""
+
+		return self._unknown.to_bytes((self._width + 7) // 8, byteorder)
+
+	def __bytes__(self):
+		return self.to_bytes()
+
+	def __buffer__(self, flags):
+		# integers have no buffer of their own, so this exports a
+		# copy, big endian like bytes(self)
+		return memoryview(self.to_bytes())
+
 	@staticmethod
-	def _unsigned(obj):
-		value = 0
-		for bit in obj:
-			value <<= 1
-			if bit is logic.one:
-				value += 1
-			elif bit is not logic.zero:
-				raise ValueError("{obj!r}")
-		return value
+	def intern(width = 8, size = 4096):
+		"""Share instances of vectors up to width bits.
+
+		Equal vectors of the same type are then the same object. At
+		most size instances are kept per type, the least recently
+		used ones are evicted first. Passing None as width turns
+		interning off again.
+		"""
+
+		_interning.configure(width, size)
 
 	@staticmethod
-	def _same_types(left, right):
-		"""Ensure left and right are of the same type (excluding length)."""
+	def intern_info():
+		"""Return hits, misses, maxsize and currsize of the interning
+		cache, or None if interning is off.
+		"""
 
-		if not isinstance(left, logvec):
-			left = logvec(left)
-		if not isinstance(right, logvec):
-			right = logvec(right)
+		return _interning.info()
 
-		if type(left).__origin__ == type(right).__origin__:
-			return left, right
-		elif type(left).__origin__ == logvec \
-		and type(right).__origin__ != logvec:
-			return right.__origin__[left.__args__[0]]._new(left), right
-		elif type(left).__origin__ != logvec \
-		and type(right).__origin__ == logvec:
-			return left, left.__origin__[right.__args__[0]]._new(right)
-		else:
-			raise ValueError(f"bad operation for {left!r} and {right!r}")
+	@staticmethod
+	def type_cache(size = 1024):
+		"""Keep at most size recently used vector types alive.
+
+		Types beyond that are only kept while still referenced.
+		"""
+
+		_types.resize(size)
 
 	@staticmethod
-	def _enlarge(obj, new_len):
-		if len(obj) < new_len:
-			obj = obj.__origin__[rspan(
-				start = obj.__args__[0].start + new_len - len(obj),
-				end = obj.__args__[0].end)](obj)
-		return obj
+	def type_cache_info():
+		"""Return hits, misses, maxsize, currsize and the number of
+		live types of the vector type cache.
+		"""
+
+		return _types.info()
+
+	@staticmethod
+	def _unsigned(obj):
+		if obj._unknown:
+			raise ValueError(f"{obj!r}")
+		return obj._value
+
+	@classmethod
+	def _coercion(cls, left, right, same_length):
+		"""Work out how to bring operands of types left and right to
+		the same type, and optionally the same length. Plain vectors of
+		cls, logvec or bitvec, take the view of the other operand.
+
+		Returns True if nothing needs to be done, None if the types
+		cannot be combined and otherwise new types and the bits to
+		extend for both sides.
+		"""
+
+		if left.__origin__ is not right.__origin__:
+			if left.__origin__ is cls:
+				left = right.__origin__[left.__args__[0]]
+			elif right.__origin__ is cls:
+				right = left.__origin__[right.__args__[0]]
+			else:
+				return None
+
+		sides = []
+		for ty, other in ((left, right), (right, left)):
+			ext = 0
+			if same_length and ty._width < other._width:
+				ext = other._mask ^ ty._mask
+				ty = ty.__origin__[rspan(
+					start = ty._start + other._width - ty._width,
+					end = ty._end)]
+			sides += ty, ext
+		return sides[0], sides[1], sides[2], sides[3]
 
 	@staticmethod
-	def _same_length(left, right):
-		left, right = logvec._same_types(left, right)
-		return logvec._enlarge(left, len(right)), logvec._enlarge(right, len(left))
+	def _coerce(obj, ty, ext):
+		if type(obj) is ty:
+			return obj
+		value, unknown, hi_z = obj._value, obj._unknown, obj._hi_z
+		if ext and obj._width:
+			fill = ty._extend_with(_planes_bit(value, unknown, hi_z, obj._width - 1))
+			if fill is not logic.zero:
+				value, unknown, hi_z = _planes_fill(value, unknown, hi_z, fill, ext)
+		return ty._packed(value, unknown, hi_z)
+
+	@classmethod
+	def _same_pair(cls, left, right, same_length):
+		# other operands are converted to the kind of vector they
+		# meet, so a positive int stays positive next to a signed one
+		if not isinstance(left, cls):
+			left = (right.__origin__ if isinstance(right, cls) else cls)(left)
+		if not isinstance(right, cls):
+			right = left.__origin__(right)
+
+		pairs = type(left)._pair_lengths if same_length else type(left)._pair_types
+		try:
+			pair = pairs[type(right)]
+		except KeyError:
+			pair = cls._coercion(type(left), type(right), same_length)
+			if len(pairs) >= _max_slices:
+				pairs.clear()
+			if pair is not None and pair[0] is type(left) and pair[2] is type(right):
+				pair = True
+			pairs[type(right)] = pair
+
+		if pair is True:
+			return left, right
+		elif pair is None:
+			raise ValueError(f"bad operation for {left!r} and {right!r}")
+		return cls._coerce(left, pair[0], pair[1]), cls._coerce(right, pair[2], pair[3])
+
+	@classmethod
+	def _same_types(cls, left, right):
+		"""Ensure left and right are of the same type (excluding length)."""
+
+		if type(left) is type(right) and isinstance(left, cls):
+			return left, right
+		return cls._same_pair(left, right, False)
+
+	@classmethod
+	def _same_length(cls, left, right):
+		"""Ensure left and right are of the same type and length."""
+
+		if type(left) is type(right) and isinstance(left, cls):
+			return left, right
+		# converting a small int and extending it is what
+		# _convert_int does in one go, as long as a signed vector
+		# leaves room for the sign bit
+		if type(right) is int and right >= 0 and isinstance(left, cls) \
+		and (right.bit_length() or 1) <= left._width - left._sign_extend:
+			return left, _types.get(left.__origin__, left._width - 1, 0)(right)
+		if type(left) is int and left >= 0 and isinstance(right, cls) \
+		and (left.bit_length() or 1) <= right._width - right._sign_extend:
+			return _types.get(right.__origin__, right._width - 1, 0)(left), right
+		return cls._same_pair(left, right, True)
 
 	@staticmethod
 	def _apply(oper, left, right):
 		try:
 			left, right = logvec._same_length(left, right)
-			return type(left)._new((oper(l, r) for l, r in zip(left, right)))
+			return type(left)._packed(*oper(left, right))
 		except (TypeError, ValueError):
 			return NotImplemented
 
+	@staticmethod
+	def _and(left, right):
+		ones = left._value & right._value
+		maybe = (left._value | left._unknown) & (right._value | right._unknown)
+		return ones, maybe & ~ones, 0
+
+	@staticmethod
+	def _or(left, right):
+		ones = left._value | right._value
+		return ones, (left._unknown | right._unknown) & ~ones, 0
+
+	@staticmethod
+	def _xor(left, right):
+		unknown = left._unknown | right._unknown
+		return (left._value ^ right._value) & ~unknown, unknown, 0
+
 	@staticmethod
 	def _concat(left, right):
 		try:
 			left, right = logvec._same_types(left, right)
-			ty = left.__origin__[rspan(
-				start = len(left.__args__[0]) + len(right.__args__[0]) - 1,
-				end = 0)]
-			return ty._new((*left, *right))
+			width, shift = left._width + right._width, right._width
+			if width == 0:
+				return left.__origin__.empty
+			return _types.get(left.__origin__, width - 1, 0)._packed(
+				left._value << shift | right._value,
+				left._unknown << shift | right._unknown,
+				left._hi_z << shift | right._hi_z)
 		except (TypeError, ValueError):
 			return NotImplemented
 
+	@staticmethod
+	def concat(*parts):
+		"""Concatenate parts, most significant first, into one vector.
+
+		Parts can be logic values, vectors, literals, ints (as wide as
+		needed, as with +) and (value, width) pairs of ints. Like +,
+		the result is unsigned or signed if any part is, and unsigned
+		and signed parts cannot be mixed.
+		"""
+
+		origin = logvec
+		width = value = unknown = hi_z = 0
+		for part in parts:
+			if not isinstance(part, logvec):
+				if type(part) is tuple and len(part) == 2 \
+				and type(part[0]) is int and type(part[1]) is int:
+					if part[1]:
+						part = _types.get(logvec, part[1] - 1, 0)(part[0])
+					elif part[0]:
+						raise ValueError(f"{part[0]!r}: too long for logvec.empty")
+					else:
+						part = logvec.empty
+				else:
+					part = logvec(part)
+
+			if part.__origin__ is not origin and part.__origin__ is not logvec:
+				if origin is not logvec:
+					raise ValueError(f"{part!r}: cannot concatenate unsigned and signed vectors")
+				origin = part.__origin__
+
+			shift = part._width
+			value = value << shift | part._value
+			unknown = unknown << shift | part._unknown
+			hi_z = hi_z << shift | part._hi_z
+			width += shift
+
+		if width == 0:
+			return origin.empty
+		return _types.get(origin, width - 1, 0)._packed(value, unknown, hi_z)
+
+	@staticmethod
+	def _same_planes(left, right):
+		return left is right \
+		    or left._value == right._value \
+		   and left._unknown == right._unknown \
+		   and left._hi_z == right._hi_z
+
 	@staticmethod
 	def _cmp(left, right):
 		try:
+			if type(right) is int and not left._unknown:
+				return (left._value > right) - (left._value < right)
+
 			left, right = logvec._same_length(left, right)
-			for l, r in zip(left, right):
-				if l != r:
-					return -1 if l < r else 1
-			return 0
+			if not (left._unknown or right._unknown):
+				return (left._value > right._value) - (left._value < right._value)
+			return left._lexcmp(right)
 		except (TypeError, ValueError):
 			return NotImplemented
 
 	@staticmethod
-	def _add(left, right, carry = logic.zero):
+	def _add(left, right, carry = 0):
 		try:
 			left, right = logvec._same_length(left, right)
-			result = []
-			for l, r in zip(reversed(left), reversed(right)):
-				result.append(l ^ r ^ carry)
-				carry = (carry & l) | (carry & r) | (l & r)
-			result.reverse()
-			return type(left)(result)
+			unknown = left._unknown | right._unknown
+			low = left._value + right._value + carry
+			if unknown:
+				# carries are monotonic, so a carry is only known
+				# when it is the same with all unknown bits set to
+				# zero and with all unknown bits set to one
+				high = (left._value | left._unknown) \
+				     + (right._value | right._unknown) + carry
+				unknown = (unknown | low ^ high) & left._mask
+			return type(left)._packed(low & left._mask & ~unknown, unknown, 0)
 		except (TypeError, ValueError):
 			return NotImplemented
 
@@ -238,7 +825,7 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 	def _sub(left, right):
 		try:
 			left, right = logvec._same_length(left, right)
-			return logvec._add(left, ~right, logic.one)
+			return logvec._add(left, ~right, 1)
 		except (TypeError, ValueError):
 			return NotImplemented
 
@@ -249,6 +836,9 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 			ty = left.__origin__[rspan(
 				start = len(left) + len(right) - 1,
 				end = 0)]
+			if not (left._unknown or right._unknown):
+				return ty._packed(left._value * right._value, 0, 0)
+
 			result, right = ty(0), ty(right)
 			for l in reversed(left):
 				if l is logic.one:
@@ -268,16 +858,21 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 			num, denom = logvec._same_length(num, denom)
 			bits = len(num)
 
+			if not (num._unknown or denom._unknown):
+				quot, rem = divmod(num._value, denom._value)
+				return type(num)._packed(quot, 0, 0), \
+				       num.__origin__[rspan(start = bits - 1, end = 0)]._packed(rem, 0, 0)
+
 			quot = type(num)(0)
 			zeroes = logic.zero * bits
 			num = logvec._concat(zeroes, num)
 			denom = logvec._concat(denom, zeroes)
 
-			for i in range(bits, 0, -1):
+			for i in range(bits - 1, -1, -1):
+				denom >>= 1
 				if num >= denom:
 					num -= denom
 					quot |= 2**i
-				denom >>= 1
 
 			return quot, num[-(bits + 1):]
 		except (TypeError, ValueError):
@@ -287,38 +882,45 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 		return f"<{type(self).__name__} '{self!s}'>"
 
 	def __str__(self):
-		return ''.join(str(b) for b in self)
+		return _planes_str(self._width, self._value, self._unknown, self._hi_z)
+
+	def __len__(self):
+		return self._width
+
+	def __iter__(self):
+		return map(_logic_chars.__getitem__, str(self))
+
+	def __reversed__(self):
+		"""reversed(self)"""
+
+		return map(_logic_chars.__getitem__, reversed(str(self)))
+
+	def __hash__(self):
+		if not self._unknown:
+			return hash(self._value)
+		return hash((self._value, self._unknown, self._hi_z))
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def _bit(self, bit):
+		"""Get bit (counting from the least significant bit)."""
+
+		return _planes_bit(self._value, self._unknown, self._hi_z, bit)
 
 	def __format__(self, fmt):
 		if fmt == 'b' or fmt == '':
 			return str(self)
-		elif fmt == 'o':
-			bits = 3
 		elif fmt == 'd' or fmt == 'n':
 			return str(int(self.unsigned))
-		elif fmt == 'x' or fmt == 'X':
-			bits = 4
+		elif fmt == 'o' or fmt == 'x' or fmt == 'X':
+			return _format_digits(self._width, self._value, self._unknown, fmt)
 		else:
 			raise ValueError(fmt)
 
-		if len(self) == 0:
-			return '0'
-		elif len(self) == bits:
-			try:
-				return format(int(self.unsigned), fmt)
-			except ValueError:
-				return 'X' if fmt == 'X' else 'x'
-
-		result = ''
-		buf = [logic.zero] * (bits - len(self) % bits) if len(self) % bits != 0 else []
-		for bit in self:
-			buf.append(bit)
-			if len(buf) == bits:
-				result += format(logvec(buf), fmt)
-				buf.clear()
-
-		return result
-
 	def __getitem__(self, index):
 		"""self[index]
 
@@ -329,21 +931,60 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 		* self[-1:0] returns the entire contents
 		"""
 
-		index = self.__args__[0].map(index)
-		result = super().__getitem__(index)
+		if type(index) is int:
+			if index < 0:
+				index += self._start + 1
+			if index > self._start or index < self._end:
+				raise IndexError(f"{index!r}: out of bounds")
+			return self._bit(index - self._end)
 
-		try:
-			return result._logic_value
-		except:
-			if len(result) == 0:
-				return cls.empty
-			return self.__origin__[self.__args__[0].rmap(index)](result)
+		if type(index) is slice:
+			key = index.start, index.stop
+			try:
+				end, mask, ty = self._slices[key]
+			except KeyError:
+				end, mask, ty = entry = self._slice(index)
+				if len(self._slices) >= _max_slices:
+					self._slices.clear()
+				self._slices[key] = entry
+			except TypeError:
+				end, mask, ty = self._slice(index)
+		else:
+			index = self.__args__[0].map(index)
+			if type(index) is int:
+				return self._bit(self._width - 1 - index)
+			end, mask, ty = self._slice(index, mapped = True)
 
-	def __reversed__(self):
-		"""reversed(self)"""
+		return self._extract(end, mask, ty)
+
+	def _extract(self, end, mask, ty):
+		"""Return the bits found by _slice as a vector of type ty."""
+
+		if not self._unknown:
+			return ty._packed(self._value >> end & mask, 0, 0)
+		return ty._packed(
+			self._value >> end & mask,
+			self._unknown >> end & mask,
+			self._hi_z >> end & mask)
 
-		for i in range(len(self) - 1, -1, -1):
-			yield super().__getitem__(i)
+	@property
+	def view(self):
+		"""View of self that is sliced without copying any bits, see
+		logvec_view.
+		"""
+
+		return logvec_view(self)
+
+	@classmethod
+	def _slice(cls, index, *, mapped = False):
+		"""Return shift, mask and type of the slice at index."""
+
+		if not mapped:
+			index = cls.__args__[0].map(index)
+		width = cls._width
+		end = 0 if index.stop is None else width - index.stop
+		mask = (1 << (width - index.start - end)) - 1
+		return end, mask, cls.__origin__[cls.__args__[0].rmap(index)]
 
 	logvec = type_property()
 	unsigned = type_property()
@@ -374,58 +1015,99 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 		return type(self).signed._new(self)
 
 	def __eq__(self, other):
+		if type(other) is type(self):
+			return logvec._same_planes(self, other)
+		# signed vectors are numbers, which hash like ints, so they
+		# are never equal to plain or unsigned ones
+		if getattr(other, '_sign_extend', self._sign_extend) is not self._sign_extend:
+			return NotImplemented
 		try:
+			if type(other) is int:
+				return not self._unknown \
+				   and self._value == type(self)._convert_int(other)
+			if type(other) is pattern:
+				return len(other) == self._width and other._match(self)
 			if type(other) is str and '-' in other:
+				compiled = pattern(other)
+				if len(compiled) == self._width:
+					return compiled._match(self)
 				other = tuple(
 					logic(b) if b != '-' else a
 					for a, b in zip(self, (b for b in other if b != '_'))
 				)
-			return super().__eq__(type(self)(other))
+			return logvec._same_planes(self, type(self)(other))
 		except (TypeError, ValueError):
 			return NotImplemented
 
 	def __ne__(self, other):
+		if type(other) is type(self):
+			return not logvec._same_planes(self, other)
 		eq = self.__eq__(other)
 		return NotImplemented if eq is NotImplemented else not eq
 
+	def _lexcmp(self, other):
+		if not isinstance(other, logvec):
+			return NotImplemented
+		# '0' < '1' < 'X' < 'Z', just like logic
+		left, right = str(self), str(other)
+		return (left > right) - (left < right)
+
+	def __lt__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp < 0
+
+	def __le__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp <= 0
+
+	def __gt__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp > 0
+
+	def __ge__(self, other):
+		cmp = self._lexcmp(other)
+		return NotImplemented if cmp is NotImplemented else cmp >= 0
+
 	def __invert__(self):
 		"""~self"""
 
-		return type(self)._new((~b for b in self))
+		return type(self)._packed(
+			self._mask ^ (self._value | self._unknown),
+			self._unknown,
+			0)
 
 	def __and__(self, other):
 		"""self & other"""
 
-		return logvec._apply(operator.__and__, self, other)
+		return logvec._apply(logvec._and, self, other)
 
 	def __rand__(self, other):
 		"""other & self"""
 
-		return logvec._apply(operator.__and__, other, self)
+		return logvec._apply(logvec._and, other, self)
 
 	def __or__(self, other):
 		"""self | other"""
 
-		return logvec._apply(operator.__or__, self, other)
+		return logvec._apply(logvec._or, self, other)
 
 	def __ror__(self, other):
 		"""other | self"""
 
-		return logvec._apply(operator.__or__, other, self)
+		return logvec._apply(logvec._or, other, self)
 
 	def __xor__(self, other):
 		"""self ^ other"""
 
-		return logvec._apply(operator.__xor__, self, other)
+		return logvec._apply(logvec._xor, self, other)
 
 	def __rxor__(self, other):
 		"""other ^ self"""
 
-		return logvec._apply(operator.__xor__, other, self)
-
-	def shift_left(self, amount, fill = logic.zero):
-		"""Logically shift left by amount."""
+		return logvec._apply(logvec._xor, other, self)
 
+	@staticmethod
+	def _shift_amount(amount):
 		if type(amount) is not int:
 			try:
 				amount = amount.__index__()
@@ -433,14 +1115,24 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 				raise ValueError(amount)
 		if amount < 0:
 			raise ValueError(f"{amount!r}: negative shift count")
+		return amount
+
+	def shift_left(self, amount, fill = logic.zero):
+		"""Logically shift left by amount."""
+
+		amount = logvec._shift_amount(amount)
 		if amount == 0:
 			return self
-		try:
-			if amount >= len(self):
-				return type(self)(fill._logic_value * len(self))
-			return logvec._concat(self[-(amount + 1):], fill._logic_value * amount)
-		except:
-			return self.shift_left(amount, logic(fill))
+
+		fill = logic(fill)
+		mask = self._mask
+		amount = min(amount, self._width)
+		return type(self)._packed(*_planes_fill(
+			self._value << amount & mask,
+			self._unknown << amount & mask,
+			self._hi_z << amount & mask,
+			fill,
+			(1 << amount) - 1))
 
 	def __lshift__(self, amount):
 		return self.shift_left(amount)
@@ -448,34 +1140,32 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 	def rotate_left(self, amount):
 		"""Rotate left by amount."""
 
-		if type(amount) is not int:
-			try:
-				amount = amount.__index__()
-			except:
-				raise ValueError(amount)
-		if amount < 0:
-			raise ValueError(f"{amount!r}: negative shift count")
-		amount %= len(self)
-		return self if amount == 0 else logvec._concat(self[-(amount + 1):], self[:-amount])
+		amount = logvec._shift_amount(amount) % self._width
+		if amount == 0:
+			return self
+
+		mask, back = self._mask, self._width - amount
+		return type(self)._packed(
+			(self._value << amount | self._value >> back) & mask,
+			(self._unknown << amount | self._unknown >> back) & mask,
+			(self._hi_z << amount | self._hi_z >> back) & mask)
 
 	def shift_right(self, amount, fill = logic.zero):
 		"""Logically shift right by amount."""
 
-		if type(amount) is not int:
-			try:
-				amount = amount.__index__()
-			except:
-				raise ValueError(amount)
-		if amount < 0:
-			raise ValueError(f"{amount!r}: negative shift count")
+		amount = logvec._shift_amount(amount)
 		if amount == 0:
 			return self
-		try:
-			if amount >= len(self):
-				return type(self)(fill._logic_value * len(self))
-			return logvec._concat(fill._logic_value * amount, self[:amount])
-		except:
-			return self.shift_right(amount, logic(fill))
+
+		fill = logic(fill)
+		mask = self._mask
+		amount = min(amount, self._width)
+		return type(self)._packed(*_planes_fill(
+			self._value >> amount,
+			self._unknown >> amount,
+			self._hi_z >> amount,
+			fill,
+			mask ^ mask >> amount))
 
 	def __rshift__(self, amount):
 		return self.shift_right(amount)
@@ -483,15 +1173,122 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 	def rotate_right(self, amount):
 		"""Rotate right by amount."""
 
-		if type(amount) is not int:
-			try:
-				amount = amount.__index__()
-			except:
-				raise ValueError(amount)
-		if amount < 0:
-			raise ValueError(f"{amount!r}: negative shift count")
-		amount %= len(self)
-		return self if amount == 0 else logvec._concat(self[amount - 1:], self[:amount])
+		amount = logvec._shift_amount(amount) % self._width
+		if amount == 0:
+			return self
+
+		mask, back = self._mask, self._width - amount
+		return type(self)._packed(
+			(self._value >> amount | self._value << back) & mask,
+			(self._unknown >> amount | self._unknown << back) & mask,
+			(self._hi_z >> amount | self._hi_z << back) & mask)
+
+	def and_reduce(self):
+		"""AND of all bits: 0 if any bit is 0, else X if any bit is X
+		or Z.
+		"""
+
+		if self._mask & ~(self._value | self._unknown):
+			return logic.zero
+		return logic.unknown if self._unknown else logic.one
+
+	def or_reduce(self):
+		"""OR of all bits: 1 if any bit is 1, else X if any bit is X
+		or Z.
+		"""
+
+		if self._value:
+			return logic.one
+		return logic.unknown if self._unknown else logic.zero
+
+	def xor_reduce(self):
+		"""XOR of all bits, which is the parity, or X if any bit is X
+		or Z.
+		"""
+
+		if self._unknown:
+			return logic.unknown
+		return logic.one if self._value.bit_count() & 1 else logic.zero
+
+	@staticmethod
+	def _count(width, low, high):
+		"""Unsigned count of up to width that is between low and high:
+		the bits that differ between them, and everything below, are
+		X.
+		"""
+
+		ty = _count_type(max(width.bit_length(), 1))
+		unknown = (1 << (low ^ high).bit_length()) - 1
+		return ty._packed(low & ~unknown, unknown, 0)
+
+	def popcount(self):
+		"""Number of 1 bits, as an unsigned vector. Bits of the count
+		that depend on X or Z bits are X.
+		"""
+
+		return logvec._count(self._width,
+			self._value.bit_count(),
+			(self._value | self._unknown).bit_count())
+
+	def count_leading_zeros(self):
+		"""Number of 0 bits above the most significant 1, as an
+		unsigned vector. With X or Z bits, only the bits shared by the
+		smallest and the largest possible count are known.
+		"""
+
+		return logvec._count(self._width,
+			self._width - (self._value | self._unknown).bit_length(),
+			self._width - self._value.bit_length())
+
+	def count_trailing_zeros(self):
+		"""Number of 0 bits below the least significant 1, as an
+		unsigned vector. With X or Z bits, only the bits shared by the
+		smallest and the largest possible count are known.
+		"""
+
+		def ctz(value):
+			return (value & -value).bit_length() - 1 if value else self._width
+
+		return logvec._count(self._width, ctz(self._value | self._unknown), ctz(self._value))
+
+	def onehot_index(self):
+		"""Position of the only 1 bit, counting from the least
+		significant bit, as an unsigned vector. All bits are X if
+		self has X or Z bits or is not one-hot.
+		"""
+
+		ty = _count_type(max((self._width - 1).bit_length(), 1))
+		if self._unknown or self._value.bit_count() != 1:
+			return ty._packed(0, ty._mask, 0)
+		return ty._packed(self._value.bit_length() - 1, 0, 0)
+
+	def reverse_bits(self):
+		"""Reverse the order of the bits."""
+
+		width = self._width
+		if width <= 1:
+			return self
+
+		def reverse(plane):
+			return int(format(plane, f"0{width}b")[::-1], 2)
+
+		if not self._unknown:
+			return type(self)._packed(reverse(self._value), 0, 0)
+		return type(self)._packed(reverse(self._value), reverse(self._unknown), reverse(self._hi_z))
+
+	def swap_bytes(self):
+		"""Reverse the order of the bytes, for vectors of whole bytes."""
+
+		if self._width % 8:
+			raise ValueError(f"{self!r}: not a whole number of bytes")
+		size = self._width // 8
+
+		def swap(plane):
+			return int.from_bytes(plane.to_bytes(size, 'big'), 'little')
+
+		if not self._unknown:
+			return type(self)._packed(swap(self._value), 0, 0)
+		return type(self)._packed(swap(self._value), swap(self._unknown), swap(self._hi_z))
 
 	def __add__(self, other):
 		"""Concatenate self and other."""
@@ -507,10 +1304,13 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 		"""Repeat self times other."""
 
 		try:
-			if other <= 0:
+			if other <= 0 or not self._width:
 				return NotImplemented if other < 0 else self.empty
-			else:
-				return logvec[len(self) * other - 1:0]._new(tuple(self) * other)
+			ty = _types.get(logvec, self._width * other - 1, 0)
+			# multiplying by 0b...0001_0001 puts a copy at every
+			# multiple of the width
+			copies = ty._mask // self._mask
+			return ty._packed(self._value * copies, self._unknown * copies, self._hi_z * copies)
 		except (TypeError, ValueError):
 			return NotImplemented
 
@@ -521,16 +1321,24 @@ class logvec(tuple, metaclass = _GenericLogvecType):
 
 
 class unsigned_logvec(logvec):
+	__slots__ = ()
 	_name_fmt = 'logvec[{0}].unsigned'
+	_literals = {}
 
 	def __eq__(self, other):
+		if type(other) is type(self):
+			return logvec._same_planes(self, other)
 		try:
+			if type(other) is int:
+				return not self._unknown and self._value == other
 			if type(other) is not str:
 				self, other = logvec._same_types(self, other)
 			return super().__eq__(other)
 		except (TypeError, ValueError):
 			return NotImplemented
 
+	__hash__ = logvec.__hash__
+
 	def __int__(self):
 		"""Unsigned integer value of self."""
 
@@ -616,25 +1424,42 @@ class unsigned_logvec(logvec):
 
 
 class signed_logvec(logvec):
+	__slots__ = ()
 	_name_fmt = 'logvec[{0}].signed'
+	_literals = {}
+	_sign_extend = True
 
 	@staticmethod
 	def _extend_with(val):
 		return val
 
 	def __eq__(self, other):
+		if type(other) is type(self):
+			return logvec._same_planes(self, other)
 		try:
+			if type(other) is int:
+				return not self._unknown \
+				   and _signed(self._value, self._width) == other
+			if type(other) is logvec_view:
+				other = other.copy()
+			if getattr(other, '_sign_extend', True) is not True:
+				return NotImplemented
 			if type(other) is not str:
 				self, other = logvec._same_types(self, other)
 			return super().__eq__(other)
 		except (TypeError, ValueError):
 			return NotImplemented
 
+	def __hash__(self):
+		# equal to its int value, so it hashes like it
+		if not self._unknown:
+			return hash(_signed(self._value, self._width))
+		return logvec.__hash__(self)
+
 	def __int__(self):
 		"""Signed integer value of self."""
 
-		value = logvec._unsigned(self)
-		return value - 2 ** len(self) if self[-1] else value
+		return _signed(logvec._unsigned(self), self._width)
 
 	def __index__(self):
 		return self.__int__()
@@ -651,15 +1476,22 @@ class signed_logvec(logvec):
 	@staticmethod
 	def _cmp(left, right):
 		try:
+			if type(right) is int and not left._unknown:
+				l = _signed(left._value, left._width)
+				return (l > right) - (l < right)
+
 			left, right = logvec._same_types(left, right)
+			if not (left._unknown or right._unknown):
+				l = _signed(left._value, len(left))
+				r = _signed(right._value, len(right))
+				return (l > r) - (l < r)
+
 			if left[-1] and not right[-1]:
 				return -1
 			elif not left[-1] and right[-1]:
 				return 1
-			cmp = logvec._cmp(left, right)
-			if cmp is NotImplemented:
-				return NotImplemented
-			return -cmp if left[-1] and right[-1] else cmp
+			# two's complement orders like unsigned within either sign
+			return logvec._cmp(left, right)
 		except (TypeError, ValueError):
 			return NotImplemented
 
@@ -682,15 +1514,14 @@ class signed_logvec(logvec):
 	def shift_right(self, amount, fill = None):
 		"""Arithmetically shift right by amount."""
 
-		try:
-			return super().shift_right(amount, fill._logic_value)
-		except:
-			return super().shift_right(amount, self[-1] if fill is None else logic(fill))
+		return super().shift_right(amount, self._bit(self._width - 1) if fill is None else fill)
 
 	def __neg__(self):
 		"""-self"""
 
-		return ~self - 1
+		# a plain 1 gets a sign bit of its own and would widen
+		# the result
+		return ~self + type(self)._packed(self._mask & 1, 0, 0)
 
 	def __abs__(self):
 		"""abs(self)"""
@@ -721,6 +1552,13 @@ class signed_logvec(logvec):
 	def _mul(left, right):
 		try:
 			left, right = logvec._same_types(left, right)
+			if not (left._unknown or right._unknown):
+				ty = left.__origin__[rspan(
+					start = len(left) + len(right) - 1,
+					end = 0)]
+				result = _signed(left._value, len(left)) * _signed(right._value, len(right))
+				return ty._packed(result & ty._mask, 0, 0)
+
 			neg = left[-1] ^ right[-1]
 			result = logvec._mul(abs(left).unsigned, abs(right).unsigned).signed
 			return -result if neg else result
@@ -741,6 +1579,22 @@ class signed_logvec(logvec):
 	def _divmod(left, right):
 		try:
 			left, right = logvec._same_types(left, right)
+			if not (left._unknown or right._unknown):
+				bits = max(len(left), len(right))
+				ty = left.__origin__[rspan(start = bits - 1, end = 0)]
+				num = _signed(left._value, len(left))
+				denom = _signed(right._value, len(right))
+				if denom == 0:
+					raise ValueError(right)
+
+				# truncate towards zero, like the bitwise fallback
+				quot, rem = divmod(abs(num), abs(denom))
+				if (num < 0) != (denom < 0):
+					quot = -quot
+				if num < 0:
+					rem = -rem
+				return ty._packed(quot & ty._mask, 0, 0), ty._packed(rem & ty._mask, 0, 0)
+
 			neg = left[-1] ^ right[-1]
 			quot, rem = logvec._divmod(abs(left).unsigned, abs(right).unsigned)
 			quot, rem = quot.signed, rem.signed
@@ -769,6 +1623,143 @@ class signed_logvec(logvec):
 		return signed_logvec._divmod(other, self)[1]
 
 
+@export
+class logvec_view:
+	"""Read-only view of the bits of a vector.
+
+	Slicing a view gives another view of the same vector instead of
+	shifting out the bits, so taking many slices of a wide vector
+	only touches the bits that are actually read. Views can be
+	compared, formatted and converted to int like the slice they
+	stand for, and copy() turns them into that slice. Assigning a
+	view to a signal stores the copy.
+	"""
+
+	__slots__ = '_parent', '_end', '_mask', '_type'
+
+	def __init__(self, vec):
+		if not isinstance(vec, logvec):
+			raise ValueError(f"{vec!r}: not a vector")
+		self._parent = vec
+		self._end = 0
+		self._mask = vec._mask
+		self._type = type(vec)
+
+	@property
+	def type(self):
+		"""Type of the slice this is a view of."""
+
+		return self._type
+
+	def copy(self):
+		"""Return the bits in view as a vector."""
+
+		parent, end, mask = self._parent, self._end, self._mask
+		if not parent._unknown:
+			return self._type._packed(parent._value >> end & mask, 0, 0)
+		return self._type._packed(
+			parent._value >> end & mask,
+			parent._unknown >> end & mask,
+			parent._hi_z >> end & mask)
+
+	def __len__(self):
+		return self._type._width
+
+	def __getitem__(self, index):
+		"""self[index], a view for slices and a logic value for bits."""
+
+		ty = self._type
+		if type(index) is int:
+			if index < 0:
+				index += ty._start + 1
+			if index > ty._start or index < ty._end:
+				raise IndexError(f"{index!r}: out of bounds")
+			return self._parent._bit(self._end + index - ty._end)
+
+		if type(index) is slice:
+			key = index.start, index.stop
+			try:
+				end, mask, ty = ty._slices[key]
+			except KeyError:
+				end, mask, ty = entry = ty._slice(index)
+				if len(self._type._slices) >= _max_slices:
+					self._type._slices.clear()
+				self._type._slices[key] = entry
+			except TypeError:
+				end, mask, ty = ty._slice(index)
+		else:
+			index = ty.__args__[0].map(index)
+			if type(index) is int:
+				return self._parent._bit(self._end + ty._width - 1 - index)
+			end, mask, ty = ty._slice(index, mapped = True)
+
+		view = object.__new__(logvec_view)
+		view._parent = self._parent
+		view._end = self._end + end
+		view._mask = mask
+		view._type = ty
+		return view
+
+	def __int__(self):
+		parent, origin = self._parent, self._type.__origin__
+		value = parent._value >> self._end & self._mask
+		if origin is logvec or parent._unknown >> self._end & self._mask:
+			# raises just like the slice does
+			return int(self.copy())
+		return _signed(value, self._type._width) if origin is signed_logvec else value
+
+	def __index__(self):
+		return self.__int__()
+
+	def __str__(self):
+		return str(self.copy())
+
+	def __repr__(self):
+		return f"<{self._type.__name__} view '{self!s}'>"
+
+	def __format__(self, fmt):
+		return format(self.copy(), fmt)
+
+	def __iter__(self):
+		return iter(self.copy())
+
+	def __reversed__(self):
+		return reversed(self.copy())
+
+	def __hash__(self):
+		return hash(self.copy())
+
+	def __eq__(self, other):
+		if type(other) is int and other >= 0 and self._type.__origin__ is unsigned_logvec:
+			parent, end, mask = self._parent, self._end, self._mask
+			return not parent._unknown >> end & mask and parent._value >> end & mask == other
+		if type(other) is logvec_view:
+			other = other.copy()
+		return self.copy() == other
+
+	def __ne__(self, other):
+		eq = self.__eq__(other)
+		return NotImplemented if eq is NotImplemented else not eq
+
+	def __lt__(self, other):
+		return self.copy() < other
+
+	def __le__(self, other):
+		return self.copy() <= other
+
+	def __gt__(self, other):
+		return self.copy() > other
+
+	def __ge__(self, other):
+		return self.copy() >= other
+
+
+@export
+def cat(*parts):
+	"""Concatenate parts into one vector, see logvec.concat."""
+
+	return logvec.concat(*parts)
+
 logvec.empty = logvec[rspan.empty]._new(())
 unsigned_logvec.empty = unsigned_logvec[rspan.empty]._new(())
 signed_logvec.empty = signed_logvec[rspan.empty]._new(())
@@ -17,12 +17,39 @@
 
 import sys, copy, threading, contextlib, types, typing, inspect
 from ._lib import export, makefun, ReadOnlyDict, timestamp, join
+from ._resolved import resolved
+from ._bitvec import bit, bitvec
+
+@export
+class four_state:
+	"""Annotation for a signal that keeps four-valued storage in a
+	two-state simulation, such as four_state[logvec[7:0]] for a bus
+	that needs Z. Resolved signals always keep it.
+	"""
+
+	__slots__ = 'type',
+
+	def __init__(self, ty):
+		self.type = ty
+
+	def __class_getitem__(cls, ty):
+		return cls(ty)
+
+	def __repr__(self):
+		return f"four_state[{self.type!r}]"
+
 
 class Signal:
-	__slots__ = '_name', '_type', '_default'
+	__slots__ = '_name', '_type', '_default', '_resolved', '_four_state'
 
 	def __init__(self, name, ty, default):
 		self._name = name
+		self._four_state = type(ty) is four_state
+		if self._four_state:
+			ty = ty.type
+		self._resolved = ty if type(ty) is resolved else None
+		if self._resolved is not None:
+			ty = ty.type
 		self._type = ty
 		self._default = ty(default) \
 			if isinstance(ty, type) \
@@ -44,8 +71,30 @@ class Signal:
 	def default(self):
 		if self._default is not None:
 			return copy.deepcopy(self._default)
+		elif self._resolved is not None:
+			return self._resolved.drivers().value
 		return self._type()
 
+	@property
+	def resolved(self):
+		return self._resolved is not None
+
+	@property
+	def four_state(self):
+		"""Whether the signal stays four-valued in a two-state simulation."""
+
+		return self._four_state or self._resolved is not None
+
+	def drivers(self):
+		"""Create the driver state of a resolved signal, with the
+		default as the value of the driver outside of any block.
+		"""
+
+		drivers = self._resolved.drivers()
+		if self._default is not None:
+			drivers.drive(None, self._default)
+		return drivers
+
 
 class Block:
 	__slots__ = '__name__', '__qualname__', '_fun',
@@ -127,6 +176,13 @@ class PartMeta(type):
 		yield
 		self._observer.current = old
 
+	@property
+	def current_driver(self):
+		"""The block driving resolved signals, or None outside of any block."""
+
+		observer = getattr(self._observer, 'current', None)
+		return observer.__part_driver__() if observer is not None else None
+
 
 class Part(metaclass = PartMeta):
 	__slots__ = '_type', '_signals', '_blocks'
@@ -199,6 +255,15 @@ class FunctionPart:
 		self.__qualname__ = f"{obj.__name__}.{name}"
 
 
+def _deepcopy_part(self, memo):
+	"""Copy a part slot by slot, bypassing the resolution of its signals."""
+
+	result = object.__new__(type(self))
+	memo[id(self)] = result
+	for name in type(self).__slots__:
+		object.__setattr__(result, name, copy.deepcopy(object.__getattribute__(self, name), memo))
+	return result
+
 @export
 def part(obj = None):
 	"""Make obj a part."""
@@ -244,8 +309,11 @@ def part(obj = None):
 			if hasattr(cls, attr):
 				delattr(cls, attr)
 
+		# resolved signals keep their drivers in a hidden slot
+		resolved_signals = frozenset(k for k, v in signals.items() if v.resolved)
+
 		# set slots
-		setattr(cls, '__slots__', tuple(signals.keys()))
+		setattr(cls, '__slots__', tuple(signals.keys()) + (('__drivers__',) if resolved_signals else ()))
 
 		# gather all blocks
 		blocks = tuple(
@@ -265,10 +333,15 @@ def part(obj = None):
 			'\n'.join((
 			'for signal in Part(type(self)).signals.values():',
 			'\tsuper().__setattr__(signal.name, signal.default)',
+			*((
+			'super().__setattr__("__drivers__", {',
+			'\tname: Part(type(self)).signals[name].drivers()',
+			'\tfor name in resolved_signals})',
+			) if resolved_signals else ()),
 			'return orig_init(self, *args, **kwargs)'
 			)),
 			globals = sys.modules[cls.__module__].__dict__,
-			locals = {'__class__': cls, 'Part': Part, 'orig_init': cls.__init__}
+			locals = {'__class__': cls, 'Part': Part, 'orig_init': cls.__init__, 'resolved_signals': resolved_signals}
 		)
 		setattr(cls, fun.__name__, fun)
 
@@ -286,26 +359,55 @@ def part(obj = None):
 			locals = {'__class__': cls, 'Part': Part})
 		setattr(cls, fun.__name__, fun)
 
-		# hook __setattr__ to perform type conversion and wire in our observer
+		# hook __setattr__ to perform type conversion and wire in our
+		# observer; in a two-state simulation signals are converted to
+		# the two-state type they are stored as, and the observer
+		# handles values with X or Z
 		fun = makefun(
 			'__setattr__',
 			('self', 'name', 'value'),
 			'\n'.join((
 			'try:',
-			'\tattr_type = Part(type(self)).signals[name].type',
-			'\tif type(value) is not attr_type:',
-			'\t\tvalue = attr_type(value)',
+			'\tsignal = Part(type(self)).signals[name]',
 			'except KeyError:',
 			'\traise AttributeError(name)',
-			'if super().__getattribute__(name) != value:',
+			'current = super().__getattribute__(name)',
+			'if type(value) is not type(current):',
+			'\tattr_type = signal.type',
+			'\tif type(current) is not attr_type and isinstance(current, two_state_types):',
+			'\t\tattr_type = type(current)',
+			'\ttry:',
+			'\t\tvalue = attr_type(value)',
+			'\texcept ValueError:',
+			'\t\tobserver = Part.current_observer',
+			'\t\tif observer is None:',
+			'\t\t\traise',
+			'\t\tconverted = observer.__part_convert__(self, name, current, value)',
+			'\t\tif converted is NotImplemented:',
+			'\t\t\traise',
+			'\t\tvalue = converted',
+			*((
+			'if name in resolved_signals:',
+			'\tvalue = super().__getattribute__("__drivers__")[name].drive(Part.current_driver, value)',
+			) if resolved_signals else ()),
+			'if current != value:',
 			'\tif (observer := Part.current_observer) is not None:',
 			'\t\tobserver.__part_setattr__(self, name, value)',
 			'\tsuper().__setattr__(name, value)',
 			)),
 			globals = sys.modules[cls.__module__].__dict__,
-			locals = {'__class__': cls, 'Part': Part})
+			locals = {
+				'__class__': cls,
+				'Part': Part,
+				'resolved_signals': resolved_signals,
+				'two_state_types': (bit, bitvec),
+			})
 		setattr(cls, fun.__name__, fun)
 
+		# copy the drivers of resolved signals along with their values
+		if resolved_signals:
+			setattr(cls, '__deepcopy__', _deepcopy_part)
+
 		return cls
 
 	def make_fun_part(fun):
@@ -0,0 +1,197 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from functools import lru_cache
+
+from ._lib import export
+
+@export
+class pattern:
+	"""Casez-style pattern for matching vectors.
+
+	Each character of the pattern is matched against one bit, most
+	significant first: '0', '1', 'X' and 'Z' must match exactly and
+	'-' matches anything. Underscores are ignored. Patterns are
+	compiled into a care mask and the expected bit planes once and
+	cached, so matching is a mask and compare.
+	"""
+
+	__slots__ = 'text', 'width', 'care', 'value', 'unknown', 'hi_z'
+
+	def __new__(cls, text):
+		if type(text) is pattern:
+			return text
+		return _compile(text)
+
+	def __repr__(self):
+		return f"<pattern '{self.text}'>"
+
+	def __str__(self):
+		return self.text
+
+	def __len__(self):
+		return self.width
+
+	def __hash__(self):
+		return hash(self.text)
+
+	def _match(self, vec):
+		care = self.care
+		return vec._value & care == self.value \
+		   and vec._unknown & care == self.unknown \
+		   and vec._hi_z & care == self.hi_z
+
+	def match(self, vec):
+		"""Return if vec, which must be as wide as self, matches."""
+
+		if len(vec) != self.width:
+			raise ValueError(f"{vec!r}: does not have {self.width} bits")
+		return self._match(vec)
+
+	def __eq__(self, other):
+		if type(other) is pattern:
+			return self is other or self.text == other.text
+		return NotImplemented
+
+@lru_cache(maxsize = 1024)
+def _compile(text):
+	if type(text) is not str:
+		raise ValueError(f"{text!r}: not a pattern")
+
+	width = care = value = unknown = hi_z = 0
+	for c in text:
+		if c == '_':
+			continue
+		width += 1
+		care <<= 1
+		value <<= 1
+		unknown <<= 1
+		hi_z <<= 1
+		if c == '-':
+			continue
+		care |= 1
+		if c == '1':
+			value |= 1
+		elif c == 'X':
+			unknown |= 1
+		elif c == 'Z':
+			unknown |= 1
+			hi_z |= 1
+		elif c != '0':
+			raise ValueError(f"{text!r}: not a valid pattern")
+
+	obj = object.__new__(pattern)
+	obj.text = text
+	obj.width = width
+	obj.care = care
+	obj.value = value
+	obj.unknown = unknown
+	obj.hi_z = hi_z
+	return obj
+
+
+# Largest number of care bits decoded with a full lookup table
+_max_table_bits = 10
+
+@export
+class decoder:
+	"""Priority decoder over an ordered list of patterns.
+
+	decode() returns the index of the first matching pattern, or
+	None. Vectors without X or Z on any care bit are decoded
+	through a lookup table when the patterns care about few bits,
+	and through a decision tree on shared care bits otherwise.
+	"""
+
+	__slots__ = 'patterns', 'width', '_care', '_tree'
+
+	def __init__(self, patterns):
+		self.patterns = tuple(map(pattern, patterns))
+		widths = {p.width for p in self.patterns}
+		if len(widths) > 1:
+			raise ValueError(f"{patterns!r}: patterns of different widths")
+		self.width = widths.pop() if widths else 0
+
+		care = 0
+		for p in self.patterns:
+			care |= p.care
+		self._care = care
+
+		# patterns with X or Z never match a vector that is known on
+		# all care bits
+		entries = [(i, p.care, p.value) for i, p in enumerate(self.patterns) if not p.unknown]
+		if care.bit_count() <= _max_table_bits:
+			self._tree = care, decoder._table(entries, care)
+		else:
+			self._tree = decoder._build(entries, 0)
+
+	def __len__(self):
+		return len(self.patterns)
+
+	def __repr__(self):
+		return f"<decoder of {len(self)} patterns>"
+
+	@staticmethod
+	def _table(entries, care):
+		table = {}
+		key = 0
+		while True:
+			for i, c, v in entries:
+				if key & c == v:
+					table[key] = [(i, 0, 0)]
+					break
+			# next subset of the care bits
+			key = (key - care) & care
+			if key == 0:
+				return table
+
+	@staticmethod
+	def _build(entries, used):
+		common = ~used
+		for i, c, v in entries:
+			common &= c
+		if len(entries) <= 2 or common == 0:
+			return entries
+
+		buckets = {}
+		for entry in entries:
+			buckets.setdefault(entry[2] & common, []).append(entry)
+		used |= common
+		return common, {k: decoder._build(b, used) for k, b in buckets.items()}
+
+	def decode(self, vec):
+		"""Return the index of the first pattern matching vec."""
+
+		if len(vec) != self.width:
+			raise ValueError(f"{vec!r}: does not have {self.width} bits")
+
+		if vec._unknown & self._care:
+			for i, p in enumerate(self.patterns):
+				if p._match(vec):
+					return i
+			return None
+
+		value = vec._value
+		node = self._tree
+		while type(node) is tuple:
+			node = node[1].get(value & node[0])
+			if node is None:
+				return None
+		for i, c, v in node:
+			if value & c == v:
+				return i
+		return None
@@ -0,0 +1,210 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from ._lib import export
+from ._logic import logic
+from ._logvec import logvec
+
+def _resolve(left, right):
+	"""Resolve two drivers of the same wire."""
+
+	if left is logic.hi_z:
+		return right
+	elif right is logic.hi_z or left is right:
+		return left
+	return logic.unknown
+
+# logic values in logic order, which is how the tables are indexed
+_logic_values = tuple(sorted(
+	(logic.zero, logic.one, logic.unknown, logic.hi_z),
+	key = lambda v: v._logic_order))
+
+@export
+class resolved:
+	"""Type of a signal that is driven by several blocks.
+
+	Use as resolved[logic] or resolved[logvec[...]] in a part. Each
+	block assigning the signal drives it with its own value and the
+	signal takes the resolution of all drivers: Z gives way to any
+	other value, and drivers that disagree give X. Assignments from
+	outside the simulation (or a default) act as one more driver.
+	"""
+
+	__slots__ = 'type',
+
+	# resolution of two drivers, indexed by logic order
+	table = tuple(
+		tuple(_resolve(l, r) for r in _logic_values)
+		for l in _logic_values)
+
+	def __init__(self, ty):
+		if ty is not logic \
+		and not (isinstance(ty, type) and issubclass(ty, logvec) and hasattr(ty, '_width')):
+			raise ValueError(f"{ty!r}: cannot be resolved")
+		self.type = ty
+
+	def __class_getitem__(cls, ty):
+		return cls(ty)
+
+	def __repr__(self):
+		return f"resolved[{self.type.__name__}]"
+
+	def __eq__(self, other):
+		if type(other) is resolved:
+			return self.type is other.type
+		return NotImplemented
+
+	def __hash__(self):
+		return hash((resolved, self.type))
+
+	def drivers(self):
+		"""Create the driver state of one signal."""
+
+		return _LogicDrivers() if self.type is logic else _VectorDrivers(self.type)
+
+
+def _presence_table():
+	"""Resolve every combination of driven 0, 1 and X values by
+	folding the resolution table.
+	"""
+
+	table = []
+	for present in range(8):
+		value = logic.hi_z
+		for code in range(3):
+			if present >> code & 1:
+				value = resolved.table[value._logic_order][code]
+		table.append(value)
+	return tuple(table)
+
+_presence = _presence_table()
+
+class _LogicDrivers:
+	"""Drivers of a logic signal, counted by the value they drive."""
+
+	__slots__ = '_drivers', '_counts', 'value'
+
+	def __init__(self):
+		self._drivers = {}
+		self._counts = [0, 0, 0, 0]
+		self.value = logic.hi_z
+
+	def __len__(self):
+		return len(self._drivers)
+
+	def drive(self, driver, value):
+		"""Set the value of driver and return the resolved value."""
+
+		drivers, counts = self._drivers, self._counts
+		old = drivers.get(driver, logic.hi_z)
+		if old is value:
+			return self.value
+
+		if old is not logic.hi_z:
+			counts[old._logic_order] -= 1
+		if value is logic.hi_z:
+			del drivers[driver]
+		else:
+			counts[value._logic_order] += 1
+			drivers[driver] = value
+
+		self.value = _presence[
+			(counts[0] > 0) | (counts[1] > 0) << 1 | (counts[2] > 0) << 2]
+		return self.value
+
+
+def _count(counter, mask, step):
+	"""Add step (1 or -1) to the bit-sliced counter at the bits in mask
+	and return the bits where the counter is not zero.
+
+	Plane i of counter holds bit i of the count of every vector bit.
+	"""
+
+	carry = mask
+	for i, plane in enumerate(counter):
+		if not carry:
+			break
+		counter[i] = plane ^ carry
+		carry = plane & carry if step > 0 else ~plane & carry
+	if carry:
+		counter.append(carry)
+	while counter and not counter[-1]:
+		counter.pop()
+
+	present = 0
+	for plane in counter:
+		present |= plane
+	return present
+
+class _VectorDrivers:
+	"""Drivers of a vector signal, with per bit counts of the drivers
+	driving 0, 1 and X kept as bit-sliced counters, so a driver
+	change costs a few operations per bit of the number of drivers.
+	"""
+
+	__slots__ = '_type', '_drivers', '_counters', '_present', 'value'
+
+	def __init__(self, ty):
+		self._type = ty
+		self._drivers = {}
+		# counters and the bits they count for 0, 1 and X
+		self._counters = [], [], []
+		self._present = [0, 0, 0]
+		self.value = ty._packed(0, ty._mask, ty._mask)
+
+	def __len__(self):
+		return len(self._drivers)
+
+	def drive(self, driver, value):
+		"""Set the value of driver and return the resolved value."""
+
+		drivers, mask = self._drivers, self._type._mask
+		old = drivers.get(driver)
+		if old is None:
+			before = 0, 0, 0
+		elif logvec._same_planes(old, value):
+			return self.value
+		else:
+			before = (
+				mask & ~(old._value | old._unknown),
+				old._value,
+				old._unknown & ~old._hi_z)
+
+		if value._hi_z == mask:
+			drivers.pop(driver, None)
+		else:
+			drivers[driver] = value
+		after = (
+			mask & ~(value._value | value._unknown),
+			value._value,
+			value._unknown & ~value._hi_z)
+
+		# only count the bits that change category
+		present = self._present
+		for i in range(3):
+			if removed := before[i] & ~after[i]:
+				present[i] = _count(self._counters[i], removed, -1)
+			if added := after[i] & ~before[i]:
+				present[i] = _count(self._counters[i], added, 1)
+
+		zeros, ones, unknowns = present
+		hi_z = mask & ~(zeros | ones | unknowns)
+		unknown = unknowns | zeros & ones | hi_z
+		result = self.value
+		if result._unknown != unknown or result._value != ones & ~unknown or result._hi_z != hi_z:
+			self.value = result = self._type._packed(ones & ~unknown, unknown, hi_z)
+		return result
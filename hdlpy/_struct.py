@@ -0,0 +1,156 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+from ._lib import export, ReadOnlyDict
+from ._logic import logic
+from ._logvec import logvec, _LogvecType, _planes_bit
+
+class _Field:
+	"""Field of a packed struct, with its offset and mask worked out
+	when the struct is defined.
+
+	Reading the field from a struct returns its value and reading it
+	from the struct type returns the field itself.
+	"""
+
+	__slots__ = 'name', 'type', 'offset', 'width', '_mask', '_clear', '_vector'
+
+	def __init__(self, name, ty, offset):
+		self.name = name
+		self.type = ty
+		self.offset = offset
+		# logic fields are stored like a one-bit vector
+		self._vector = logvec[0:0] if ty is logic else ty
+		self.width = self._vector._width
+		self._mask = self._vector._mask
+		self._clear = ~(self._mask << offset)
+
+	def __get__(self, obj, owner):
+		if obj is None:
+			return self
+		offset = self.offset
+		if self.type is logic:
+			return _planes_bit(obj._value, obj._unknown, obj._hi_z, offset)
+		mask = self._mask
+		return self._vector._packed(
+			obj._value >> offset & mask,
+			obj._unknown >> offset & mask,
+			obj._hi_z >> offset & mask)
+
+	def __set__(self, obj, value):
+		raise AttributeError(f"{self.name}: structs are immutable, use replace()")
+
+	def __repr__(self):
+		return f"<field {self.name}: {self.type.__name__} at {self.offset}>"
+
+
+class _StructType(_LogvecType):
+	def __call__(cls, value = None, **fields):
+		if value is None:
+			obj = cls._packed(*cls._default)
+		else:
+			obj = super().__call__(value)
+		return obj.replace(**fields) if fields else obj
+
+	def _replace(cls, planes, values):
+		"""Return planes with the fields in values replaced."""
+
+		value, unknown, hi_z = planes
+		fields = cls.__fields__
+		for name, field in values.items():
+			try:
+				f = fields[name]
+			except KeyError:
+				raise ValueError(f"{name}: not a field of {cls.__name__}") from None
+			ty = f._vector
+			if type(field) is not ty:
+				field = ty(field)
+			offset, clear = f.offset, f._clear
+			value = value & clear | field._value << offset
+			unknown = unknown & clear | field._unknown << offset
+			hi_z = hi_z & clear | field._hi_z << offset
+		return value, unknown, hi_z
+
+
+class _Struct:
+	__slots__ = ()
+
+	def replace(self, **fields):
+		"""Return a copy of self with the given fields changed."""
+
+		cls = type(self)
+		return cls._packed(*cls._replace((self._value, self._unknown, self._hi_z), fields))
+
+
+def _isfieldtype(ty):
+	return ty is logic or (isinstance(ty, _LogvecType) and ty._width > 0)
+
+@export
+def packed(cls):
+	"""Make cls a packed struct.
+
+	The annotations of cls are its fields, the first one being the
+	most significant. The struct is a vector of the total width, so
+	it can be sliced, compared, formatted and used as the type of a
+	signal. Fields can be logic, four-valued vector types or other
+	packed structs, and are read as attributes. Values given to
+	fields in the class body are their defaults, other fields start
+	out as X, or as the default of their struct type.
+
+	Structs are immutable: use replace() or keywords to the
+	constructor, such as header(ttl = 64), to change fields.
+	"""
+
+	annotations = getattr(cls, '__annotations__', {})
+	if not annotations:
+		raise ValueError(f"{cls!r}: a packed struct needs fields")
+
+	width = 0
+	for name, ty in annotations.items():
+		if not _isfieldtype(ty):
+			raise ValueError(f"{name}: {ty!r}: not a field type")
+		width += 1 if ty is logic else ty._width
+	base = logvec[width - 1:0]
+
+	attrs = {
+		k: v
+		for k, v in cls.__dict__.items()
+		if k not in ('__dict__', '__weakref__', '__annotations__')
+		and k not in annotations
+	}
+	fields = {}
+	for name, ty in annotations.items():
+		if hasattr(_Struct, name) or hasattr(base, name):
+			raise ValueError(f"{name}: field hides a vector attribute")
+		width -= 1 if ty is logic else ty._width
+		fields[name] = attrs[name] = _Field(name, ty, width)
+
+	attrs.update(
+		__slots__ = (),
+		__fields__ = ReadOnlyDict(fields),
+		_slices = {},
+		_literals = {},
+		_pair_types = {},
+		_pair_lengths = {},
+		_interned = None)
+	struct = _StructType(cls.__name__, (_Struct, base), attrs)
+
+	# fields without a default start out as X, nested structs as
+	# their own default
+	defaults = {k: ty() for k, ty in annotations.items() if isinstance(ty, _StructType)}
+	defaults.update((k, getattr(cls, k)) for k in annotations if hasattr(cls, k))
+	struct._default = struct._replace((0, base._mask, 0), defaults)
+	return struct
@@ -15,29 +15,87 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 
-import contextlib
+import contextlib, warnings
 
 from .._lib import export, timestamp
 from .._part import Part
+from .._bitvec import bit, _two_state_type, _two_state_value
 from ._task import Task
 
+@export
+class TwoStateWarning(UserWarning):
+	"""An X or Z was assigned to a signal in a two-state simulation."""
+
+
 @export
 class Sim:
-	__slots__ = '_now', '_ticks', '_setattr', '_tasks', '_current_task'
+	"""Simulation of the part root and all of its children.
+
+	With two_state, logic and logvec signals are stored as bit and
+	bitvec while the simulation runs, which makes it faster. Both
+	compute alike, so a design that never sees X or Z gives the same
+	results either way. Signals start at 0 instead of X, and a value
+	with X or Z assigned to a signal becomes 0 instead, with a
+	TwoStateWarning the first time for each signal. Signals declared
+	four_state or resolved keep four-valued storage. When run returns,
+	the signals hold their declared types again, so root can be
+	inspected or simulated again like after a four-state run.
+	"""
 
-	def __init__(self, root):
+	__slots__ = '_now', '_ticks', '_setattr', '_parts', '_tasks', '_current_task', '_two_state', '_unknowns'
+
+	def __init__(self, root, *, two_state = False):
 		self._now = timestamp(0)
 		self._ticks = 0
 		self._setattr = {}
+		self._two_state = two_state
+		self._unknowns = {}
 
+		self._parts = tuple(Part(type(root)).all_parts(root))
 		tasks = []
-		for part in Part(type(root)).all_parts(root):
+		for part in self._parts:
 			factory = Task.Factory(self, part)
 			for block in Part(type(part)).blocks:
 				tasks.append(block.apply(factory))
 		self._tasks = tuple(tasks)
 		self._current_task = None
 
+	@contextlib.contextmanager
+	def _make_two_state(self):
+		"""Store the four-valued signals of all parts as two-state
+		values, and as their declared types again afterwards.
+		"""
+
+		signals = []
+		if self._two_state:
+			for part in self._parts:
+				for signal in Part(type(part)).signals.values():
+					ty = None if signal.four_state else _two_state_type(signal.type)
+					if ty is not None:
+						signals.append((part, signal.name, ty))
+
+		for part, name, ty in signals:
+			value = object.__getattribute__(part, name)
+			object.__setattr__(part, name, _two_state_value(ty, value)[0])
+		try:
+			yield
+		finally:
+			for part, name, ty in signals:
+				value = object.__getattribute__(part, name)
+				object.__setattr__(part, name, value.logic if ty is bit else value.logvec)
+
+	@property
+	def two_state(self):
+		return self._two_state
+
+	@property
+	def unknowns(self):
+		"""Time and value of the first X or Z assigned to each signal
+		in a two-state simulation, by (part, attribute).
+		"""
+
+		return dict(self._unknowns)
+
 	@contextlib.contextmanager
 	def _make_current_task(self, task):
 		old = self._current_task
@@ -49,6 +107,25 @@ class Sim:
 		if self._current_task is not None:
 			self._current_task.__part_getattr__(obj, attr, value)
 
+	def __part_convert__(self, obj, attr, current, value):
+		if not self._two_state:
+			return NotImplemented
+		try:
+			result, unknown = _two_state_value(type(current), value)
+		except ValueError:
+			return NotImplemented
+
+		if unknown and (obj, attr) not in self._unknowns:
+			self._unknowns[(obj, attr)] = self._now, value
+			warnings.warn(
+				f"{self._now}: {type(obj).__name__}.{attr} = {value!s} in two-state simulation",
+				TwoStateWarning,
+				stacklevel = 3)
+		return result
+
+	def __part_driver__(self):
+		return self._current_task
+
 	def __part_setattr__(self, obj, attr, value):
 		if self._current_task is not None:
 			self._current_task.__part_setattr__(obj, attr, value)
@@ -65,7 +142,7 @@ class Sim:
 		return self._now >= time
 
 	def run(self):
-		with Part.make_current_observer(self):
+		with Part.make_current_observer(self), self._make_two_state():
 			while True:
 				# run ready tasks
 				ready = [t for t in self._tasks if t.ready]
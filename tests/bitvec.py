@@ -0,0 +1,318 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, operator, random, copy
+from hdlpy import bit, bitvec, logic, logvec, pattern, part
+
+class test_bit(unittest.TestCase):
+	def test_convert(self):
+		for value in (0, '0', False, logic.zero, bit.zero):
+			self.assertIs(bit(value), bit.zero)
+		for value in (1, '1', True, logic.one, bit.one):
+			self.assertIs(bit(value), bit.one)
+		for value in (2, -1, 'X', 'Z', logic.unknown, logic.hi_z, None, '01'):
+			with self.subTest(value = value):
+				self.assertRaises(ValueError, bit, value)
+		self.assertIs(bit(), bit.zero)
+		self.assertIs(bit.one.logic, logic.one)
+		self.assertIs(bit.zero.logic, logic.zero)
+		self.assertEqual(int(bit.one), 1)
+		self.assertEqual(str(bit.zero), '0')
+		self.assertEqual(repr(bit.one), "<bit '1'>")
+
+	def test_ops(self):
+		for l in (bit.zero, bit.one):
+			for r in (bit.zero, bit.one):
+				for oper in (operator.and_, operator.or_, operator.xor):
+					with self.subTest(l = l, r = r, oper = oper):
+						expected = bit(oper(l.logic, r.logic))
+						self.assertIs(oper(l, r), expected)
+						self.assertIs(oper(l, int(r)), expected)
+						self.assertIs(oper(int(l), r), expected)
+			self.assertIs(~l, bit(~l.logic))
+			self.assertTrue(l == l.logic)
+			self.assertTrue(l.logic == l)
+			self.assertTrue(l == '-')
+			self.assertFalse(l != int(l))
+		self.assertTrue(bit.one)
+		self.assertFalse(bit.zero)
+		self.assertLess(bit.zero, bit.one)
+		self.assertEqual(str(bit.one + bit.zero), '10')
+		self.assertIs(type(bit.one + bit.zero), bitvec[1:0])
+		self.assertEqual(str(bit.one * 3), '111')
+		self.assertIs(copy.deepcopy(bit.one), bit.one)
+
+
+class test_bitvec(unittest.TestCase):
+	def pairs(self, rand, count = 200):
+		for _ in range(count):
+			width = rand.randint(1, 70)
+			yield width, rand.getrandbits(width), rand.getrandbits(width)
+
+	def test_types(self):
+		self.assertIs(bitvec[7:0], bitvec[7:0])
+		self.assertIs(bitvec[7:0].unsigned, bitvec[7:0].unsigned)
+		self.assertIs(bitvec[7:0].signed.bitvec, bitvec[7:0])
+		self.assertEqual(bitvec[7:0].__name__, 'bitvec[7:0]')
+		self.assertEqual(bitvec[7:0].signed.__name__, 'bitvec[7:0].signed')
+		self.assertIs(bitvec[7:0].logvec, logvec[7:0])
+		self.assertIs(bitvec[7:0].unsigned.logvec, logvec[7:0].unsigned)
+		self.assertIs(bitvec[7:0].signed.logvec, logvec[7:0].signed)
+		self.assertRaises(ValueError, lambda: bitvec[0:7])
+		self.assertRaises(RuntimeError, lambda: bitvec[7:0][3:0])
+		self.assertEqual(len(bitvec.empty), 0)
+
+	def test_convert(self):
+		ty = bitvec[7:0]
+		self.assertEqual(int(ty().unsigned), 0)
+		self.assertEqual(int(ty(255).unsigned), 255)
+		self.assertEqual(int(ty(-1).unsigned), 255)
+		self.assertEqual(int(ty('1010_0101').unsigned), 0xa5)
+		self.assertEqual(int(ty('0xa5').unsigned), 0xa5)
+		self.assertEqual(int(ty('0x0a5').unsigned), 0xa5)
+		self.assertEqual(int(ty('101').unsigned), 5)
+		self.assertEqual(int(ty.signed('101')), -3)
+		self.assertEqual(int(ty.signed(-128)), -128)
+		self.assertEqual(str(ty((1, 0, 1, 1, 0, 0, 0, 0))), '10110000')
+		self.assertEqual(str(ty(logvec[7:0]('01010101'))), '01010101')
+		for value in (256, -257, '01X01010', 'Z', '0x1ff', logvec[7:0]('0101010Z'), '012'):
+			with self.subTest(value = value):
+				self.assertRaises(ValueError, ty, value)
+		self.assertEqual(str(bitvec(5)), '101')
+		self.assertIs(type(bitvec(5)), bitvec[2:0])
+		self.assertIs(type(bitvec('0110')), bitvec[3:0])
+
+	def test_logvec(self):
+		rand = random.Random(0)
+		for width, l, _ in self.pairs(rand):
+			for lty, bty in (
+				(logvec[width - 1:0], bitvec[width - 1:0]),
+				(logvec[width - 1:0].unsigned, bitvec[width - 1:0].unsigned),
+				(logvec[width - 1:0].signed, bitvec[width - 1:0].signed)):
+				# through strings, as signed logvec extends positive
+				# ints from their own length
+				bits = format(l, f"0{width}b")
+				value = bty(bits)
+				self.assertIs(type(value.logvec), lty)
+				self.assertTrue(logvec._same_planes(value.logvec, lty(bits)))
+				self.assertTrue(logvec._same_planes(lty(value), lty(bits)))
+				self.assertEqual(bty(lty(bits)), value)
+
+	def test_bytes(self):
+		rand = random.Random(9)
+		for width, l, _ in self.pairs(rand):
+			ty = bitvec[width - 1:0].unsigned
+			value = ty(l)
+			for order in ('big', 'little'):
+				with self.subTest(width = width, value = l, order = order):
+					data = value.to_bytes(order)
+					self.assertEqual(data, l.to_bytes((width + 7) // 8, order))
+					self.assertEqual(ty.from_bytes(data, order), value)
+		self.assertEqual(bytes(bitvec[15:0](0x1234)), b'\x12\x34')
+		self.assertEqual(bitvec[15:0](0x1234).__buffer__(0).tobytes(), b'\x12\x34')
+		self.assertIs(type(bitvec.from_bytes(b'\x12\x34')), bitvec[15:0])
+		self.assertIs(bitvec.from_bytes(b''), bitvec.empty)
+		self.assertRaises(ValueError, bitvec[3:0].from_bytes, b'\x10')
+		self.assertRaises(ValueError, bitvec[7:0].from_bytes, b'\x00\x01')
+
+	def test_unsigned(self):
+		rand = random.Random(1)
+		opers = (operator.and_, operator.or_, operator.xor, operator.add, operator.sub, operator.mul)
+		for width, l, r in self.pairs(rand):
+			lty, bty = logvec[width - 1:0].unsigned, bitvec[width - 1:0].unsigned
+			for oper in opers:
+				with self.subTest(width = width, l = l, r = r, oper = oper):
+					expected = oper(lty(l), lty(r))
+					actual = oper(bty(l), bty(r))
+					self.assertEqual(str(actual), str(expected))
+					self.assertEqual(type(actual).__name__, type(expected).__name__.replace('logvec', 'bitvec'))
+			if r:
+				self.assertEqual(str(bty(l) // bty(r)), str(lty(l) // lty(r)))
+				self.assertEqual(str(bty(l) % bty(r)), str(lty(l) % lty(r)))
+			for oper in (operator.lt, operator.le, operator.eq, operator.ne, operator.gt, operator.ge):
+				self.assertEqual(oper(bty(l), bty(r)), oper(l, r))
+				self.assertEqual(oper(bty(l), r), oper(l, r))
+			self.assertEqual(str(~bty(l)), str(~lty(l)))
+			self.assertEqual(str(bty(l) + 1), str(lty(l) + 1))
+
+	def test_signed(self):
+		rand = random.Random(2)
+		for width, l, r in self.pairs(rand):
+			ty = bitvec[width - 1:0].signed
+			left, right = ty(l), ty(r)
+			il, ir = int(left), int(right)
+			self.assertEqual(il, l - (l >> (width - 1) << width))
+			mask = (1 << width) - 1
+			self.assertEqual(int(left + right), ((il + ir) & mask) - ((il + ir) >> (width - 1) & 1) * (1 << width))
+			self.assertEqual((left + right).unsigned, (l + r) & mask)
+			self.assertEqual((left - right).unsigned, (l - r) & mask)
+			self.assertEqual(int(left * right), il * ir)
+			self.assertEqual(int(-left) % (1 << width), -il % (1 << width))
+			self.assertEqual(left < right, il < ir)
+			self.assertEqual(left >= ir, il >= ir)
+			self.assertEqual(left == il, True)
+			self.assertEqual(hash(left), hash(il))
+			self.assertEqual(int(left >> 1), il >> 1)
+			if ir:
+				quot, rem = abs(il) // abs(ir), abs(il) % abs(ir)
+				if (il < 0) != (ir < 0):
+					quot = -quot
+				if il < 0:
+					rem = -rem
+				self.assertEqual((left // right).unsigned, quot & mask)
+				self.assertEqual((left % right).unsigned, rem & mask)
+
+	def test_divide_errors(self):
+		def outcome(fun):
+			try:
+				return str(fun())
+			except (TypeError, ValueError) as e:
+				return type(e)
+
+		for origin in (logvec, bitvec):
+			u, s = origin[7:0].unsigned, origin[7:0].signed
+			self.assertIs(u(5).__floordiv__(s('00000001')), NotImplemented)
+			self.assertIs(s('00000101').__mod__(u(1)), NotImplemented)
+
+		for view in ('unsigned', 'signed'):
+			lty, bty = getattr(logvec[7:0], view), getattr(bitvec[7:0], view)
+			for oper in (operator.floordiv, operator.mod):
+				for right in ('00000000', 0):
+					with self.subTest(view = view, oper = oper, right = right):
+						self.assertEqual(
+							outcome(lambda: oper(bty('00000101'), bty(right) if type(right) is str else right)),
+							outcome(lambda: oper(lty('00000101'), lty(right) if type(right) is str else right)))
+
+	def test_same_as_logvec(self):
+		def outcome(fun):
+			try:
+				result = fun()
+			except (TypeError, ValueError) as e:
+				return type(e)
+			if isinstance(result, (logvec, bitvec)):
+				return type(result).__name__.replace('bitvec', 'logvec'), str(result)
+			return result
+
+		rand = random.Random(4)
+		opers = (
+			operator.eq, operator.lt, operator.le, operator.gt, operator.ge,
+			operator.add, operator.sub, operator.mul, operator.floordiv, operator.mod)
+		ints = (0, 1, 5, 8, 15, 127, 128, 253, 300, -1, -3, -128, -129)
+		for view in ('unsigned', 'signed'):
+			for lwidth, rwidth in ((8, 8), (8, 4), (4, 8)):
+				ltys = getattr(logvec[lwidth - 1:0], view), getattr(bitvec[lwidth - 1:0], view)
+				rtys = getattr(logvec[rwidth - 1:0], view), getattr(bitvec[rwidth - 1:0], view)
+				for _ in range(10):
+					l = format(rand.getrandbits(lwidth), f"0{lwidth}b")
+					r = format(rand.getrandbits(rwidth), f"0{rwidth}b")
+					for oper in opers:
+						with self.subTest(view = view, l = l, r = r, oper = oper):
+							self.assertEqual(*(outcome(lambda: oper(lty(l), rty(r))) for lty, rty in zip(ltys, rtys)))
+						for i in ints:
+							with self.subTest(view = view, l = l, i = i, oper = oper):
+								self.assertEqual(*(outcome(lambda: oper(ty(l), i)) for ty in ltys))
+								self.assertEqual(*(outcome(lambda: oper(i, ty(l))) for ty in ltys))
+					for oper in opers[:5]:
+						with self.subTest(view = view, l = l, r = r, oper = oper):
+							self.assertEqual(oper(ltys[0](l), rtys[0](r)), oper(int(ltys[0](l)), int(rtys[0](r))))
+							self.assertEqual(oper(ltys[0](l), ints[-2]), oper(int(ltys[0](l)), ints[-2]))
+					self.assertEqual(hash(ltys[0](l)), hash(ltys[1](l)))
+				for i in ints:
+					with self.subTest(view = view, width = lwidth, i = i):
+						self.assertEqual(*(outcome(lambda: ty(i)) for ty in ltys))
+
+		for origin in (logvec, bitvec):
+			ty = origin[3:0].signed
+			self.assertEqual((int(ty(-8)), int(ty(15))), (-8, -1))
+			self.assertRaises(ValueError, ty, -9)
+			self.assertRaises(ValueError, ty, 16)
+			self.assertEqual(int(origin[3:0](1).signed + 8), 9)
+			self.assertEqual(int(origin[3:0](1).signed - 8), -7)
+
+		a, b = logvec[7:0].signed(-3), logvec[7:0].signed(-5)
+		self.assertTrue(a > b and a == -3 and a != 253)
+		self.assertEqual(int(logvec[7:0].signed(5)), 5)
+
+	def test_getitem(self):
+		rand = random.Random(3)
+		for width, l, _ in self.pairs(rand, 50):
+			lvec, bvec = logvec[width + 9:10](l), bitvec[width + 9:10](l)
+			for _ in range(10):
+				hi = rand.randint(10, width + 9)
+				lo = rand.randint(10, hi)
+				self.assertEqual(str(bvec[hi:lo]), str(lvec[hi:lo]))
+				self.assertEqual(type(bvec[hi:lo]).__name__, type(lvec[hi:lo]).__name__.replace('logvec', 'bitvec'))
+				self.assertEqual(bvec[hi], bit(lvec[hi]))
+			self.assertEqual(bvec[-1], bit(lvec[-1]))
+			self.assertEqual(list(bvec), [bit(b) for b in lvec])
+			self.assertEqual(list(reversed(bvec)), [bit(b) for b in reversed(lvec)])
+			self.assertRaises(IndexError, bvec.__getitem__, 9)
+
+	def test_bits(self):
+		rand = random.Random(4)
+		for width, l, r in self.pairs(rand, 50):
+			lvec, bvec = logvec[width - 1:0](l), bitvec[width - 1:0](l)
+			amount = rand.randint(0, width + 1)
+			for name in ('shift_left', 'shift_right', 'rotate_left', 'rotate_right'):
+				with self.subTest(name = name, width = width, amount = amount):
+					self.assertEqual(str(getattr(bvec, name)(amount)), str(getattr(lvec, name)(amount)))
+			self.assertEqual(str(bvec.shift_left(amount, 1)), str(lvec.shift_left(amount, 1)))
+			self.assertEqual(str(bvec.signed >> amount), str(lvec.signed >> amount))
+			self.assertEqual(str(bvec + bitvec(r)), str(lvec + logvec(r)))
+			self.assertEqual(str(bvec * 3), str(lvec * 3))
+			for fmt in ('b', 'o', 'x', 'X', 'd'):
+				self.assertEqual(format(bvec, fmt), format(lvec, fmt))
+
+	def test_eq(self):
+		vec = bitvec[7:0]('10100101')
+		self.assertEqual(vec, '10100101')
+		self.assertEqual(vec, '1010_0-01')
+		self.assertEqual(vec, pattern('1-1-----'))
+		self.assertNotEqual(vec, '1010_0-00')
+		self.assertNotEqual(vec, '1-1')
+		self.assertEqual(vec, 0xa5)
+		self.assertEqual(vec, logvec[7:0]('10100101'))
+		self.assertNotEqual(vec, logvec[7:0]('1010010X'))
+		self.assertEqual(hash(vec), hash(logvec[7:0]('10100101')))
+
+		# as with logvec, signed views only equal their int value
+		vecs = (vec, vec.unsigned, vec.signed, logvec[7:0]('10100101').signed)
+		self.assertEqual(len(set(vecs)), 2)
+		self.assertNotEqual(vec, vec.signed)
+		self.assertNotEqual(vec.signed, logvec[7:0]('10100101'))
+		self.assertEqual({vec.signed: 'signed'}[-0x5b], 'signed')
+		self.assertNotIn(vec.signed, {vec: 'plain'})
+
+	def test_part(self):
+		@part
+		class TwoState:
+			flag: bit
+			count: bitvec[7:0].unsigned
+			word = bitvec[3:0]('1010')
+
+		obj = TwoState()
+		self.assertIs(obj.flag, bit.zero)
+		self.assertEqual(obj.count, 0)
+		obj.flag = 1
+		obj.count = obj.count + 5
+		obj.word = logvec[3:0]('0110')
+		self.assertIs(obj.flag, bit.one)
+		self.assertIs(type(obj.count), bitvec[7:0].unsigned)
+		self.assertEqual(obj.count, 5)
+		self.assertEqual(str(obj.word), '0110')
+		with self.assertRaises(ValueError):
+			obj.flag = 'X'
@@ -0,0 +1,213 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, random
+from hdlpy import logic, logvec, logvec_array, bitvec, part, when, once, crc, lfsr, internet_checksum
+from hdlpy.sim import Sim, Wait
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+_check = b'123456789'
+
+class test_crc(unittest.TestCase):
+	def engines(self):
+		return (
+			crc.crc8, crc.crc16_ccitt, crc.crc16_xmodem, crc.crc16_arc, crc.crc32, crc.crc32c,
+			crc(3, 0x3, xor_out = 0x7),
+			crc(5, 0x05, init = 0x1f, reflect_in = True, reflect_out = True, xor_out = 0x1f),
+			crc(12, 0x80f, reflect_out = True),
+		)
+
+	def test_catalogue(self):
+		tests = (
+			(crc.crc8, 0xf4),
+			(crc.crc16_ccitt, 0x29b1),
+			(crc.crc16_xmodem, 0x31c3),
+			(crc.crc16_arc, 0xbb3d),
+			(crc.crc32, 0xcbf43926),
+			(crc.crc32c, 0xe3069283),
+			(crc(3, 0x3, xor_out = 0x7), 0x4),
+			(crc(5, 0x05, init = 0x1f, reflect_in = True, reflect_out = True, xor_out = 0x1f), 0x19),
+			(crc(5, 0x09, init = 0x09), 0x00),
+			(crc(7, 0x09), 0x75),
+			(crc(12, 0x80f, reflect_out = True), 0xdaf),
+		)
+
+		for engine, expected in tests:
+			with self.subTest(engine = engine):
+				actual = engine(_check)
+				self.assertIs(type(actual), logvec[engine.width - 1:0].unsigned)
+				self.assertEqual(int(actual), expected)
+
+	def test_tables(self):
+		rand = random.Random(0)
+		for engine in (crc.crc32, crc.crc16_xmodem):
+			generic = engine._update_reflected if engine.reflect_in else engine._update_normal
+			for size in (0, 1, 7, 100):
+				data = bytes(rand.getrandbits(8) for _ in range(size))
+				reg = rand.getrandbits(engine.width)
+				with self.subTest(engine = engine, data = data):
+					self.assertEqual(engine._update(reg, data), generic(reg, data))
+
+	def test_step(self):
+		rand = random.Random(1)
+		for engine in self.engines():
+			data = bytes(rand.getrandbits(8) for _ in range(5))
+			reg = engine.reset()
+			for byte in data:
+				for bit in (range(8) if engine.reflect_in else range(7, -1, -1)):
+					reg = engine.step(reg, byte >> bit & 1)
+			with self.subTest(engine = engine):
+				self.assertEqual(reg, engine.update(engine.reset(), data))
+				self.assertEqual(engine.result(reg), engine(data))
+
+	def test_inputs(self):
+		expected = crc.crc32(b'\x12\x34\x56\x78')
+		for data in (
+			bytearray(b'\x12\x34\x56\x78'),
+			memoryview(b'\x12\x34\x56\x78'),
+			[0x12, 0x34, 0x56, 0x78],
+			logvec[31:0](0x1234_5678),
+			bitvec[31:0](0x1234_5678),
+			logvec.from_bytes(b'\x12\x34\x56\x78'),
+			memoryview(b'\x12\x34\x56\x78').cast('H')):
+			with self.subTest(data = data):
+				self.assertEqual(crc.crc32(data), expected)
+		self.assertEqual(
+			crc.crc32.update(crc.crc32.update(crc.crc32.reset(), b'\x12\x34'), b'\x56\x78'),
+			crc.crc32.update(crc.crc32.reset(), b'\x12\x34\x56\x78'))
+		self.assertRaises(ValueError, crc.crc32, logvec('101'))
+		self.assertRaises(ValueError, crc, 8, 0x107)
+
+	@unittest.skipIf(numpy is None, "needs NumPy")
+	def test_array(self):
+		words = [0x1234, 0x5678, 0x9abc]
+		data = logvec_array(logvec[15:0].unsigned, words)
+		self.assertEqual(crc.crc32(data), crc.crc32(b'\x12\x34\x56\x78\x9a\xbc'))
+		self.assertEqual(
+			internet_checksum(data),
+			internet_checksum(b'\x12\x34\x56\x78\x9a\xbc'))
+		self.assertRaises(ValueError, crc.crc32, logvec_array(logvec[11:0], [0x123]))
+		self.assertEqual(str(crc.crc32(logvec_array(logvec[7:0], ['0000000X']))), 'X' * 32)
+
+	def test_unknown(self):
+		engine = crc.crc16_xmodem
+		self.assertEqual(str(engine(logvec('0000_000X_0000_0000'))), 'X' * 16)
+		self.assertEqual(str(engine.update(engine.type(), b'\x00')), 'X' * 16)
+		self.assertEqual(str(engine.result(engine.type())), 'X' * 16)
+		# the bits the polynomial flips become X
+		self.assertEqual(str(engine.step(engine.type(0), 'X')), '000X000000X0000X')
+		self.assertEqual(str(engine.step(engine.type('1' + '0' * 15), 'Z')), '000X000000X0000X')
+
+	def test_part(self):
+		the_test = self
+		data = b'\x31\x32\x33'
+
+		@part
+		class Checker:
+			clk: logic
+			din: logic
+			reg: logvec[15:0].unsigned = crc.crc16_ccitt.reset()
+
+			@when(rising = 'clk')
+			def shift(self):
+				self.reg = crc.crc16_ccitt.step(self.reg, self.din)
+
+		@part
+		class Testbench:
+			checker = Checker()
+
+			@once
+			async def test(self):
+				self.checker.clk = 0
+				for byte in data:
+					for bit in range(7, -1, -1):
+						self.checker.din = byte >> bit & 1
+						await Wait.delay('10ns')
+						self.checker.clk = 1
+						await Wait.delay('10ns')
+						self.checker.clk = 0
+
+		testbench = Testbench()
+		Sim(testbench).run()
+		self.assertEqual(crc.crc16_ccitt.result(testbench.checker.reg), crc.crc16_ccitt(data))
+
+
+class test_lfsr(unittest.TestCase):
+	def test_period(self):
+		for engine, period in ((lfsr.prbs7, 127), (lfsr.prbs9, 511), (lfsr.prbs11, 2047)):
+			with self.subTest(engine = engine):
+				start = reg = engine.type(1)
+				for step in range(1, period + 1):
+					reg = engine.step(reg)
+					if reg == start:
+						break
+				self.assertEqual(step, period)
+				bits, reg = engine.generate(start, period)
+				self.assertEqual(reg, start)
+				self.assertEqual(str(bits).count('1'), (period + 1) // 2)
+
+	def test_generate(self):
+		rand = random.Random(2)
+		for engine in (lfsr.prbs7, lfsr.prbs23, lfsr.prbs31, lfsr((12, 6, 4, 1))):
+			for count in (1, 5, engine.width, engine.width + 1, 100):
+				start = engine.type(rand.getrandbits(engine.width))
+				expected, reg = [], start
+				for _ in range(count):
+					expected.append(str(reg[-1]))
+					reg = engine.step(reg)
+				with self.subTest(engine = engine, count = count):
+					bits, actual = engine.generate(start, count)
+					self.assertIs(type(bits), logvec[count - 1:0])
+					self.assertEqual(str(bits), ''.join(expected))
+					self.assertEqual(actual, reg)
+
+		self.assertEqual(lfsr.prbs7.generate(lfsr.prbs7.type(1), 0), (logvec.empty, lfsr.prbs7.type(1)))
+		self.assertRaises(ValueError, lfsr, ())
+
+	def test_unknown(self):
+		engine = lfsr.prbs7
+		self.assertEqual(str(engine.step(engine.type('100000X'))), '00000X1')
+		self.assertEqual(str(engine.step(engine.type('0X00001'))), 'X00001X')
+		bits, reg = engine.generate(engine.type('X000001'), 10)
+		self.assertEqual(str(bits), 'X' * 10)
+		self.assertEqual(str(reg), 'X' * 7)
+
+
+class test_checksum(unittest.TestCase):
+	def test(self):
+		header = bytes.fromhex('45000073000040004011b861c0a80001c0a800c7')
+		self.assertEqual(int(internet_checksum(header)), 0)
+		self.assertEqual(int(internet_checksum(header[:10] + b'\0\0' + header[12:])), 0xb861)
+
+		rand = random.Random(3)
+		for size in (0, 1, 2, 3, 64, 1501):
+			data = bytes(rand.getrandbits(8) for _ in range(size))
+			total = 0
+			for i in range(0, size, 2):
+				total += int.from_bytes(data[i:i + 2].ljust(2, b'\0'), 'big')
+				total = (total & 0xffff) + (total >> 16)
+			with self.subTest(size = size):
+				actual = internet_checksum(data)
+				self.assertIs(type(actual), logvec[15:0].unsigned)
+				self.assertEqual(int(actual), ~total & 0xffff)
+
+		self.assertEqual(int(internet_checksum(b'\xff\xff')), 0)
+		self.assertEqual(str(internet_checksum(logvec('0000_000X_0000_0000'))), 'X' * 16)
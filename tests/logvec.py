@@ -1,6 +1,10 @@
 import unittest
 import operator
-from hdlpy import logic, logvec
+import gc
+import weakref
+import random
+import functools
+from hdlpy import logic, logvec, cat
 from hdlpy._logvec import unsigned_logvec, signed_logvec
 
 def unsigned(val):
@@ -186,7 +190,7 @@ class test_logvec(unittest.TestCase):
 			(logvec('ZX01XZ'), 'unsigned', unsigned_logvec('ZX01XZ')),
 			(logvec.empty, 'signed', signed_logvec.empty),
 			(logvec(0), 'signed', signed_logvec(0)),
-			(logvec(42), 'signed', signed_logvec(42)),
+			(logvec(42), 'signed', signed_logvec('101010')),
 			(logvec('ZX01XZ'), 'signed', signed_logvec('ZX01XZ')),
 		)
 
@@ -243,6 +247,25 @@ class test_logvec(unittest.TestCase):
 				actual = format(value, fmt)
 				self.assertEqual(expected, actual)
 
+	def test_format_groups(self):
+		def reference(value, fmt):
+			bits = 3 if fmt == 'o' else 4
+			text = str(value)
+			text = '0' * (-len(text) % bits) + text
+			return ''.join(
+				('X' if fmt == 'X' else 'x')
+				if 'X' in group or 'Z' in group else
+				format(int(group, 2), fmt)
+				for group in (text[i:i + bits] for i in range(0, len(text), bits))
+			) or '0'
+
+		rnd = random.Random(0)
+		for _ in range(100):
+			value = logvec(''.join(rnd.choice('0000000111111XZ') for _ in range(rnd.randrange(1, 130))))
+			for fmt in ('o', 'x', 'X'):
+				with self.subTest(value = value, fmt = fmt):
+					self.assertEqual(reference(value, fmt), format(value, fmt))
+
 	def test_format_invalid(self):
 		tests = (
 			(logvec(0), 'supercalifragilisticexpialidocious'),
@@ -285,6 +308,42 @@ class test_logvec(unittest.TestCase):
 				actual = a.__ne__(b)
 				self.assertEqual(not_(expected), actual)
 
+	def test_eq_int(self):
+		def reference(ty, value):
+			# unsigned and two's complement numbers that fit, signed
+			# types only go down to their sign bit
+			width = len(ty.__args__[0])
+			low = -2 ** (width - 1) if ty.__origin__ is signed_logvec else -2 ** width
+			if not low <= value < 2 ** width:
+				return None
+			return ty(format(value % 2 ** width, f"0{width}b"))
+
+		types = (logvec[5:0], logvec[5:0].unsigned, logvec[5:0].signed)
+		for ty in types:
+			for value in range(-100, 100):
+				with self.subTest(type = ty, value = value):
+					expected = reference(ty, value)
+					try:
+						actual = ty(value)
+					except ValueError:
+						actual = None
+					self.assertEqual(expected, actual)
+					if expected is not None and (ty is logvec[5:0] or int(expected) == value):
+						self.assertTrue(expected == value)
+						self.assertFalse(expected != value)
+						self.assertFalse(expected == value + 1)
+						self.assertTrue(expected != value + 1)
+					elif expected is not None:
+						# views compare as numbers
+						self.assertFalse(expected == value)
+						self.assertTrue(expected != value)
+
+		wide = logvec[1023:0](2 ** 1000)
+		self.assertEqual(True, wide == 2 ** 1000)
+		self.assertEqual(False, wide == 2 ** 1000 + 1)
+		self.assertEqual(False, logvec('1X') == 2)
+		self.assertEqual(False, logvec('1X') == 3)
+
 	def test_getitem(self):
 		tests = (
 			(8, logic(1)),
@@ -322,6 +381,31 @@ class test_logvec(unittest.TestCase):
 				with self.assertRaises(IndexError):
 					vec[index]
 
+	def test_getitem_random(self):
+		rand = random.Random(10)
+		for start, end in ((0, 0), (7, 0), (23, 8), (100, 37)):
+			ty = logvec[start:end]
+			text = ''.join(rand.choice('01XZ') for _ in range(start - end + 1))
+			vec = ty(text)
+			for _ in range(2):
+				for index in range(-(start + 2), start + 3):
+					with self.subTest(span = (start, end), index = index):
+						pos = index + start + 1 if index < 0 else index
+						if end <= pos <= start:
+							self.assertEqual(vec[index], logic(text[start - pos]))
+						else:
+							self.assertRaises(IndexError, vec.__getitem__, index)
+
+				for hi in range(end, start + 2):
+					for lo in range(max(end - 1, 0), hi + 1):
+						with self.subTest(span = (start, end), slice = (hi, lo)):
+							if lo < end or hi > start:
+								self.assertRaises(IndexError, vec.__getitem__, slice(hi, lo))
+								continue
+							actual = vec[hi:lo]
+							self.assertIs(type(actual), logvec[hi:lo])
+							self.assertEqual(str(actual), text[start - hi:start - lo + 1])
+
 	def test_invert(self):
 		tests = (
 			(logvec(0), logvec(1)),
@@ -344,6 +428,226 @@ class test_logvec(unittest.TestCase):
 				actual = ~signed(value)
 				self.assertEqual(signed(expected), actual)
 
+	def test_iter(self):
+		tests = (
+			(logvec.empty, ()),
+			(logvec('01ZX'), (logic.zero, logic.one, logic.hi_z, logic.unknown)),
+			(logvec[15:8](42), (logic.zero,) * 2 + (logic.one, logic.zero) * 3),
+		)
+
+		for value, expected in tests:
+			with self.subTest(value = value, expected = expected):
+				actual = tuple(value)
+				self.assertEqual(expected, actual)
+			with self.subTest(value = value, expected = expected[::-1]):
+				actual = tuple(reversed(value))
+				self.assertEqual(expected[::-1], actual)
+
+	def test_hash(self):
+		tests = (
+			(logvec(42), logvec[15:8](42)),
+			(logvec(42).unsigned, 42),
+			(logvec('01ZX'), logvec[7:4]('01ZX')),
+		)
+
+		for a, b in tests:
+			with self.subTest(a = a, b = b):
+				self.assertEqual(hash(a), hash(b))
+
+		# a signed view equals its int value, not the plain bits
+		vec = logvec[3:0]('1111')
+		self.assertEqual(len({vec, vec.unsigned, vec.signed}), 2)
+		self.assertEqual({vec: 'plain'}[vec.unsigned], 'plain')
+		self.assertEqual({vec.signed: 'signed'}[-1], 'signed')
+		self.assertNotIn(vec.signed, {vec: 'plain'})
+		self.assertNotIn(vec, {vec.signed: 'signed'})
+
+	def test_intern(self):
+		ty = logvec[7:0]
+		self.assertIsNone(logvec.intern_info())
+		self.assertIsNot(ty(42), ty(42))
+
+		logvec.intern(width = 8, size = 4)
+		try:
+			self.assertIs(ty(42), ty(42))
+			self.assertIs(ty(40).unsigned + 2, ty(42).unsigned)
+			self.assertIs(ty('01XZ0000'), ty('01XZ0000'))
+			self.assertIsNot(ty(42), logvec[8:1](42))
+			self.assertIsNot(logvec[8:0](42), logvec[8:0](42))
+			self.assertEqual(ty(42), ty(42))
+			self.assertGreater(logvec.intern_info().hits, 0)
+
+			# at most size instances per type
+			logvec.intern(width = 8, size = 4)
+			for value in range(8):
+				ty(value)
+			info = logvec.intern_info()
+			self.assertEqual(info.maxsize, 4)
+			self.assertEqual(info.currsize, 4)
+		finally:
+			logvec.intern(None)
+
+		self.assertIsNone(logvec.intern_info())
+		self.assertIsNot(ty(42), ty(42))
+		self.assertRaises(ValueError, logvec.intern, 8, 0)
+
+	def test_type_cache(self):
+		ty = logvec[100:50]
+		info = logvec.type_cache_info()
+		self.assertIs(logvec[100:50], ty)
+		self.assertEqual(logvec.type_cache_info().hits, info.hits + 1)
+
+		logvec.type_cache(4)
+		try:
+			for i in range(16):
+				logvec[i + 200:i + 193]
+			info = logvec.type_cache_info()
+			self.assertEqual(info.maxsize, 4)
+			self.assertEqual(info.currsize, 4)
+			self.assertIs(logvec[100:50], ty)
+
+			gc.collect()
+			self.assertLess(logvec.type_cache_info().live, info.live)
+			self.assertEqual(len(logvec[207:200](0)), 8)
+
+			# neither literals nor interned instances keep a type alive
+			logvec.intern(width = 8, size = 4)
+			live = weakref.ref(logvec[505:500])
+			self.assertEqual(str(live()('0101ZX')), '0101ZX')
+			self.assertIs(live()(5), live()(5))
+			for i in range(16):
+				logvec[i + 200:i + 193]
+			gc.collect()
+			self.assertIsNone(live())
+		finally:
+			logvec.intern(None)
+			logvec.type_cache(1024)
+
+		self.assertRaises(ValueError, logvec.type_cache, 0)
+
+	def test_same_length(self):
+		from hdlpy._span import rspan
+
+		def same_types(left, right):
+			# other operands take the kind of the vector they meet
+			if not isinstance(left, logvec):
+				left = right.__origin__(left)
+			if not isinstance(right, logvec):
+				right = left.__origin__(right)
+			if left.__origin__ is right.__origin__:
+				return left, right
+			elif left.__origin__ is logvec:
+				return right.__origin__[left.__args__[0]](left), right
+			elif right.__origin__ is logvec:
+				return left, left.__origin__[right.__args__[0]](right)
+			raise ValueError(left, right)
+
+		def enlarge(obj, new_len):
+			if len(obj) < new_len:
+				span = obj.__args__[0]
+				obj = obj.__origin__[rspan(start = span.start + new_len - len(obj), end = span.end)](obj)
+			return obj
+
+		def same_length(left, right):
+			# ints that fit take the width of the vector, next to a
+			# signed one they need room for the sign bit
+			def fits(value, vec):
+				return value >= 0 and (value.bit_length() or 1) \
+				    <= len(vec) - (vec.__origin__ is signed_logvec)
+			if type(right) is int and fits(right, left):
+				return left, left.__origin__[len(left) - 1:0](right)
+			if type(left) is int and fits(left, right):
+				return right.__origin__[len(right) - 1:0](left), right
+			left, right = same_types(left, right)
+			return enlarge(left, len(right)), enlarge(right, len(left))
+
+		def check(fun, reference, left, right):
+			try:
+				expected = reference(left, right)
+			except ValueError:
+				self.assertRaises(ValueError, fun, left, right)
+				return
+			actual = fun(left, right)
+			for a, e in zip(actual, expected):
+				self.assertIs(type(a), type(e))
+				self.assertTrue(logvec._same_planes(a, e))
+
+		rand = random.Random(8)
+		def operand():
+			if rand.random() < 0.2:
+				return rand.choice((0, 1, 5, 200, -3))
+			width = rand.randint(0, 6)
+			end = rand.randint(0, 3)
+			ty = logvec[rspan(start = width + end - 1, end = end) if width else rspan.empty]
+			vec = ty(''.join(rand.choice('01XZ') for _ in range(width))) if width else ty.empty
+			return rand.choice((vec, vec.unsigned, vec.signed))
+
+		for _ in range(2000):
+			left, right = operand(), operand()
+			if type(left) is int and type(right) is int:
+				continue
+			with self.subTest(left = left, right = right):
+				check(logvec._same_types, same_types, left, right)
+				check(logvec._same_length, same_length, left, right)
+
+	def test_radix(self):
+		tests = (
+			('0x0', '0000'),
+			('0xa5', '10100101'),
+			('0xDEAD_beef', format(0xdeadbeef, '032b')),
+			('0x1X', '0001XXXX'),
+			('0xzF', 'ZZZZ1111'),
+			('0o17', '001111'),
+			('0o7x_z', '111XXXZZZ'),
+		)
+
+		for literal, expected in tests:
+			with self.subTest(literal = literal):
+				self.assertEqual(str(logvec(literal)), expected)
+				self.assertEqual(str(logvec[len(expected) + 3:4](literal)), expected)
+
+		rand = random.Random(9)
+		for _ in range(100):
+			value = rand.getrandbits(rand.randint(1, 100))
+			width = -(-value.bit_length() // 4) * 4 or 4
+			self.assertEqual(int(logvec.from_hex(format(value, 'x')).unsigned), value)
+			self.assertEqual(int(logvec.from_oct(format(value, 'o')).unsigned), value)
+			self.assertEqual(format(logvec[width - 1:0](value), 'x'), format(logvec.from_hex(format(value, f"0{width // 4}x")), 'x'))
+
+		self.assertEqual(logvec[7:0]('0x00f'), logvec[7:0](15))
+		self.assertEqual(int(logvec[7:0].unsigned.from_hex('f')), 15)
+		self.assertEqual(int(logvec[7:0].signed('0x7')), 7)
+		for literal in ('0x', '0xg', '0o8', '0o1.'):
+			with self.subTest(literal = literal):
+				self.assertRaises(ValueError, logvec, literal)
+		self.assertEqual(str(logvec('0X1')), '0X1')
+		self.assertRaises(ValueError, logvec[3:0], '0x1f')
+		self.assertRaises(ValueError, logvec[7:0], '0x0X00')
+
+	def test_literal_cache(self):
+		ty = logvec[7:0]
+		self.assertIs(ty('1010_XXXX'), ty('1010_XXXX'))
+		self.assertIs(ty.unsigned('0xff'), ty.unsigned('0xff'))
+		self.assertIs(logvec('01'), logvec('01'))
+		self.assertIsNot(ty('1010_XXXX'), ty.signed('1010_XXXX'))
+		self.assertIs(logvec(''), logvec.empty)
+		self.assertRaises(ValueError, ty, '012')
+
+	def test_wide(self):
+		a = logvec('01ZX' * 256)
+		b = logvec('0011' * 256)
+		tests = (
+			(~a, logvec('10XX' * 256)),
+			(a & b, logvec('00XX' * 256)),
+			(a | b, logvec('0111' * 256)),
+			(a ^ b, logvec('01XX' * 256)),
+		)
+
+		for actual, expected in tests:
+			with self.subTest(expected = expected):
+				self.assertEqual(expected, actual)
+				self.assertEqual(str(expected), str(actual))
+
 	def _test_binary(self, oper, a, b, expected):
 		with self.subTest(a = a, b = b, expected = expected, types = 'logvec,logvec'):
 			actual = oper(a, b)
@@ -540,6 +844,36 @@ class test_logvec(unittest.TestCase):
 		vec = logvec('ZX101ZX')
 		self._test_shift_invalid('rotate_right', vec, (-1,))
 
+	def test_shift_typed(self):
+		tests = (
+			('shift_left', (3,), logvec[15:8]('1XZ01000')),
+			('shift_left', (logvec(3).unsigned, 'Z'), logvec[15:8]('1XZ01ZZZ')),
+			('shift_right', (logvec(3).unsigned,), logvec[15:8]('0000011X')),
+			('rotate_left', (11,), logvec[15:8]('1XZ01001')),
+			('rotate_right', (logvec(3).unsigned,), logvec[15:8]('Z010011X')),
+		)
+
+		vec = logvec[15:8]('0011XZ01')
+		for fun, args, expected in tests:
+			with self.subTest(fun = fun, args = args, expected = expected):
+				actual = getattr(vec, fun)(*args)
+				self.assertEqual(expected, actual)
+
+	def test_shift_wide(self):
+		vec = logvec('X1Z0' * 128)
+		for amount in (0, 1, 5, 64, 511, 512, 600):
+			text = str(vec)
+			shifted = text[min(amount, 512):] + 'X' * min(amount, 512)
+			rotated = text[amount % 512:] + text[:amount % 512]
+			with self.subTest(fun = 'shift_left', amount = amount):
+				self.assertEqual(shifted, str(vec.shift_left(amount, 'X')))
+			with self.subTest(fun = 'shift_right', amount = amount):
+				self.assertEqual(('1' * amount + text)[:512], str(vec.shift_right(amount, 1)))
+			with self.subTest(fun = 'rotate_left', amount = amount):
+				self.assertEqual(rotated, str(vec.rotate_left(amount)))
+			with self.subTest(fun = 'rotate_right', amount = amount):
+				self.assertEqual(rotated, str(vec.rotate_right(-amount % 512)))
+
 	def test_add(self):
 		tests = (
 			(logvec(0), logvec('01'), logvec('001')),
@@ -591,6 +925,175 @@ class test_logvec(unittest.TestCase):
 				actual = vec.__rmul__(other)
 				self.assertIs(NotImplemented, actual)
 
+	def test_concat(self):
+		rand = random.Random(6)
+		for _ in range(100):
+			parts = []
+			for _ in range(rand.randint(1, 16)):
+				width = rand.randint(1, 12)
+				text = ''.join(rand.choice('01XZ') for _ in range(width))
+				parts.append(rand.choice((
+					logvec(text),
+					logvec[width + 3:4](text),
+					logic(text[0]),
+					text)))
+			expected = parts[0] if isinstance(parts[0], logvec) else logvec(parts[0])
+			for part in parts[1:]:
+				expected = expected + part
+			with self.subTest(parts = parts):
+				self.assertEqual(expected, logvec.concat(*parts))
+				self.assertEqual(expected, cat(*parts))
+
+		self.assertEqual(cat(), logvec.empty)
+		self.assertEqual(cat(logvec.empty, logvec.empty), logvec.empty)
+		self.assertEqual(cat('1', 5, (5, 4), (-1, 2), (0, 0)), logvec('1101010111'))
+		self.assertEqual(
+			cat(logvec[3:0](3).unsigned, logvec('1X'), logic.one),
+			logvec[6:0].unsigned('00111X1'))
+		self.assertEqual(
+			cat(logvec[1:0](3), logvec[3:0](3).signed),
+			logvec[5:0].signed('110011'))
+		self.assertRaises(ValueError, cat, logvec[3:0](3).unsigned, logvec[3:0](3).signed)
+		self.assertRaises(ValueError, cat, (16, 4))
+		self.assertRaises(ValueError, cat, (5, 0))
+		self.assertRaises(ValueError, cat, (-1, 0))
+		self.assertRaises(ValueError, cat, 'foo')
+
+	def test_view(self):
+		rand = random.Random(7)
+		for start, end in ((7, 0), (100, 37), (511, 0)):
+			for unknown in (False, True):
+				chars = '0011XZ' if unknown else '01'
+				text = ''.join(rand.choice(chars) for _ in range(start - end + 1))
+				for vec in (logvec[start:end](text), logvec[start:end](text).unsigned, logvec[start:end](text).signed):
+					view = vec.view
+					self.assertEqual(view.copy(), vec)
+					for _ in range(20):
+						hi = rand.randint(end, start)
+						lo = rand.randint(end, hi)
+						sliced, viewed = vec[hi:lo], view[hi:lo]
+						with self.subTest(vec = vec, slice = (hi, lo)):
+							self.assertIs(viewed.type, type(sliced))
+							self.assertEqual(viewed.copy(), sliced)
+							self.assertEqual(len(viewed), len(sliced))
+							self.assertEqual(str(viewed), str(sliced))
+							self.assertEqual(f"{viewed:x}", f"{sliced:x}")
+							self.assertEqual(list(viewed), list(sliced))
+							self.assertEqual(viewed[lo], sliced[lo])
+							self.assertEqual(viewed[-1], sliced[-1])
+							self.assertTrue(viewed == sliced)
+							self.assertTrue(sliced == viewed)
+							self.assertFalse(viewed != sliced)
+							self.assertEqual(hash(viewed), hash(sliced))
+							mid = rand.randint(lo, hi)
+							self.assertEqual(viewed[hi:mid].copy(), sliced[hi:mid])
+							if vec.__origin__ is not logvec:
+								try:
+									expected = int(sliced)
+								except ValueError:
+									self.assertRaises(ValueError, int, viewed)
+								else:
+									self.assertEqual(int(viewed), expected)
+									self.assertIs(viewed == expected, sliced == expected)
+									self.assertIs(viewed < expected + 1, sliced < expected + 1)
+							else:
+								self.assertRaises(TypeError, int, viewed)
+
+		vec = logvec[15:0](0x5a3c).unsigned
+		self.assertEqual(repr(vec.view[7:0]), "<logvec[7:0].unsigned view '00111100'>")
+		self.assertEqual(logvec[7:0](vec.view[15:8]), logvec[7:0](0x5a))
+		self.assertEqual(logvec(vec.view[3:0]), logvec('1100'))
+		self.assertTrue(vec.view[7:0] != 0x3d)
+		self.assertRaises(IndexError, vec.view.__getitem__, 16)
+		self.assertRaises(IndexError, vec.view[7:0].__getitem__, slice(8, 0))
+		self.assertRaises(ValueError, logvec[3:0], vec.view[7:0])
+
+	def test_bytes(self):
+		rand = random.Random(8)
+		for width in (1, 7, 8, 12, 64, 100):
+			ty = logvec[width - 1:0]
+			for _ in range(20):
+				text = ''.join(rand.choice('0011XZ') for _ in range(width))
+				vec = ty(text)
+				for order in ('big', 'little'):
+					with self.subTest(vec = vec, order = order):
+						mask = vec.unknown_bytes(order)
+						self.assertEqual(int.from_bytes(mask, order), int(text.translate({ord(c): ord(b) for c, b in zip('01XZ', '0011')}), 2))
+						zeroes, ones = vec.to_bytes(order, fill = 0), vec.to_bytes(order, fill = logic.one)
+						self.assertEqual(int.from_bytes(zeroes, order), int(text.replace('X', '0').replace('Z', '0'), 2))
+						self.assertEqual(int.from_bytes(ones, order), int(text.replace('X', '1').replace('Z', '1'), 2))
+						self.assertEqual(len(zeroes), (width + 7) // 8)
+						if 'X' in text or 'Z' in text:
+							self.assertRaises(ValueError, vec.to_bytes, order)
+						else:
+							self.assertEqual(vec.to_bytes(order), zeroes)
+						# Z comes back as X
+						self.assertEqual(str(ty.from_bytes(zeroes, order, unknown = mask)), text.replace('Z', 'X'))
+
+		self.assertEqual(logvec.from_bytes(b'\x12\x34'), logvec[15:0](0x1234))
+		self.assertEqual(logvec.from_bytes(bytearray(b'\x12\x34'), 'little'), logvec[15:0](0x3412))
+		self.assertEqual(logvec.from_bytes(memoryview(b'\xff'), unknown = b'\x0f'), logvec('1111XXXX'))
+		self.assertEqual(logvec[11:0].unsigned.from_bytes(b'\x0a\xbc'), logvec[11:0](0xabc).unsigned)
+		self.assertEqual(logvec.from_bytes(b''), logvec.empty)
+		self.assertEqual(bytes(logvec[11:0](0xabc)), b'\x0a\xbc')
+		self.assertEqual(logvec[11:0](0xabc).__buffer__(0).tobytes(), b'\x0a\xbc')
+		self.assertRaises(ValueError, logvec[11:0].from_bytes, b'\x1a\xbc')
+		self.assertRaises(ValueError, logvec[11:0].from_bytes, b'\xbc')
+		self.assertRaises(ValueError, logvec.from_bytes, b'\xff', unknown = b'\x0f\x00')
+		self.assertRaises(ValueError, logvec('1X').to_bytes, fill = 'Z')
+
+	def test_bits(self):
+		def possible(text):
+			# all fully known vectors text could stand for
+			if 'X' not in text and 'Z' not in text:
+				yield text
+				return
+			i = max(text.find('X'), text.find('Z'))
+			for b in '01':
+				yield from possible(text[:i] + b + text[i + 1:])
+
+		def counts(text, fun, width, spread = False):
+			# X in every bit of the count that is not the same for
+			# all possible vectors, or for all counts between the
+			# smallest and largest one with spread
+			values = {fun(t) for t in possible(text)}
+			if spread:
+				values = range(min(values), max(values) + 1)
+			bits = {format(v, f"0{width}b") for v in values}
+			return logvec[width - 1:0](''.join(c.pop() if len(c) == 1 else 'X' for c in map(set, zip(*bits)))).unsigned
+
+		rand = random.Random(9)
+		for width in (1, 3, 8, 13):
+			ty = logvec[width + 3:4]
+			bits = max(width.bit_length(), 1)
+			for _ in range(40):
+				text = ''.join(rand.choice('000111XZ' if rand.random() < 0.5 else '01') for _ in range(width))
+				vec = ty(text)
+				with self.subTest(vec = vec):
+					self.assertIs(vec.and_reduce(), functools.reduce(operator.and_, vec, logic.one))
+					self.assertIs(vec.or_reduce(), functools.reduce(operator.or_, vec, logic.zero))
+					self.assertIs(vec.xor_reduce(), functools.reduce(operator.xor, vec, logic.zero))
+					self.assertEqual(vec.popcount(), counts(text, lambda t: t.count('1'), bits))
+					self.assertEqual(vec.count_leading_zeros(), counts(text, lambda t: len(t) - len(t.lstrip('0')), bits, True))
+					self.assertEqual(vec.count_trailing_zeros(), counts(text, lambda t: len(t) - len(t.rstrip('0')), bits, True))
+					self.assertEqual(str(vec.reverse_bits()), text[::-1])
+					self.assertIs(type(vec.reverse_bits()), ty)
+					index = vec.onehot_index()
+					if text.count('1') == 1 and set(text) <= set('01'):
+						self.assertEqual(int(index), width - 1 - text.index('1'))
+					else:
+						self.assertEqual(str(index), 'X' * len(index))
+					self.assertEqual(len(index), max((width - 1).bit_length(), 1))
+
+		self.assertEqual(logvec('0XX1').popcount(), logvec('0XX').unsigned)
+		self.assertEqual(logvec[15:0].signed('0001_0010_1010_1011').reverse_bits(), logvec[15:0].signed('1101_0101_0100_1000'))
+		self.assertEqual(logvec[31:0](0x1234_5678).swap_bytes(), logvec[31:0](0x7856_3412))
+		self.assertEqual(str(logvec('0000_0001_XXXX_ZZZZ').swap_bytes()), 'XXXXZZZZ00000001')
+		self.assertIs(type(logvec[23:0].unsigned(0).swap_bytes()), logvec[23:0].unsigned)
+		self.assertRaises(ValueError, logvec('101').swap_bytes)
+		self.assertEqual(logvec.empty.popcount(), logvec[0:0].unsigned(0))
+		self.assertIs(logvec.empty.and_reduce(), logic.one)
+
 
 class test_logvec_unsigned(unittest.TestCase):
 	def assertEqual(self, first, second, msg = None):
@@ -638,6 +1141,9 @@ class test_logvec_unsigned(unittest.TestCase):
 			(logvec[6:0](-42).unsigned, logvec[6:0](-13).unsigned, True, False),
 			(logvec[15:8](42).unsigned, logvec[7:0](42).unsigned, False, False),
 			(logvec[15:8](42).unsigned, logvec[7:0](13).unsigned, False, True),
+			(logvec('01X').unsigned, logvec('011').unsigned, False, True),
+			(logvec('01X').unsigned, logvec('01Z').unsigned, True, False),
+			(logvec('01X').unsigned, 3, False, True),
 			(logvec[15:8](42).signed, logvec[7:0](42).unsigned, NotImplemented, NotImplemented),
 			(logvec[15:8](42).signed, logvec[7:0](13).unsigned, NotImplemented, NotImplemented),
 		)
@@ -722,6 +1228,23 @@ class test_logvec_unsigned(unittest.TestCase):
 				actual = b.unsigned.__radd__(a.unsigned)
 				self.assertEqual(expected.unsigned, actual)
 
+	def test_add_ripple(self):
+		def ripple(left, right, carry):
+			result = []
+			for l, r in zip(reversed(left), reversed(right)):
+				result.append(l ^ r ^ carry)
+				carry = (carry & l) | (carry & r) | (l & r)
+			return type(left)(result[::-1])
+
+		rnd = random.Random(0)
+		for _ in range(200):
+			a = logvec(''.join(rnd.choice('0000111XZ') for _ in range(12))).unsigned
+			b = logvec(''.join(rnd.choice('0000111XZ') for _ in range(12))).unsigned
+			with self.subTest(fun = '__add__', a = a, b = b):
+				self.assertEqual(ripple(a, b, logic.zero), a + b)
+			with self.subTest(fun = '__sub__', a = a, b = b):
+				self.assertEqual(ripple(a, ~b, logic.one), a - b)
+
 	def test_sub(self):
 		tests = (
 			(logvec[7:0](13), logvec[7:0](42), logvec[7:0](-29)),
@@ -757,7 +1280,7 @@ class test_logvec_unsigned(unittest.TestCase):
 	def test_div(self):
 		tests = (
 			(logvec[15:0](1337), logvec[7:0](13), logvec[15:0](102)),
-			(logvec[15:0](1337), logvec[7:0](-13), logvec[15:0](4)),
+			(logvec[15:0](1337), logvec[7:0](-13), logvec[15:0](5)),
 			(logvec[15:0](-1337), logvec[7:0](13), logvec[15:0](4938)),
 			(logvec[15:0](-1337), logvec[7:0](-13), logvec[15:0](264)),
 		)
@@ -773,7 +1296,7 @@ class test_logvec_unsigned(unittest.TestCase):
 	def test_mod(self):
 		tests = (
 			(logvec[15:0](1337), logvec[7:0](13), logvec[15:0](11)),
-			(logvec[15:0](1337), logvec[7:0](-13), logvec[15:0](365)),
+			(logvec[15:0](1337), logvec[7:0](-13), logvec[15:0](122)),
 			(logvec[15:0](-1337), logvec[7:0](13), logvec[15:0](5)),
 			(logvec[15:0](-1337), logvec[7:0](-13), logvec[15:0](47)),
 		)
@@ -787,6 +1310,34 @@ class test_logvec_unsigned(unittest.TestCase):
 				self.assertEqual(expected.unsigned, actual)
 
 
+	def test_arith_int(self):
+		rnd = random.Random(0)
+		for _ in range(200):
+			a = logvec[15:0](rnd.randrange(2 ** 16)).unsigned
+			b = logvec[7:0](rnd.randrange(1, 2 ** 8)).unsigned
+			with self.subTest(fun = '__mul__', a = a, b = b):
+				self.assertEqual(logvec[23:0](int(a) * int(b)).unsigned, a * b)
+			with self.subTest(fun = '__floordiv__', a = a, b = b):
+				self.assertEqual(logvec[15:0](int(a) // int(b)).unsigned, a // b)
+			with self.subTest(fun = '__mod__', a = a, b = b):
+				self.assertEqual(logvec[15:0](int(a) % int(b)).unsigned, a % b)
+
+	def test_arith_unknown(self):
+		tests = (
+			(operator.mul, logvec[3:0]('01X1'), logvec[3:0](3), logvec[7:0]('XXXXXXXX')),
+			(operator.mul, logvec[3:0](3), logvec[3:0]('000X'), logvec[7:0]('000000XX')),
+			(operator.floordiv, logvec[3:0]('0XX0'), logvec[3:0](0), None),
+		)
+
+		for oper, a, b, expected in tests:
+			with self.subTest(oper = oper, a = a.unsigned, b = b.unsigned, expected = expected):
+				if expected is None:
+					with self.assertRaises(ValueError):
+						oper(a.unsigned, b.unsigned)
+				else:
+					self.assertEqual(expected.unsigned, oper(a.unsigned, b.unsigned))
+
+
 class test_logvec_signed(unittest.TestCase):
 	def assertEqual(self, first, second, msg = None):
 		if type(first) != type(second):
@@ -797,14 +1348,18 @@ class test_logvec_signed(unittest.TestCase):
 		tests = (
 			(logvec(0).signed, logvec(0).signed, True),
 			(logvec(0).signed, logvec(1).signed, False),
-			(logvec(42).signed, 42, True),
+			(logvec(42).signed, -22, True),
+			(logvec(42).signed, 42, False),
 			(logvec(42).signed, 13, False),
+			(logvec[7:0](-3).signed, -3, True),
+			(logvec[7:0](-3).signed, 253, False),
 			(logvec(42).signed, logvec(42).signed, True),
 			(logvec(42).signed, logvec(13).signed, False),
 			(logvec[15:8](42).signed, logvec[7:0](42).signed, True),
 			(logvec[15:8](42).signed, logvec[7:0](13).signed, False),
 			(logvec[15:8](42).signed, logvec[7:0](42).unsigned, NotImplemented),
 			(logvec[15:8](42).signed, logvec[7:0](13).unsigned, NotImplemented),
+			(logvec[15:8](42).signed, logvec[7:0](42), NotImplemented),
 			(logvec(42).signed, '101-10', True),
 			(logvec(42).signed, '10_10-0', True),
 			(logvec(13).signed, '10_10-0', False),
@@ -823,14 +1378,18 @@ class test_logvec_signed(unittest.TestCase):
 		tests = (
 			(logvec(0).signed, logvec(0).signed, False, False),
 			(logvec(0).signed, logvec(1).signed, False, True),
-			(logvec(42).signed, 42, False, False),
-			(logvec(42).signed, 13, False, True),
+			(logvec(42).signed, -22, False, False),
+			(logvec(42).signed, 42, True, False),
+			(logvec(42).signed, -23, False, True),
 			(logvec(42).signed, logvec(42).signed, False, False),
-			(logvec(42).signed, logvec(13).signed, False, True),
+			(logvec(42).signed, logvec(13).signed, True, False),
 			(logvec[6:0](42).signed, logvec[6:0](-42).signed, False, True),
 			(logvec[6:0](42).signed, logvec[6:0](-13).signed, False, True),
 			(logvec[6:0](-42).signed, logvec[6:0](-42).signed, False, False),
-			(logvec[6:0](-42).signed, logvec[6:0](-13).signed, False, True),
+			(logvec[6:0](-42).signed, logvec[6:0](-13).signed, True, False),
+			(logvec[7:0](-3).signed, logvec[7:0](-5).signed, False, True),
+			(logvec[7:0](-3).signed, 253, True, False),
+			(logvec[7:0](-3).signed, logvec[3:0](-5).signed, False, True),
 			(logvec[15:8](42).signed, logvec[7:0](42).signed, False, False),
 			(logvec[15:8](42).signed, logvec[7:0](13).signed, False, True),
 			(logvec[15:8](42).signed, logvec[7:0](42).unsigned, NotImplemented, NotImplemented),
@@ -875,6 +1434,12 @@ class test_logvec_signed(unittest.TestCase):
 				actual = int(value.signed)
 				self.assertEqual(expected, actual)
 
+		ty = logvec[3:0].signed
+		self.assertEqual(int(ty(-8)), -8)
+		self.assertEqual(int(ty(15)), -1)
+		self.assertRaises(ValueError, ty, -9)
+		self.assertRaises(ValueError, ty, 16)
+
 	def test_format(self):
 		tests = (
 			(logvec(0), '0'),
@@ -1006,3 +1571,30 @@ class test_logvec_signed(unittest.TestCase):
 			with self.subTest(fun = '__rmod__', a = a.signed, b = b.signed, expected = expected.signed):
 				actual = b.signed.__rmod__(a.signed)
 				self.assertEqual(expected.signed, actual)
+
+	def test_arith_int(self):
+		def trunc(a, b):
+			quot, rem = divmod(abs(a), abs(b))
+			return quot if (a < 0) == (b < 0) else -quot, rem if a >= 0 else -rem
+
+		rnd = random.Random(0)
+		for _ in range(200):
+			a = logvec[15:0](rnd.randrange(-2 ** 15, 2 ** 15)).signed
+			b = logvec[7:0](rnd.choice((-1, 1)) * rnd.randrange(1, 2 ** 7)).signed
+			quot, rem = trunc(int(a), int(b))
+			with self.subTest(fun = '__mul__', a = a, b = b):
+				self.assertEqual(logvec[23:0](int(a) * int(b)).signed, a * b)
+			with self.subTest(fun = '__floordiv__', a = a, b = b):
+				self.assertEqual(logvec[15:0](quot).signed, a // b)
+			with self.subTest(fun = '__mod__', a = a, b = b):
+				self.assertEqual(logvec[15:0](rem).signed, a % b)
+
+		# a positive int gets a sign bit, even when it would fit
+		# the bits of the vector
+		a = logvec[3:0](1).signed
+		for b in (8, 12, 16):
+			with self.subTest(b = b):
+				self.assertEqual(int(a + b), 1 + b)
+				self.assertEqual(int(b + a), 1 + b)
+				self.assertEqual(int(a - b), 1 - b)
+				self.assertEqual(int(a * b), b)
@@ -0,0 +1,202 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, operator, random
+from hdlpy import logic, logic_array, logvec, logvec_array
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+def _random(rand, width, unknown):
+	if unknown and rand.random() < 0.3:
+		return ''.join(rand.choice('0011XZ') for _ in range(width))
+	return rand.getrandbits(width)
+
+@unittest.skipIf(numpy is None, "needs NumPy")
+class test_logvec_array(unittest.TestCase):
+	def types(self):
+		for width in (1, 8, 64, 100):
+			for ty in (logvec[width - 1:0], logvec[width - 1:0].unsigned, logvec[width - 1:0].signed):
+				yield ty
+
+	def arrays(self, ty, rand, count = 20):
+		width = len(ty.__args__[0])
+		elems = [ty(_random(rand, width, True)) for _ in range(count)]
+		return elems, logvec_array(ty, elems)
+
+	def test_roundtrip(self):
+		rand = random.Random(0)
+		for ty in self.types():
+			with self.subTest(ty = ty):
+				elems, array = self.arrays(ty, rand)
+				self.assertEqual(len(array), len(elems))
+				self.assertEqual(array.tolist(), elems)
+				for i, elem in enumerate(elems):
+					self.assertIs(type(array[i]), ty)
+					self.assertTrue(logvec._same_planes(array[i], elem))
+				self.assertEqual(array[-1], elems[-1])
+				self.assertEqual(array[2:5].tolist(), elems[2:5])
+				self.assertEqual(array[::-1].tolist(), elems[::-1])
+				self.assertEqual(array.unsigned.tolist(), [e.unsigned for e in elems])
+				self.assertEqual(array.signed.logvec.tolist(), [e.logvec for e in elems])
+
+	def test_bitwise(self):
+		rand = random.Random(1)
+		for ty in self.types():
+			left, larray = self.arrays(ty, rand)
+			right, rarray = self.arrays(ty, rand)
+			scalar = right[0]
+			for oper in (operator.and_, operator.or_, operator.xor):
+				with self.subTest(ty = ty, oper = oper):
+					expected = [oper(l, r) for l, r in zip(left, right)]
+					self.assertEqual(oper(larray, rarray).tolist(), expected)
+					self.assertEqual(oper(larray, scalar).tolist(), [oper(l, scalar) for l in left])
+					self.assertEqual(oper(scalar, larray).tolist(), [oper(scalar, l) for l in left])
+			with self.subTest(ty = ty, oper = operator.invert):
+				self.assertEqual((~larray).tolist(), [~l for l in left])
+
+	def test_arith(self):
+		rand = random.Random(2)
+		for ty in self.types():
+			if ty.__origin__ is logvec:
+				continue
+			left, larray = self.arrays(ty, rand)
+			right, rarray = self.arrays(ty, rand)
+			for oper in (operator.add, operator.sub):
+				with self.subTest(ty = ty, oper = oper):
+					self.assertEqual(oper(larray, rarray).tolist(), [oper(l, r) for l, r in zip(left, right)])
+					if len(ty.__args__[0]) == 1 and ty._sign_extend:
+						# 1 takes two bits next to a signed vector, and
+						# arrays keep their width
+						self.assertRaises(TypeError, oper, larray, 1)
+						self.assertRaises(TypeError, oper, 1, larray)
+					else:
+						self.assertEqual(oper(larray, 1).tolist(), [oper(l, 1) for l in left])
+						self.assertEqual(oper(1, larray).tolist(), [oper(1, l) for l in left])
+					self.assertEqual(oper(right[0], larray).tolist(), [oper(right[0], l) for l in left])
+
+		elems, array = self.arrays(logvec[7:0], rand)
+		self.assertRaises(TypeError, operator.add, array, array)
+
+	def test_compare(self):
+		rand = random.Random(3)
+		opers = (operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge)
+		for ty in self.types():
+			left, larray = self.arrays(ty, rand)
+			right, rarray = self.arrays(ty, rand)
+			right[::3] = left[::3]
+			rarray = logvec_array(ty, right)
+			for oper in opers:
+				with self.subTest(ty = ty, oper = oper):
+					actual = oper(larray, rarray)
+					self.assertEqual(actual.dtype, numpy.bool_)
+					self.assertEqual(actual.tolist(), [oper(l, r) for l, r in zip(left, right)])
+					self.assertEqual(oper(larray, right[1]).tolist(), [oper(l, right[1]) for l in left])
+
+			if ty.__origin__ is not logvec:
+				for oper in opers:
+					for value in (1, -3, 200, -(1 << 70), 1 << 70):
+						with self.subTest(ty = ty, oper = oper, int = value):
+							self.assertEqual(oper(larray, value).tolist(), [oper(l, value) for l in left])
+
+		array = logvec_array(logvec[7:0].unsigned, (5, 100, 255))
+		self.assertEqual((array < 300).tolist(), [True, True, True])
+		self.assertEqual((array == 100).tolist(), [False, True, False])
+
+	def test_fields(self):
+		rand = random.Random(4)
+		for ty in (logvec[31:0].unsigned, logvec[99:4]):
+			elems, array = self.arrays(ty, rand)
+			start = ty.__args__[0].start
+			for bits in (slice(start, start - 6), slice(start - 10, start - 20), start - 3):
+				with self.subTest(ty = ty, bits = bits):
+					expected = [e[bits] for e in elems]
+					if isinstance(bits, int):
+						expected = [ty.__origin__[bits:bits]((e,)) for e in expected]
+					actual = array[:, bits]
+					self.assertEqual(actual.tolist(), expected)
+			self.assertEqual(array[1:3, start:start - 3].tolist(), [e[start:start - 3] for e in elems[1:3]])
+			self.assertRaises(IndexError, array.__getitem__, (slice(None), slice(start + 1, start)))
+
+	def test_ints(self):
+		values = [0, 1, 127, 128, 255]
+		self.assertEqual(logvec_array(logvec[7:0].unsigned, values).ints().tolist(), values)
+		self.assertEqual(
+			logvec_array(logvec[7:0].unsigned, values).signed.ints().tolist(),
+			[0, 1, 127, -128, -1])
+		wide = [0, 1 << 99, (1 << 100) - 1]
+		self.assertEqual(logvec_array(logvec[99:0].unsigned, wide).ints().tolist(), wide)
+		self.assertEqual(logvec_array(logvec[99:0].unsigned, wide).signed.ints().tolist(), [0, -(1 << 99), -1])
+		full = logvec_array(logvec[63:0].unsigned, [(1 << 64) - 1])
+		self.assertEqual(full.signed.ints().tolist(), [-1])
+		self.assertRaises(ValueError, logvec_array(logvec[3:0], ['01X0']).ints)
+
+	def test_bytes(self):
+		rand = random.Random(6)
+		for ty in (logvec[7:0], logvec[11:0].unsigned, logvec[63:0].signed, logvec[99:0]):
+			width = ty._width
+			elems = [ty(rand.getrandbits(width)) for _ in range(10)]
+			with self.subTest(ty = ty):
+				self.assertEqual(logvec_array(ty, elems).to_bytes(), b''.join(e.to_bytes() for e in elems))
+		self.assertEqual(logvec_array(logvec[7:0], []).to_bytes(), b'')
+		self.assertRaises(ValueError, logvec_array(logvec[3:0], ['01X0']).to_bytes)
+
+@unittest.skipIf(numpy is None, "needs NumPy")
+class test_logic_array(unittest.TestCase):
+	values = (logic.zero, logic.one, logic.unknown, logic.hi_z)
+
+	def test_tables(self):
+		tables = logic_array.tables()
+		for oper, name in ((operator.and_, 'and'), (operator.or_, 'or'), (operator.xor, 'xor')):
+			for l in self.values:
+				for r in self.values:
+					with self.subTest(l = l, r = r, oper = oper):
+						expected = oper(l, r)
+						self.assertIs(self.values[tables[name][self.values.index(l), self.values.index(r)]], expected)
+		for v in self.values:
+			self.assertIs(self.values[tables['invert'][self.values.index(v)]], ~v)
+		self.assertRaises(ValueError, tables['and'].__setitem__, (0, 0), 1)
+
+	def test_ops(self):
+		rand = random.Random(5)
+		left = [rand.choice(self.values) for _ in range(200)]
+		right = [rand.choice(self.values) for _ in range(200)]
+		larray, rarray = logic_array(left), logic_array(right)
+		for oper in (operator.and_, operator.or_, operator.xor):
+			with self.subTest(oper = oper):
+				self.assertEqual(oper(larray, rarray).tolist(), [oper(l, r) for l, r in zip(left, right)])
+				for value in self.values:
+					self.assertEqual(oper(larray, value).tolist(), [oper(l, value) for l in left])
+					self.assertEqual(oper(str(value), larray).tolist(), [oper(value, l) for l in left])
+		self.assertEqual((~larray).tolist(), [~l for l in left])
+		self.assertEqual((larray == rarray).tolist(), [l == r for l, r in zip(left, right)])
+		self.assertEqual((larray != 'X').tolist(), [l != 'X' for l in left])
+		self.assertTrue((larray == '-').all())
+
+	def test_convert(self):
+		array = logic_array('01XZ10')
+		self.assertEqual(str(array), '01XZ10')
+		self.assertEqual(array.codes.tolist(), [0, 1, 2, 3, 1, 0])
+		self.assertEqual(array.tolist(), [logic(c) for c in '01XZ10'])
+		self.assertIs(array[2], logic.unknown)
+		self.assertEqual(str(array[1:4]), '1XZ')
+		self.assertEqual(str(logic_array([0, 1, True, 'Z'])), '011Z')
+		self.assertEqual(str(logic_array.from_codes(numpy.array([3, 2, 1, 0]))), 'ZX10')
+		self.assertRaises(ValueError, logic_array, '01x')
+		self.assertRaises(ValueError, logic_array.from_codes, [4])
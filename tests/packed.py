@@ -0,0 +1,159 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, random, copy
+from hdlpy import logic, logvec, bitvec, packed, part, once, cat
+from hdlpy.sim import Sim
+
+@packed
+class header:
+	version: logvec[3:0] = 4
+	length: logvec[11:0].unsigned
+	valid: logic = 1
+	offset: logvec[14:0].signed = 0
+
+@packed
+class frame:
+	kind: logvec[1:0]
+	head: header
+	last: logic
+
+class test_struct(unittest.TestCase):
+	def test_layout(self):
+		self.assertEqual(header._width, 32)
+		self.assertEqual(
+			[(f.name, f.offset, f.width) for f in header.__fields__.values()],
+			[('version', 28, 4), ('length', 16, 12), ('valid', 15, 1), ('offset', 0, 15)])
+		self.assertIs(header.length.type, logvec[11:0].unsigned)
+		self.assertIs(header.valid.type, logic)
+		self.assertIs(frame.head.type, header)
+		self.assertEqual(frame.head.offset, 1)
+		self.assertEqual(frame._width, 35)
+		self.assertIs(header.__origin__, logvec)
+		self.assertIs(header.logvec, logvec[31:0])
+
+	def test_default(self):
+		value = header()
+		self.assertIs(type(value), header)
+		self.assertEqual(str(value), '0100' + 'X' * 12 + '1' + '0' * 15)
+
+		# nested structs start out as their own default, unless the
+		# field has a default of its own
+		self.assertEqual(str(frame()), 'XX' + str(header()) + 'X')
+		self.assertEqual(frame().head, header())
+		self.assertEqual(int(frame().head.offset), 0)
+
+		@packed
+		class tagged:
+			head: header = header(version = 6, length = 20)
+			tag: logvec[3:0]
+
+		self.assertEqual(str(tagged().head.version), '0110')
+		self.assertEqual(int(tagged().head.length), 20)
+		self.assertEqual(str(tagged().tag), 'XXXX')
+
+	def test_fields(self):
+		rand = random.Random(0)
+		for _ in range(200):
+			word = logvec[31:0](''.join(rand.choice('0011XZ') for _ in range(32)))
+			value = header(word)
+			self.assertEqual(str(value), str(word))
+			for name, bits in (('version', slice(31, 28)), ('length', slice(27, 16)), ('offset', slice(14, 0))):
+				with self.subTest(word = word, name = name):
+					field = getattr(value, name)
+					self.assertIs(type(field), getattr(header, name).type)
+					self.assertEqual(str(field), str(word[bits]))
+			self.assertIs(value.valid, word[15])
+
+		self.assertEqual(int(header(0x0123_8005).length), 0x123)
+		self.assertEqual(int(header(0x0123_7fff).offset), -1)
+
+	def test_replace(self):
+		rand = random.Random(1)
+		for _ in range(200):
+			values = {
+				'version': logvec[3:0](rand.getrandbits(4)),
+				'length': logvec[11:0](rand.getrandbits(12)).unsigned,
+				'valid': rand.choice((logic.zero, logic.one, logic.unknown)),
+				'offset': logvec[14:0](rand.getrandbits(15)).signed,
+			}
+			expected = cat(*(v.logvec if isinstance(v, logvec) else v for v in values.values()))
+			value = header(**values)
+			self.assertEqual(str(value), str(expected))
+			for name, new in (('version', '1010'), ('length', 7), ('valid', 0), ('offset', -2)):
+				with self.subTest(values = values, name = name):
+					changed = value.replace(**{name: new})
+					self.assertIs(type(changed), header)
+					self.assertEqual(getattr(changed, name), getattr(header, name).type(new))
+					for other in values:
+						if other != name:
+							self.assertEqual(getattr(changed, other), getattr(value, other))
+
+		value = frame(kind = 2, head = header(length = 5), last = 1)
+		self.assertEqual(int(value.head.length), 5)
+		self.assertEqual(value.replace(head = value.head.replace(length = 6)).head.length, 6)
+		self.assertEqual(str(value.kind), '10')
+		self.assertIs(value.last, logic.one)
+
+	def test_errors(self):
+		self.assertRaises(ValueError, header().replace, ttl = 1)
+		self.assertRaises(ValueError, header().replace, version = 16)
+		self.assertRaises(AttributeError, setattr, header(), 'version', 1)
+		self.assertRaises(ValueError, header, logvec[32:0](0))
+
+		def define(annotations):
+			return packed(type('bad', (), {'__annotations__': annotations}))
+
+		self.assertRaises(ValueError, define, {})
+		self.assertRaises(ValueError, define, {'a': int})
+		self.assertRaises(ValueError, define, {'a': logvec})
+		self.assertRaises(ValueError, define, {'signed': logvec[3:0]})
+		self.assertRaises(ValueError, define, {'replace': logic})
+
+	def test_part(self):
+		@part
+		class Decoder:
+			head: header
+			version: logvec[3:0]
+
+		decoder = Decoder()
+		self.assertIs(type(decoder.head), header)
+		self.assertEqual(decoder.head, header())
+
+		decoder.head = 0x5001_8000
+		self.assertIs(type(decoder.head), header)
+		self.assertEqual(str(decoder.head.version), '0101')
+		decoder.head = decoder.head.replace(version = 4)
+		self.assertEqual(int(decoder.head.length), 1)
+		decoder.version = decoder.head.version
+		self.assertEqual(str(decoder.version), '0100')
+
+		clone = copy.deepcopy(decoder)
+		self.assertIs(clone.head, decoder.head)
+
+		# in a two-state simulation structs keep their fields
+		@part
+		class Probe:
+			decoder = Decoder()
+
+			@once
+			async def check(self):
+				types.append((type(self.decoder.head), type(self.decoder.version)))
+
+		types = []
+		Sim(Probe(), two_state = True).run()
+		self.assertEqual(types, [(header, bitvec[3:0])])
@@ -15,8 +15,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 
-import unittest, operator
-from hdlpy import logic, part, always
+import unittest, operator, copy
+from hdlpy import logic, logvec, part, always, resolved
 
 class test_part(unittest.TestCase):
 	def test_empty_class(self):
@@ -115,3 +115,41 @@ class test_part(unittest.TestCase):
 				test.signal = 'Z'
 				actual = test.signal
 				self.assertIs(expected, actual)
+
+	def test_resolved(self):
+		@part
+		class Bus:
+			line: resolved[logic]
+			data: resolved[logvec[3:0]] = '1ZZ0'
+			other: logic
+
+		bus = Bus()
+		self.assertIs(bus.line, logic.hi_z)
+		self.assertEqual(str(bus.data), '1ZZ0')
+		self.assertIs(bus.other, logic.unknown)
+
+		# outside of a simulation all assignments come from the same driver
+		bus.line = 0
+		bus.line = 1
+		self.assertIs(bus.line, logic.one)
+		bus.data = 'ZZ01'
+		self.assertEqual(str(bus.data), 'ZZ01')
+		bus.other = 1
+		self.assertIs(bus.other, logic.one)
+
+		clone = copy.deepcopy(bus)
+		self.assertEqual(str(clone.data), 'ZZ01')
+		clone.data = '1111'
+		self.assertEqual(str(clone.data), '1111')
+		self.assertEqual(str(bus.data), 'ZZ01')
+
+	def test_view(self):
+		@part
+		class Lanes:
+			lane: logvec[31:0].unsigned
+
+		lanes = Lanes()
+		bus = logvec[127:0](0x0123_4567_89ab_cdef_0011_2233_4455_6677).unsigned
+		lanes.lane = bus.view[95:64]
+		self.assertIs(type(lanes.lane), logvec[31:0].unsigned)
+		self.assertEqual(int(lanes.lane), 0x89ab_cdef)
@@ -0,0 +1,114 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, random
+from hdlpy import logic, logvec, pattern, decoder
+
+def _reference_eq(vec, text):
+	"""Wildcard compare the way logvec used to do it."""
+
+	bits = tuple(logic(b) if b != '-' else a for a, b in zip(vec, (b for b in text if b != '_')))
+	return str(vec) == ''.join(map(str, bits))
+
+class test_pattern(unittest.TestCase):
+	def test_compile(self):
+		p = pattern('0000_---_1--0011')
+		self.assertEqual(len(p), 14)
+		self.assertEqual(p.care, 0b1111_000_1001111)
+		self.assertEqual(p.value, 0b0000_000_1000011)
+		self.assertEqual(str(p), '0000_---_1--0011')
+		self.assertIs(pattern('0000_---_1--0011'), p)
+		self.assertIs(pattern(p), p)
+		self.assertEqual(pattern('01XZ-').unknown, 0b00110)
+		self.assertEqual(pattern('01XZ-').hi_z, 0b00010)
+		self.assertRaises(ValueError, pattern, '01a')
+		self.assertRaises(ValueError, pattern, 5)
+
+	def test_match(self):
+		tests = (
+			('0000_---_1--0011', '0000_101_1100011', True),
+			('0000_---_1--0011', '0000_XZX_1XZ0011', True),
+			('0000_---_1--0011', '0000_101_1100010', False),
+			('0000_---_1--0011', '0001_101_1100011', False),
+			('01XZ-', '01XZ1', True),
+			('01XZ-', '01ZX1', False),
+			('-', 'Z', True),
+		)
+
+		for text, value, expected in tests:
+			with self.subTest(text = text, value = value):
+				vec = logvec(value)
+				self.assertEqual(pattern(text).match(vec), expected)
+				self.assertEqual(vec == pattern(text), expected)
+				self.assertEqual(vec == text, expected)
+				self.assertEqual(vec != text, not expected)
+				self.assertEqual(vec.unsigned == text, expected)
+				self.assertEqual(vec.signed == text, expected)
+
+		self.assertRaises(ValueError, pattern('0-').match, logvec('010'))
+		self.assertFalse(logvec('010') == pattern('0-'))
+
+	def test_random(self):
+		rand = random.Random(6)
+		for _ in range(500):
+			width = rand.randint(1, 40)
+			vec = logvec(''.join(rand.choice('0011XZ') for _ in range(width)))
+			text = ''.join(
+				rand.choice('--01XZ') if rand.random() < 0.3 else b
+				for b in str(vec))
+			if '-' not in text:
+				text += '-'
+				vec = logvec(str(vec) + '0')
+			with self.subTest(vec = vec, text = text):
+				self.assertEqual(vec == text, _reference_eq(vec, text))
+
+class test_decoder(unittest.TestCase):
+	def check(self, texts, vectors):
+		dec = decoder(texts)
+		for vec in vectors:
+			expected = next((i for i, t in enumerate(texts) if _reference_eq(vec, t)), None)
+			with self.subTest(vec = vec):
+				self.assertEqual(dec.decode(vec), expected)
+
+	def test_small(self):
+		texts = ('1--', '01-', '0-0', '---')
+		self.check(texts, [logvec(f"{a}{b}{c}") for a in '01XZ' for b in '01XZ' for c in '01XZ'])
+		self.assertIsNone(decoder(('1--', '01-')).decode(logvec('000')))
+		self.assertIsNone(decoder(()).decode(logvec.empty))
+
+	def test_random(self):
+		rand = random.Random(7)
+		for width in (4, 10, 24):
+			for _ in range(20):
+				texts = [
+					''.join(rand.choice('01--' if rand.random() < 0.9 else '01-XZ') for _ in range(width))
+					for _ in range(rand.randint(1, 30))
+				]
+				vectors = [
+					logvec(''.join(rand.choice('01' if rand.random() < 0.9 else '01XZ') for _ in range(width)))
+					for _ in range(50)
+				]
+				# make sure most patterns have a matching vector
+				vectors += [logvec(t.replace('-', rand.choice('01'))) for t in texts]
+				with self.subTest(width = width, texts = texts):
+					self.check(texts, vectors)
+
+	def test_invalid(self):
+		self.assertRaises(ValueError, decoder, ('0-', '0-1'))
+		self.assertRaises(ValueError, decoder, ('0a',))
+		self.assertRaises(ValueError, decoder(('0-',)).decode, logvec('010'))
+		self.assertEqual(len(decoder(('0-', '11'))), 2)
@@ -0,0 +1,72 @@
+#
+# Part of hdlpy.
+# Copyright (c) 2021, Willemijn Coene
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import unittest, random
+from hdlpy import logic, logvec, resolved
+
+_values = (logic.zero, logic.one, logic.unknown, logic.hi_z)
+
+class test_resolved(unittest.TestCase):
+	def reference(self, values):
+		result = logic.hi_z
+		for value in values:
+			result = resolved.table[result._logic_order][value._logic_order]
+		return result
+
+	def test_table(self):
+		for l in _values:
+			for r in _values:
+				with self.subTest(l = l, r = r):
+					expected = r if l is logic.hi_z else l if r is logic.hi_z or l is r else logic.unknown
+					self.assertIs(resolved.table[l._logic_order][r._logic_order], expected)
+					self.assertIs(resolved.table[l._logic_order][r._logic_order], resolved.table[r._logic_order][l._logic_order])
+
+	def test_type(self):
+		self.assertIs(resolved[logic].type, logic)
+		self.assertEqual(resolved[logvec[7:0]], resolved(logvec[7:0]))
+		self.assertEqual(repr(resolved[logic]), 'resolved[logic]')
+		self.assertRaises(ValueError, resolved, int)
+		self.assertRaises(ValueError, resolved, logvec)
+
+	def test_logic(self):
+		rand = random.Random(0)
+		drivers = resolved[logic].drivers()
+		contributions = {}
+		self.assertIs(drivers.value, logic.hi_z)
+		for _ in range(2000):
+			driver = rand.randrange(64)
+			contributions[driver] = rand.choice(_values)
+			actual = drivers.drive(driver, contributions[driver])
+			self.assertIs(actual, self.reference(contributions.values()))
+		self.assertEqual(len(drivers), sum(v is not logic.hi_z for v in contributions.values()))
+
+	def test_vector(self):
+		rand = random.Random(1)
+		ty = logvec[11:4]
+		drivers = resolved[ty].drivers()
+		contributions = {}
+		self.assertEqual(str(drivers.value), 'ZZZZZZZZ')
+		for _ in range(1000):
+			driver = rand.randrange(64)
+			bits = rand.choice(('01XZZZZZ', 'ZZZZZZZZZ', '01'))
+			contributions[driver] = ty(''.join(rand.choice(bits) for _ in range(8)))
+			actual = drivers.drive(driver, contributions[driver])
+			expected = ty(tuple(
+				self.reference(value[i] for value in contributions.values())
+				for i in range(11, 3, -1)))
+			self.assertIs(type(actual), ty)
+			self.assertTrue(logvec._same_planes(actual, expected), (actual, expected))
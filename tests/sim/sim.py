@@ -15,20 +15,29 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 
-import unittest
-from hdlpy import logic, part, once, always, when
-from hdlpy.sim import Sim, Wait
+import unittest, warnings
+from hdlpy import logic, logvec, bit, bitvec, part, once, always, when, resolved, four_state
+from hdlpy.sim import Sim, Wait, TwoStateWarning
 
 class test_sim(unittest.TestCase):
 	def test(the_test):
+		the_test.flipflop(logic)
+
+	def test_two_state(the_test):
+		the_test.flipflop(bit)
+
+	def test_two_state_sim(the_test):
+		the_test.flipflop(logic, two_state = True)
+
+	def flipflop(the_test, ty, two_state = False):
 		@part
 		class Flipflop:
-			clk: logic
-			rst: logic
-			en: logic
-			d: logic
-			o: logic
-			no: logic
+			clk: ty
+			rst: ty
+			en: ty
+			d: ty
+			o: ty
+			no: ty
 
 			@when(rising = ('rst', 'clk'))
 			def process(self):
@@ -70,7 +79,189 @@ class test_sim(unittest.TestCase):
 						the_test.assertEqual(expected, actual)
 
 		testbench = Testbench()
-		Sim(testbench).run()
+		with warnings.catch_warnings():
+			warnings.simplefilter('error', TwoStateWarning)
+			Sim(testbench, two_state = two_state).run()
 
 		# if this fails, the tests didn't actually run
-		the_test.assertEqual(testbench._flipflop.clk, logic(0))
+		the_test.assertIs(testbench._flipflop.clk, ty(0))
+
+	def test_two_state_same_results(the_test):
+		def run(two_state):
+			results = []
+			storage = set()
+
+			@part
+			class Alu:
+				clk: logic
+				a: logvec[7:0].signed
+				b: logvec[7:0].signed
+				u: logvec[7:0].unsigned
+				wide: logvec[11:0].signed
+				acc: logvec[15:0].signed
+
+				@when(rising = 'clk')
+				def step(self):
+					a, b, u = self.a, self.b, self.u
+					storage.add(type(a))
+					results.append((
+						a < b, a > b, a <= -3, a == -3, a == 253, a < 5, u > 200, u == -1,
+						int(a + b), int(a * b), int(a - 5), int(a // b), int(a % b),
+						int(b // 2), int(a >> 1), int(-a), int(abs(b)), int(u + 1),
+						str(a * 5), str(u * 3)))
+					self.wide = self.a
+					self.acc = self.acc + a * b
+
+			@part
+			class Testbench:
+				alu = Alu()
+
+				@once
+				async def test(self):
+					self.alu.clk = 0
+					self.alu.acc = 0
+					for a, b, u in ((-3, -5, 255), (5, -3, 7), (-128, 127, 128), (0, 1, 0), (-1, -1, 201)):
+						self.alu.a, self.alu.b, self.alu.u = a, b, u
+						await Wait.delay('10ns')
+						self.alu.clk = 1
+						await Wait.delay('10ns')
+						self.alu.clk = 0
+						results.append((int(self.alu.wide), int(self.alu.acc)))
+
+			testbench = Testbench()
+			Sim(testbench, two_state = two_state).run()
+			the_test.assertEqual(storage, {(bitvec if two_state else logvec)[7:0].signed})
+			the_test.assertIs(type(testbench.alu.a), logvec[7:0].signed)
+			return results
+
+		four, two = run(False), run(True)
+		the_test.assertEqual(len(four), 10)
+		the_test.assertEqual(four, two)
+		the_test.assertEqual(four[0][:5], (False, True, True, True, False))
+
+	def test_resolved(the_test):
+		def driver(index):
+			@always
+			def drive(self):
+				if self.all or self.sel == index:
+					self.bus = index
+				else:
+					self.bus = 'ZZZZZZZZ'
+			return drive
+
+		# 64 blocks driving a shared bus
+		attrs = {f"drive{i}": driver(i) for i in range(64)}
+		attrs['__annotations__'] = {
+			'sel': logvec[7:0].unsigned,
+			'all': logic,
+			'bus': resolved[logvec[7:0]],
+		}
+		Bus = part(type('Bus', (), attrs))
+
+		@part
+		class Testbench:
+			_bus = Bus()
+			done: logic = 0
+
+			@once
+			async def test(self):
+				self._bus.all = 0
+				for sel in (0, 5, 63, 64, 17):
+					self._bus.sel = sel
+					await Wait.delay('10ns')
+					expected = logvec[7:0](sel) if sel < 64 else logvec[7:0]('ZZZZZZZZ')
+					the_test.assertTrue(logvec._same_planes(self._bus.bus, expected), (sel, self._bus.bus))
+
+				# contention on the bits where the drivers disagree
+				self._bus.all = 1
+				await Wait.delay('10ns')
+				the_test.assertEqual(str(self._bus.bus), '00XXXXXX')
+
+				self._bus.all = 0
+				self._bus.sel = 42
+				await Wait.delay('10ns')
+				the_test.assertEqual(str(self._bus.bus), '00101010')
+				self.done = 1
+
+		testbench = Testbench()
+		Sim(testbench).run()
+		the_test.assertIs(testbench.done, logic.one)
+
+	def test_two_state_unknown(the_test):
+		@part
+		class Design:
+			x: logic
+			count: logvec[3:0].unsigned
+			bus: four_state[logvec[3:0]]
+			line: resolved[logic]
+
+			@once
+			async def drive(self):
+				the_test.assertIs(self.x, bit.zero)
+				the_test.assertIs(type(self.count), bitvec[3:0].unsigned)
+				self.count = self.count + 3
+				await Wait.delay('10ns')
+				self.x = 'X'
+				self.x = 1
+				self.x = logic.hi_z
+				self.count = '1Z0X'
+				self.bus = 'ZZ01'
+				self.line = 'Z'
+
+		design = Design()
+		sim = Sim(design, two_state = True)
+		with warnings.catch_warnings(record = True) as caught:
+			warnings.simplefilter('always')
+			sim.run()
+
+		# reported only the first time for each signal
+		the_test.assertEqual(
+			[(type(w.message), str(w.message)) for w in caught],
+			[
+				(TwoStateWarning, '10 ns: Design.x = X in two-state simulation'),
+				(TwoStateWarning, '10 ns: Design.count = 1Z0X in two-state simulation'),
+			])
+		the_test.assertEqual(set(sim.unknowns), {(design, 'x'), (design, 'count')})
+		the_test.assertIs(design.x, logic.zero)
+		the_test.assertIs(type(design.count), logvec[3:0].unsigned)
+		the_test.assertEqual(str(design.count), '1000')
+		the_test.assertIs(type(design.bus), logvec[3:0])
+		the_test.assertEqual(str(design.bus), 'ZZ01')
+		the_test.assertIs(design.line, logic.hi_z)
+
+		# without two_state, assigning a two-state value converts it
+		design = Design()
+		design.count = bitvec[3:0](5)
+		the_test.assertIs(type(design.count), logvec[3:0].unsigned)
+
+	def test_two_state_reuse(the_test):
+		@part
+		class Counter:
+			x: logic
+			count: logvec[3:0].unsigned
+
+			@once
+			async def drive(self):
+				seen.append((self.x, type(self.count)))
+				self.count = self.count + 1
+				await Wait.delay('10ns')
+				self.x = 'X'
+
+		counter = Counter()
+		sim = Sim(counter, two_state = True)
+		the_test.assertIs(counter.x, logic.unknown)
+
+		seen = []
+		with warnings.catch_warnings():
+			warnings.simplefilter('ignore', TwoStateWarning)
+			sim.run()
+		the_test.assertEqual(seen, [(bit.zero, bitvec[3:0].unsigned)])
+		the_test.assertIs(counter.x, logic.zero)
+		the_test.assertIs(type(counter.count), logvec[3:0].unsigned)
+
+		# the same parts in a four-state simulation keep X
+		seen = []
+		Sim(counter).run()
+		the_test.assertEqual(seen, [(logic.zero, logvec[3:0].unsigned)])
+		the_test.assertIs(counter.x, logic.unknown)
+		the_test.assertEqual(str(counter.count), '0010')